@@ -0,0 +1,190 @@
+import re
+from collections import Counter, OrderedDict
+from http.client import SERVICE_UNAVAILABLE, TOO_MANY_REQUESTS
+from math import ceil
+from time import monotonic
+from typing import Any, Dict, NamedTuple
+
+from rusty_results import Empty, Option, Some
+from starlette.responses import JSONResponse
+from starlette.status import WS_1013_TRY_AGAIN_LATER
+from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.websockets import WebSocketClose
+
+# Long-lived streams, over any transport (NDJSON, SSE or WebSocket)
+STREAM_PATH = re.compile(r"^/api/v1/(?:[a-z]+/)?stream$")
+# Single-item lookups
+LOOKUP_PATH = re.compile(
+    r"^/api/v1/(?:(?:blocks|transactions)/(?:\d+|by-hash/[0-9a-fA-F]+)|(?:addresses|channels|leaders)/[0-9a-fA-F]+)$"
+)
+
+
+class Rejection(NamedTuple):
+    status: int
+    retry_after_seconds: int
+    reason: str
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second on average, in bursts of up to `burst`.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, *, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = monotonic()
+
+    def take(self) -> float:
+        """
+        Takes a token, if there is one. Returns 0 if so, or the seconds until there is one otherwise.
+        """
+        now = monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """
+    Caps the concurrent streams, overall (503) and per client IP (429), since each one holds a coroutine and a DB poller
+    for as long as it is open. Single-item lookups are rate-limited per client IP with token buckets (429).
+    Only the `max_tracked_clients` most recent clients keep a bucket, so memory stays bounded under address churn.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_streams: int,
+        max_streams_per_ip: int,
+        stream_retry_after_seconds: int,
+        lookup_rate: float,
+        lookup_burst: int,
+        max_tracked_clients: int = 10_000,
+    ):
+        self.max_streams = max_streams
+        self.max_streams_per_ip = max_streams_per_ip
+        self.stream_retry_after_seconds = stream_retry_after_seconds
+        self.lookup_rate = lookup_rate
+        self.lookup_burst = lookup_burst
+        self.max_tracked_clients = max_tracked_clients
+
+        self.active_streams = 0
+        self._streams_by_client: Counter[str] = Counter()
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+        self.admitted_streams = 0
+        self.rejected: Counter[str] = Counter()
+
+    def admit_stream(self, client: str) -> Option[Rejection]:
+        """
+        Registers a stream of `client`, unless a limit is hit. Admitted streams must be released once closed.
+        """
+        if self.active_streams >= self.max_streams:
+            self.rejected["streams_overall"] += 1
+            reason = "Too many open streams, try again later."
+            return Some(Rejection(SERVICE_UNAVAILABLE, self.stream_retry_after_seconds, reason))
+        if self._streams_by_client[client] >= self.max_streams_per_ip:
+            self.rejected["streams_per_ip"] += 1
+            reason = f"At most {self.max_streams_per_ip} streams can be open at once per client."
+            return Some(Rejection(TOO_MANY_REQUESTS, self.stream_retry_after_seconds, reason))
+
+        self.active_streams += 1
+        self._streams_by_client[client] += 1
+        self.admitted_streams += 1
+        return Empty()
+
+    def release_stream(self, client: str) -> None:
+        self.active_streams -= 1
+        self._streams_by_client[client] -= 1
+        if self._streams_by_client[client] <= 0:
+            del self._streams_by_client[client]
+
+    def admit_lookup(self, client: str) -> Option[Rejection]:
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = TokenBucket(rate=self.lookup_rate, burst=self.lookup_burst)
+            if len(self._buckets) > self.max_tracked_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client)
+
+        wait_seconds = bucket.take()
+        if wait_seconds == 0:
+            return Empty()
+        self.rejected["lookups_rate_limited"] += 1
+        reason = f"Too many lookups: At most {self.lookup_rate:g} per second, in bursts of {self.lookup_burst}."
+        return Some(Rejection(TOO_MANY_REQUESTS, ceil(wait_seconds), reason))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active_streams": self.active_streams,
+            "max_streams": self.max_streams,
+            "streaming_clients": len(self._streams_by_client),
+            "max_streams_of_a_client": max(self._streams_by_client.values(), default=0),
+            "max_streams_per_ip": self.max_streams_per_ip,
+            "admitted_streams": self.admitted_streams,
+            "rate_limited_clients": len(self._buckets),
+            "rejected": {
+                "streams_overall": self.rejected["streams_overall"],
+                "streams_per_ip": self.rejected["streams_per_ip"],
+                "lookups_rate_limited": self.rejected["lookups_rate_limited"],
+            },
+        }
+
+
+class AdmissionMiddleware:
+    """
+    Applies the `AdmissionController` before any work is done for a request. A stream's slot is held until its response
+    (or WebSocket) is closed, whatever closed it.
+    """
+
+    def __init__(self, app: ASGIApp, *, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        client = scope["client"][0] if scope.get("client") else "unknown"
+        path = scope["path"]
+
+        if STREAM_PATH.match(path):
+            rejection = self.controller.admit_stream(client)
+            if rejection.is_some:
+                await self._reject(scope, receive, send, rejection.unwrap())
+                return
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.controller.release_stream(client)
+            return
+
+        if scope["type"] == "http" and LOOKUP_PATH.match(path):
+            rejection = self.controller.admit_lookup(client)
+            if rejection.is_some:
+                await self._reject(scope, receive, send, rejection.unwrap())
+                return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send, rejection: Rejection) -> None:
+        response = JSONResponse(
+            {"detail": rejection.reason},
+            status_code=rejection.status,
+            headers={"Retry-After": str(rejection.retry_after_seconds)},
+        )
+        if scope["type"] == "http" or "websocket.http.response" in scope.get("extensions", {}):
+            await response(scope, receive, send)
+            return
+        # The server cannot answer the handshake with a response, so the WebSocket is closed instead
+        reason = f"{rejection.reason} Retry after {rejection.retry_after_seconds}s."
+        await WebSocketClose(code=WS_1013_TRY_AGAIN_LATER, reason=reason)(scope, receive, send)
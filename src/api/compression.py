@@ -0,0 +1,240 @@
+import zlib
+from compression import zstd
+from enum import Enum
+from http.client import NO_CONTENT, NOT_MODIFIED
+from typing import Dict, Optional
+
+from rusty_results import Empty, Option, Some
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Streamed as they are produced: Each chunk (an NDJSON batch, or an event) is flushed on its own, so compressing them
+# never delays a frame
+STREAMING_MEDIA_TYPES = frozenset(("application/x-ndjson", "text/event-stream"))
+
+
+class Coding(Enum):
+    ZSTD = "zstd"
+    GZIP = "gzip"
+
+
+# In order of preference, when the client accepts several
+CODINGS = (Coding.ZSTD, Coding.GZIP)
+
+
+def negotiate_coding(accept_encoding: str) -> Option[Coding]:
+    """
+    Preferred content coding out of an `Accept-Encoding` header, honouring its `q=0` exclusions and `*`.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, *parameters = item.strip().split(";")
+        weight = 1.0
+        for parameter in parameters:
+            key, _, value = parameter.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if name:
+            weights[name.strip().lower()] = weight
+
+    default_weight = weights.get("*", 0.0)
+    candidates = [(weights.get(coding.value, default_weight), coding) for coding in CODINGS]
+    weight, coding = max(candidates, key=lambda candidate: candidate[0])  # The first one wins ties
+    return Some(coding) if weight > 0 else Empty()
+
+
+class Compressor:
+    """
+    Incremental compressor of a response body. With `flush`, every chunk is compressed into a self-contained piece the
+    client can decompress on arrival; otherwise, chunks are buffered by the compressor for a better ratio.
+    """
+
+    def __init__(self, coding: Coding, *, level: int, flush: bool):
+        self.coding = coding
+        self.flush = flush
+        match coding:
+            case Coding.GZIP:
+                self._gzip = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # Gzip container
+            case Coding.ZSTD:
+                self._zstd = zstd.ZstdCompressor(level)
+
+    def compress(self, chunk: bytes) -> bytes:
+        match self.coding:
+            case Coding.GZIP:
+                compressed = self._gzip.compress(chunk)
+                return compressed + self._gzip.flush(zlib.Z_SYNC_FLUSH) if self.flush else compressed
+            case Coding.ZSTD:
+                mode = zstd.ZstdCompressor.FLUSH_BLOCK if self.flush else zstd.ZstdCompressor.CONTINUE
+                return self._zstd.compress(chunk, mode=mode)
+
+    def finish(self) -> bytes:
+        match self.coding:
+            case Coding.GZIP:
+                return self._gzip.flush(zlib.Z_FINISH)
+            case Coding.ZSTD:
+                return self._zstd.flush()
+
+
+class CompressionStats:
+    """
+    Bytes sent per content coding, before and after compressing them.
+    """
+
+    def __init__(self):
+        self.responses: Dict[Coding, int] = {coding: 0 for coding in Coding}
+        self.plain_bytes: Dict[Coding, int] = {coding: 0 for coding in Coding}
+        self.compressed_bytes: Dict[Coding, int] = {coding: 0 for coding in Coding}
+        self.uncompressed = 0  # Responses sent as-is: Not negotiated, already encoded, or below the size threshold
+
+    def record(self, coding: Coding, plain_bytes: int, compressed_bytes: int) -> None:
+        self.plain_bytes[coding] += plain_bytes
+        self.compressed_bytes[coding] += compressed_bytes
+
+    def stats(self) -> Dict[str, int | float | Dict[str, int | float]]:
+        content: Dict[str, int | float | Dict[str, int | float]] = {"uncompressed_responses": self.uncompressed}
+        for coding in Coding:
+            plain_bytes = self.plain_bytes[coding]
+            compressed_bytes = self.compressed_bytes[coding]
+            content[coding.value] = {
+                "responses": self.responses[coding],
+                "plain_bytes": plain_bytes,
+                "compressed_bytes": compressed_bytes,
+                "saved_bytes": plain_bytes - compressed_bytes,
+                "ratio": round(compressed_bytes / plain_bytes, 3) if plain_bytes else 0.0,
+            }
+        return content
+
+
+def _into_encoded_etag(etag: str, coding: Coding) -> str:
+    """
+    Each coding is a distinct representation, so strong ETags must tell them apart (see `core.api.get_matching_etag`).
+    """
+    if not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{coding.value}"'
+
+
+class CompressionMiddleware:
+    """
+    Compresses HTTP responses with the coding negotiated through `Accept-Encoding`.
+    Streaming responses (NDJSON and SSE) are compressed as they are sent, flushing each chunk so no frame is held back.
+    Other responses are compressed whole, only if their body reaches `min_bytes`. WebSockets are left untouched.
+    """
+
+    def __init__(self, app: ASGIApp, *, min_bytes: int, level: int, stats: CompressionStats):
+        self.app = app
+        self.min_bytes = min_bytes
+        self.level = level
+        self.stats = stats
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate_coding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _CompressingResponder(send, coding, min_bytes=self.min_bytes, level=self.level, stats=self.stats)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, send: Send, coding: Option[Coding], *, min_bytes: int, level: int, stats: CompressionStats):
+        self._send = send
+        self.coding = coding
+        self.min_bytes = min_bytes
+        self.level = level
+        self.stats = stats
+
+        self._start: Optional[Message] = None  # Held until the first body chunk tells whether it reaches `min_bytes`
+        self._compressor: Optional[Compressor] = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            await self._start_response(message)
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        if self._compressor is None:
+            await self._start_body(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        compressed = self._compressor.compress(body)
+        if not more_body:
+            compressed += self._compressor.finish()
+        await self._send_compressed(body, compressed, more_body)
+
+    async def _start_response(self, message: Message) -> None:
+        """
+        Sends the headers right away, unless whether to compress depends on the body's size. Streams in particular are
+        always compressed, if negotiated, so their headers are never held back until their first item.
+        """
+        headers = MutableHeaders(scope=message)
+        status = message["status"]
+        if status in (NO_CONTENT, NOT_MODIFIED) or status < 200 or "content-encoding" in headers:
+            await self._pass_through(message)
+            return
+        # The representation depends on `Accept-Encoding`, even if this one is sent as-is
+        headers.add_vary_header("Accept-Encoding")
+        if self.coding.is_empty:
+            await self._pass_through(message)
+            return
+
+        media_type = headers.get("content-type", "").partition(";")[0].strip()
+        if media_type not in STREAMING_MEDIA_TYPES:
+            self._start = message
+            return
+
+        # Compressed as it is sent, so its length is unknown upfront
+        self._set_encoding(headers)
+        del headers["Content-Length"]
+        self._compressor = Compressor(self.coding.unwrap(), level=self.level, flush=True)
+        await self._send(message)
+
+    async def _start_body(self, message: Message) -> None:
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not more_body and len(body) < self.min_bytes:
+            await self._send(self._start)
+            await self._pass_through(message)
+            return
+
+        headers = MutableHeaders(scope=self._start)
+        coding = self._set_encoding(headers)
+        if not more_body:
+            compressor = Compressor(coding, level=self.level, flush=False)
+            compressed = compressor.compress(body) + compressor.finish()
+            headers["Content-Length"] = str(len(compressed))
+            await self._send(self._start)
+            await self._send_compressed(body, compressed, more_body=False)
+            return
+
+        # Compressed as it is sent, so its length is unknown upfront
+        del headers["Content-Length"]
+        self._compressor = Compressor(coding, level=self.level, flush=False)
+        await self._send(self._start)
+        await self._send_compressed(body, self._compressor.compress(body), more_body)
+
+    def _set_encoding(self, headers: MutableHeaders) -> Coding:
+        coding = self.coding.unwrap()
+        headers["Content-Encoding"] = coding.value
+        if "etag" in headers:
+            headers["ETag"] = _into_encoded_etag(headers["etag"], coding)
+        self.stats.responses[coding] += 1
+        return coding
+
+    async def _pass_through(self, message: Message) -> None:
+        self._passthrough = True
+        self.stats.uncompressed += 1
+        await self._send(message)
+
+    async def _send_compressed(self, body: bytes, compressed: bytes, more_body: bool) -> None:
+        # Accounted per chunk, so long-lived streams show up before they end
+        self.stats.record(self.coding.unwrap(), len(body), len(compressed))
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
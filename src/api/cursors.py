@@ -0,0 +1,67 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from enum import Enum
+from http.client import BAD_REQUEST
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+
+class PageDirection(Enum):
+    NEXT = "next"  # Older items
+    PREV = "prev"  # Newer items
+
+
+def encode_cursor(direction: PageDirection, key: Tuple[int, ...]) -> str:
+    """
+    Opaque, URL-safe cursor pointing right past `key`, in the given direction.
+    """
+    payload = json.dumps([direction.value, *key], separators=(",", ":")).encode("utf-8")
+    return urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, *, key_length: int) -> Tuple[PageDirection, Tuple[int, ...]]:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        direction, *key = json.loads(urlsafe_b64decode(cursor + padding))
+        if len(key) != key_length or not all(isinstance(item, int) for item in key):
+            raise ValueError(f"Expected {key_length} integers, got {key}.")
+        return PageDirection(direction), tuple(key)
+    except (ValueError, TypeError) as error:
+        raise HTTPException(BAD_REQUEST, detail="Invalid cursor.") from error
+
+
+def decode_resume_cursor(cursor: str, *, key_length: int) -> Tuple[int, ...]:
+    """
+    Key of the last item a stream delivered, out of the cursor it carried.
+    Only cursors towards newer items are accepted, e.g.: those carried by stream items, or a page's `prev_cursor`.
+    """
+    direction, key = decode_cursor(cursor, key_length=key_length)
+    if direction is not PageDirection.PREV:
+        raise HTTPException(BAD_REQUEST, detail="Invalid cursor: Streams can only be resumed towards newer items.")
+    return key
+
+
+def paginate[T](
+    items: List[T], *, limit: int, direction: PageDirection, is_first_page: bool, key: Callable[[T], Tuple[int, ...]]
+) -> Tuple[List[T], Optional[str], Optional[str]]:
+    """
+    Trims a keyset query result into a page, in descending order, and computes its next/prev cursors.
+    `items` must have been queried with `limit + 1` in the traversal order of `direction`, so the extra item tells
+    whether there are more to come.
+    """
+    has_more = len(items) > limit
+    items = items[:limit]
+    if direction is PageDirection.PREV:
+        items.reverse()
+    if not items:
+        return items, None, None
+
+    newest, oldest = key(items[0]), key(items[-1])
+    if direction is PageDirection.NEXT:
+        next_cursor = encode_cursor(PageDirection.NEXT, oldest) if has_more else None
+        prev_cursor = None if is_first_page else encode_cursor(PageDirection.PREV, newest)
+    else:
+        next_cursor = encode_cursor(PageDirection.NEXT, oldest)
+        prev_cursor = encode_cursor(PageDirection.PREV, newest) if has_more else None
+    return items, next_cursor, prev_cursor
@@ -0,0 +1,79 @@
+import json
+from http.client import BAD_REQUEST
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Self,
+    Tuple,
+    TypeVar,
+)
+
+from fastapi import HTTPException, Query
+from rusty_results import Empty, Option, Some
+
+M = TypeVar("M")
+
+FIELDS_PATTERN = r"^[a-z_]+(,[a-z_]+)*$"
+
+
+class SparseField(NamedTuple, Generic[M]):
+    """
+    How a schema field is read from its model: Its getter, and the model attributes (columns or relationships) it reads.
+    """
+
+    get: Callable[[M], Any]
+    columns: Tuple[str, ...]
+
+
+class FieldSet:
+    """
+    Fields requested through `?fields=`. Only the model attributes they read are loaded (see `core.db.load_only_columns`),
+    and only them are serialized: Schemas built with `model_construct` out of them dump nothing else.
+    """
+
+    def __init__(self, names: Iterable[str], fields: Mapping[str, SparseField]):
+        self.fields = fields
+        self.names = frozenset(names)
+        self.columns = frozenset(column for name in self.names for column in fields[name].columns)
+
+    def with_names(self, *names: str) -> Self:
+        return type(self)(self.names.union(names), self.fields)
+
+    def get_values(self, item: Any) -> dict:
+        return {name: field.get(item) for name, field in self.fields.items() if name in self.names}
+
+    def project_json(self, data: bytes) -> bytes:
+        """
+        Projects an already serialized item (e.g. from the hot tail) into the requested fields.
+        """
+        values = {name: value for name, value in json.loads(data).items() if name in self.names}
+        return json.dumps(values, separators=(",", ":")).encode("utf-8")
+
+
+def get_fields_dependency(fields: Mapping[str, SparseField]) -> Callable[..., Option[FieldSet]]:
+    """
+    Dependency parsing `?fields=` against the given schema fields. Empty if every field is requested, implicitly.
+    """
+    available = ",".join(fields)
+
+    def get_fields(
+        _fields: Optional[str] = Query(
+            None,
+            alias="fields",
+            pattern=FIELDS_PATTERN,
+            description=f"Comma-separated fields to return, out of: {available}.",
+        ),
+    ) -> Option[FieldSet]:
+        if _fields is None:
+            return Empty()
+        names = _fields.split(",")
+        if unknown := [name for name in names if name not in fields]:
+            raise HTTPException(BAD_REQUEST, detail=f"Unknown fields: {','.join(unknown)}. Available: {available}.")
+        return Some(FieldSet(names, fields))
+
+    return get_fields
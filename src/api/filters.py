@@ -0,0 +1,318 @@
+from dataclasses import dataclass, replace
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Self,
+    Tuple,
+)
+
+from fastapi import Query
+from rusty_results import Empty, Option, Some
+
+from core.api import HASH_PATTERN
+from models.block import Block
+from models.transactions.operations.contents import (
+    ChannelBlob,
+    ChannelInscribe,
+    ChannelSetKeys,
+    ContentType,
+    NbeContent,
+)
+from models.transactions.transaction import Transaction
+from utils.option import into_option
+
+if TYPE_CHECKING:
+    from core.app import NBE
+
+
+def _get_channel_id(content: NbeContent) -> Option[bytes]:
+    match content:
+        case ChannelInscribe():
+            return into_option(content.channel_id)
+        case ChannelBlob() | ChannelSetKeys():
+            return into_option(content.channel)
+        case _:
+            return Empty()
+
+
+@dataclass(frozen=True, slots=True)
+class TransactionAttributes:
+    """
+    What stream filters are evaluated against, computed once per transaction rather than out of its payload.
+    """
+
+    id: int
+    operation_types: FrozenSet[ContentType]
+    public_keys: FrozenSet[bytes]  # Paid by the transaction's outputs
+    channel_ids: FrozenSet[bytes]
+    gas_price: int  # Execution gas price
+
+    # `Transaction` attributes they are computed from, which must be loaded to compute them
+    COLUMNS: ClassVar[Tuple[str, ...]] = ("operations", "outputs", "execution_gas_price")
+
+    @classmethod
+    def from_transaction(cls, transaction: Transaction) -> Self:
+        """
+        Operation contents are persisted without their fields, so the channels of a transaction read back from the
+        database must be added with `with_indexed_channel_ids`.
+        """
+        return cls(
+            id=transaction.id,
+            operation_types=frozenset(operation.content.type for operation in transaction.operations),
+            public_keys=frozenset(output.public_key for output in transaction.outputs),
+            channel_ids=frozenset(
+                channel_id
+                for operation in transaction.operations
+                for channel_id in _get_channel_id(operation.content).iter()
+            ),
+            gas_price=transaction.execution_gas_price,
+        )
+
+    def with_indexed_channel_ids(self, indexed_channel_ids: Mapping[int, FrozenSet[bytes]]) -> Self:
+        """
+        `indexed_channel_ids` holds the channels of transactions by their id (see `get_indexed_channel_ids`).
+        """
+        channel_ids = indexed_channel_ids.get(self.id)
+        return replace(self, channel_ids=self.channel_ids.union(channel_ids)) if channel_ids else self
+
+
+@dataclass(frozen=True, slots=True)
+class BlockAttributes:
+    transactions: Tuple[TransactionAttributes, ...]
+
+    COLUMNS: ClassVar[Tuple[str, ...]] = ("transactions",)
+
+    @classmethod
+    def from_block(cls, block: Block) -> Self:
+        return cls(
+            transactions=tuple(
+                TransactionAttributes.from_transaction(transaction) for transaction in block.transactions
+            )
+        )
+
+    def with_indexed_channel_ids(self, indexed_channel_ids: Mapping[int, FrozenSet[bytes]]) -> Self:
+        if not indexed_channel_ids:
+            return self
+        return replace(
+            self,
+            transactions=tuple(
+                transaction.with_indexed_channel_ids(indexed_channel_ids) for transaction in self.transactions
+            ),
+        )
+
+
+class StreamFilter:
+    """
+    Criteria a streamed item must meet to be sent, compiled once per subscription into the checks actually requested.
+    A block matches if it has at least `min_transactions` transactions, and, if any transaction criteria is given,
+    a transaction meeting all of them.
+    """
+
+    def __init__(
+        self,
+        *,
+        operation_type: Option[ContentType] = Empty(),
+        public_key: Option[bytes] = Empty(),
+        channel_id: Option[bytes] = Empty(),
+        min_gas_price: Option[int] = Empty(),
+        min_transactions: Option[int] = Empty(),
+    ):
+        self.operation_type = operation_type
+        self.channel_id = channel_id
+        self.min_transactions = min_transactions
+
+        checks: List[Callable[[TransactionAttributes], bool]] = []
+        if operation_type.is_some:
+            _operation_type = operation_type.unwrap()
+            checks.append(lambda attributes: _operation_type in attributes.operation_types)
+        if public_key.is_some:
+            _public_key = public_key.unwrap()
+            checks.append(lambda attributes: _public_key in attributes.public_keys)
+        if channel_id.is_some:
+            _channel_id = channel_id.unwrap()
+            checks.append(lambda attributes: _channel_id in attributes.channel_ids)
+        if min_gas_price.is_some:
+            _min_gas_price = min_gas_price.unwrap()
+            checks.append(lambda attributes: attributes.gas_price >= _min_gas_price)
+        self._transaction_checks = checks
+
+    @property
+    def is_empty(self) -> bool:
+        return not self._transaction_checks and self.min_transactions.is_empty
+
+    def matches_transaction(self, attributes: TransactionAttributes) -> bool:
+        return all(check(attributes) for check in self._transaction_checks)
+
+    def matches_block(self, attributes: BlockAttributes) -> bool:
+        if len(attributes.transactions) < self.min_transactions.unwrap_or(0):
+            return False
+        if not self._transaction_checks:
+            return True
+        return any(self.matches_transaction(transaction) for transaction in attributes.transactions)
+
+
+async def get_indexed_channel_ids(
+    app: "NBE", stream_filter: StreamFilter, transaction_ids: Iterable[int]
+) -> Dict[int, FrozenSet[bytes]]:
+    """
+    Channels of stored transactions by transaction id, looked up in the channel index. Only the filtered channel is
+    looked up, and only if the filter has one.
+    """
+    if stream_filter.channel_id.is_empty:
+        return {}
+    channel_id = stream_filter.channel_id.unwrap()
+    operating_transaction_ids = await app.state.channel_repository.get_operating_transaction_ids(
+        channel_id, list(transaction_ids)
+    )
+    return {transaction_id: frozenset((channel_id,)) for transaction_id in operating_transaction_ids}
+
+
+def _has_columns(loaded_columns: Option[FrozenSet[str]], columns: Iterable[str]) -> bool:
+    return loaded_columns.map(lambda _loaded_columns: _loaded_columns.issuperset(columns)).unwrap_or(True)
+
+
+async def get_block_attributes(
+    app: "NBE", stream_filter: StreamFilter, blocks: List[Block], *, columns: Option[FrozenSet[str]] = Empty()
+) -> List[Option[BlockAttributes]]:
+    """
+    Attributes of the given blocks, loaded with `columns` (or fully), to filter them with.
+    Blocks still in the hot tail reuse the attributes computed once at ingestion, so live blocks are not decoded for
+    each subscription. Others are computed out of their payload, which is reloaded if it was not loaded.
+    """
+    attributes: Dict[int, BlockAttributes] = {}
+    missed_blocks: List[Block] = []
+    for block in blocks:
+        record = app.state.block_tail.get((block.slot, block.id))
+        if record.is_some:
+            attributes[block.id] = record.unwrap().attributes
+        else:
+            missed_blocks.append(block)
+
+    if missed_blocks and not _has_columns(columns, BlockAttributes.COLUMNS):
+        reloaded_blocks = await app.state.block_repository.get_by_ids(
+            [block.id for block in missed_blocks], columns=Some(frozenset(BlockAttributes.COLUMNS))
+        )
+        missed_blocks = [block for reloaded_block in reloaded_blocks for block in reloaded_block.iter()]
+    attributes.update((block.id, BlockAttributes.from_block(block)) for block in missed_blocks)
+
+    channel_ids = await get_indexed_channel_ids(
+        app,
+        stream_filter,
+        (transaction.id for block_attributes in attributes.values() for transaction in block_attributes.transactions),
+    )
+    return [
+        into_option(attributes.get(block.id)).map(
+            lambda block_attributes: block_attributes.with_indexed_channel_ids(channel_ids)
+        )
+        for block in blocks
+    ]
+
+
+async def get_transaction_attributes(
+    app: "NBE",
+    stream_filter: StreamFilter,
+    transactions: List[Transaction],
+    *,
+    columns: Option[FrozenSet[str]] = Empty(),
+) -> List[Option[TransactionAttributes]]:
+    """
+    Attributes of the given transactions, as in `get_block_attributes`.
+    """
+    attributes: Dict[int, TransactionAttributes] = {}
+    missed_transactions: List[Transaction] = []
+    for transaction in transactions:
+        record = app.state.transaction_tail.get((transaction.block.slot, transaction.block.id, transaction.id))
+        if record.is_some:
+            attributes[transaction.id] = record.unwrap().attributes
+        else:
+            missed_transactions.append(transaction)
+
+    if missed_transactions and not _has_columns(columns, TransactionAttributes.COLUMNS):
+        reloaded_transactions = await app.state.transaction_repository.get_by_ids(
+            [transaction.id for transaction in missed_transactions],
+            columns=Some(frozenset(TransactionAttributes.COLUMNS)),
+        )
+        missed_transactions = [
+            transaction for reloaded_transaction in reloaded_transactions for transaction in reloaded_transaction.iter()
+        ]
+    attributes.update(
+        (transaction.id, TransactionAttributes.from_transaction(transaction)) for transaction in missed_transactions
+    )
+
+    channel_ids = await get_indexed_channel_ids(app, stream_filter, attributes.keys())
+    return [
+        into_option(attributes.get(transaction.id)).map(
+            lambda transaction_attributes: transaction_attributes.with_indexed_channel_ids(channel_ids)
+        )
+        for transaction in transactions
+    ]
+
+
+async def filter_blocks(
+    app: "NBE", stream_filter: StreamFilter, blocks: List[Block], *, columns: Option[FrozenSet[str]] = Empty()
+) -> List[Block]:
+    """
+    Blocks matching `stream_filter`, out of blocks loaded with `columns` (or fully).
+    """
+    if stream_filter.is_empty:
+        return blocks
+    attributes = await get_block_attributes(app, stream_filter, blocks, columns=columns)
+    return [
+        block
+        for block, block_attributes in zip(blocks, attributes)
+        if block_attributes.map(stream_filter.matches_block).unwrap_or(False)
+    ]
+
+
+async def filter_transactions(
+    app: "NBE",
+    stream_filter: StreamFilter,
+    transactions: List[Transaction],
+    *,
+    columns: Option[FrozenSet[str]] = Empty(),
+) -> List[Transaction]:
+    """
+    Transactions matching `stream_filter`, out of transactions loaded with `columns` (or fully).
+    """
+    if stream_filter.is_empty:
+        return transactions
+    attributes = await get_transaction_attributes(app, stream_filter, transactions, columns=columns)
+    return [
+        transaction
+        for transaction, transaction_attributes in zip(transactions, attributes)
+        if transaction_attributes.map(stream_filter.matches_transaction).unwrap_or(False)
+    ]
+
+
+def get_stream_filter(
+    op_type: Optional[ContentType] = Query(None, description="Only stream items with an operation of this type."),
+    address: Optional[str] = Query(
+        None, pattern=HASH_PATTERN, description="Only stream items paying this public key, in hex format."
+    ),
+    channel: Optional[str] = Query(
+        None, pattern=HASH_PATTERN, description="Only stream items operating on this channel, in hex format."
+    ),
+    min_gas_price: Optional[int] = Query(
+        None, ge=0, description="Only stream items with a transaction of at least this execution gas price."
+    ),
+    min_transactions: Optional[int] = Query(
+        None, ge=0, description="Only stream blocks with at least this many transactions."
+    ),
+) -> StreamFilter:
+    """
+    Stream filter out of the request's query parameters. Meant to be used as a dependency.
+    """
+    return StreamFilter(
+        operation_type=into_option(op_type),
+        public_key=into_option(address).map(bytes.fromhex),
+        channel_id=into_option(channel).map(bytes.fromhex),
+        min_gas_price=into_option(min_gas_price),
+        min_transactions=into_option(min_transactions),
+    )
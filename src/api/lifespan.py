@@ -0,0 +1,52 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncGenerator, List
+
+from api.streams import SubscriptionRegistry
+from api.v1.serializers.blocks import BlockRecord
+from api.v1.serializers.transactions import TransactionRecord
+from core.ring import HotTail
+from models.block import Block
+
+if TYPE_CHECKING:
+    from core.app import NBE
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def api_lifespan(app: "NBE") -> AsyncGenerator[None]:
+    app.state.block_tail = HotTail(app.settings.hot_tail_capacity)
+    app.state.transaction_tail = HotTail(app.settings.hot_tail_capacity)
+    app.state.subscriptions = SubscriptionRegistry(
+        max_queued=app.settings.stream_max_queued_frames, policy=app.settings.stream_slow_consumer_policy
+    )
+
+    # Subscribe before warming up, so blocks ingested in between are not lost
+    app.state.block_repository.subscribe(lambda blocks: _append_to_tails(app, blocks))
+    await _warm_tails(app)
+
+    yield
+
+
+def _append_to_tails(app: "NBE", blocks: List[Block]) -> None:
+    app.state.block_tail.extend(BlockRecord.from_block(block) for block in blocks)
+    app.state.transaction_tail.extend(
+        TransactionRecord.from_transaction(transaction) for block in blocks for transaction in block.transactions
+    )
+
+
+async def _warm_tails(app: "NBE") -> None:
+    capacity = app.settings.hot_tail_capacity
+
+    blocks = await app.state.block_repository.get_latest(capacity)
+    app.state.block_tail.warm((BlockRecord.from_block(block) for block in blocks), complete=len(blocks) < capacity)
+
+    transactions = await app.state.transaction_repository.get_latest(
+        capacity, ascending=True, preload_relationships=True
+    )
+    app.state.transaction_tail.warm(
+        (TransactionRecord.from_transaction(transaction) for transaction in transactions),
+        complete=len(transactions) < capacity,
+    )
+    logger.info(f"Hot tails warmed up with {len(blocks)} blocks and {len(transactions)} transactions.")
@@ -1,5 +1,25 @@
+import json
 import logging
-from typing import AsyncIterable, AsyncIterator, List, Union
+from asyncio import Event, Queue, Task, TaskGroup, create_task
+from collections import deque
+from enum import Enum
+from time import monotonic
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Self,
+    Set,
+    Tuple,
+    Union,
+)
+
+from starlette.status import WS_1000_NORMAL_CLOSURE, WS_1008_POLICY_VIOLATION
+from starlette.websockets import WebSocket, WebSocketDisconnect, WebSocketState
 
 from core.models import NbeModel, NbeSchema
 
@@ -11,14 +31,16 @@ Stream = AsyncIterator[Data]
 logger = logging.getLogger(__name__)
 
 
-def _into_ndjson_data(data: Data) -> bytes:
-    if isinstance(data, list):
+def _into_ndjson_data(data: Data | bytes) -> bytes:
+    if isinstance(data, bytes):
+        return data
+    elif isinstance(data, list):
         return b"".join(item.model_dump_ndjson() for item in data)
     else:
         return data.model_dump_ndjson()
 
 
-async def into_ndjson_stream(stream: Stream, *, bootstrap_data: Data = None) -> AsyncIterable[bytes]:
+async def into_ndjson_stream(stream: Stream, *, bootstrap_data: Data | bytes = None) -> AsyncIterable[bytes]:
     if bootstrap_data is not None:
         ndjson_data = _into_ndjson_data(bootstrap_data)
         if ndjson_data:
@@ -32,3 +54,297 @@ async def into_ndjson_stream(stream: Stream, *, bootstrap_data: Data = None) ->
             yield ndjson_data
         else:
             logger.debug("Ignoring streaming data because it is empty.")
+
+
+# ================
+# Subscriptions
+# ================
+# Frames are produced into a bounded per-subscriber queue and sent from it, so a slow client never holds back its
+# producer (nor its DB polling): Once the queue is full, its slow-consumer policy decides what to drop.
+
+
+class SlowConsumerPolicy(Enum):
+    SUMMARY = "summary"  # Drop the queued frames, and send a summary with their count and the cursor to resume from
+    SKIP_TO_TIP = "skip-to-tip"  # Drop the queued frames silently
+    DISCONNECT = "disconnect"  # Close the connection
+
+
+class Transport(Enum):
+    NDJSON = "ndjson"
+    SSE = "sse"
+    WEBSOCKET = "websocket"
+
+
+SUMMARY_EVENT = "summary"
+# Subscriptions detailed in the stats, the most lagged first
+MAX_REPORTED_SUBSCRIPTIONS = 100
+
+
+class Frame(NamedTuple):
+    event: str
+    data: bytes  # A single JSON document
+    id: Optional[str] = None  # Cursor resuming right after it, if the stream is resumable
+
+
+class Subscription:
+    """
+    Single client's subscription to a stream of frames.
+    It is used as an async context manager, which starts producing frames on enter, and stops on exit.
+    """
+
+    def __init__(
+        self,
+        registry: "SubscriptionRegistry",
+        frames: AsyncIterator[Frame],
+        *,
+        stream: str,
+        transport: Transport,
+        max_queued: int,
+        policy: SlowConsumerPolicy,
+    ):
+        self.registry = registry
+        self.stream = stream
+        self.transport = transport
+        self.max_queued = max_queued
+        self.policy = policy
+        self.opened_at = monotonic()
+
+        self._frames = frames
+        self._queue: deque[Tuple[Frame, float]] = deque()
+        self._ready = Event()
+        self._producer: Optional[Task] = None
+        self._exhausted = False
+        self._last_sent_id: Optional[str] = None
+        self._unreported_drops = 0
+
+        self.sent = 0
+        self.dropped = 0
+        self.summaries = 0
+        self.max_queued_seen = 0
+        self.last_delivery_lag_seconds = 0.0
+        self.disconnected_for_lag = False
+
+    async def __aenter__(self) -> Self:
+        self.registry.add(self)
+        self._producer = create_task(self._produce())
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        if self._producer is not None:
+            self._producer.cancel()
+        self.registry.remove(self)
+
+    async def __aiter__(self) -> AsyncIterator[Frame]:
+        while True:
+            if self.disconnected_for_lag:
+                return
+            if not self._queue:
+                if self._exhausted:
+                    return
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            if self._unreported_drops > 0:
+                yield self._pop_summary()
+                continue
+
+            frame, queued_at = self._queue.popleft()
+            self.last_delivery_lag_seconds = monotonic() - queued_at
+            yield frame
+            self.sent += 1
+            if frame.id is not None:
+                self._last_sent_id = frame.id
+
+    @property
+    def lag_seconds(self) -> float:
+        """
+        Age of the oldest frame waiting to be sent.
+        """
+        return monotonic() - self._queue[0][1] if self._queue else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "stream": self.stream,
+            "transport": self.transport.value,
+            "policy": self.policy.value,
+            "connected_seconds": round(monotonic() - self.opened_at, 3),
+            "queued": len(self._queue),
+            "max_queued": self.max_queued_seen,
+            "lag_seconds": round(self.lag_seconds, 3),
+            "last_delivery_lag_seconds": round(self.last_delivery_lag_seconds, 3),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "summaries": self.summaries,
+        }
+
+    async def _produce(self) -> None:
+        try:
+            async for frame in self._frames:
+                self._push(frame)
+                if self.disconnected_for_lag:
+                    break
+        except Exception as error:
+            logger.exception(f"Error while producing frames for {self.stream}: {error}")
+        finally:
+            self._exhausted = True
+            self._ready.set()
+
+    def _push(self, frame: Frame) -> None:
+        if len(self._queue) >= self.max_queued:
+            self._drop_queued()
+            if self.policy is SlowConsumerPolicy.DISCONNECT:
+                self.disconnected_for_lag = True
+                self.registry.disconnected_for_lag += 1
+                logger.info(f"Disconnecting a slow {self.transport.value} subscriber of {self.stream}.")
+                self._ready.set()
+                return
+        self._queue.append((frame, monotonic()))
+        self.max_queued_seen = max(self.max_queued_seen, len(self._queue))
+        self._ready.set()
+
+    def _drop_queued(self) -> None:
+        dropped = len(self._queue)
+        self._queue.clear()
+        self.dropped += dropped
+        self.registry.dropped += dropped
+        if self.policy is SlowConsumerPolicy.SUMMARY:
+            self._unreported_drops += dropped
+
+    def _pop_summary(self) -> Frame:
+        summary = {"dropped": self._unreported_drops, "cursor": self._last_sent_id}
+        self._unreported_drops = 0
+        self.summaries += 1
+        return Frame(event=SUMMARY_EVENT, data=json.dumps(summary, separators=(",", ":")).encode("utf-8"))
+
+
+class SubscriptionRegistry:
+    """
+    Open subscriptions, for monitoring.
+    """
+
+    def __init__(self, *, max_queued: int, policy: SlowConsumerPolicy):
+        self.max_queued = max_queued
+        self.policy = policy
+        self._subscriptions: Set[Subscription] = set()
+        self.dropped = 0
+        self.disconnected_for_lag = 0
+
+    def subscribe(
+        self,
+        frames: AsyncIterator[Frame],
+        *,
+        stream: str,
+        transport: Transport,
+        policy: Optional[SlowConsumerPolicy] = None,
+    ) -> Subscription:
+        return Subscription(
+            self, frames, stream=stream, transport=transport, max_queued=self.max_queued, policy=policy or self.policy
+        )
+
+    def add(self, subscription: Subscription) -> None:
+        self._subscriptions.add(subscription)
+
+    def remove(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        by_lag = sorted(self._subscriptions, key=lambda subscription: subscription.lag_seconds, reverse=True)
+        return {
+            "subscriptions": len(self._subscriptions),
+            "max_queued": self.max_queued,
+            "policy": self.policy.value,
+            "dropped": self.dropped,
+            "disconnected_for_lag": self.disconnected_for_lag,
+            "max_lag_seconds": round(by_lag[0].lag_seconds, 3) if by_lag else 0.0,
+            "connections": [subscription.stats() for subscription in by_lag[:MAX_REPORTED_SUBSCRIPTIONS]],
+        }
+
+
+def into_envelope(frame: Frame) -> bytes:
+    """
+    Frame as a single JSON document `{"event": ..., "id": ..., "data": ...}`, for transports without typed messages.
+    """
+    event_id = json.dumps(frame.id).encode("utf-8")
+    return b'{"event":"' + frame.event.encode("utf-8") + b'","id":' + event_id + b',"data":' + frame.data + b"}"
+
+
+async def merge_frames(*streams: AsyncIterator[Frame]) -> AsyncIterator[Frame]:
+    """
+    Interleaves the frames of several streams as they are produced, until all of them end.
+    An error raised by any of them is raised, after cancelling the others.
+    """
+    # Each stream is followed by `None` once it ends, or by the error it raised
+    queue: Queue[Frame | Exception | None] = Queue(maxsize=1)
+
+    async def forward(stream: AsyncIterator[Frame]) -> None:
+        try:
+            async for frame in stream:
+                await queue.put(frame)
+        except Exception as error:
+            await queue.put(error)
+        else:
+            await queue.put(None)
+
+    tasks = [create_task(forward(stream)) for stream in streams]
+    try:
+        running = len(tasks)
+        while running > 0:
+            item = await queue.get()
+            if item is None:
+                running -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def into_sse_event(frame: Frame) -> bytes:
+    event_id = f"id: {frame.id}\n".encode("utf-8") if frame.id is not None else b""
+    return event_id + f"event: {frame.event}\n".encode("utf-8") + b"data: " + frame.data + b"\n\n"
+
+
+async def into_sse_stream(subscription: Subscription) -> AsyncIterable[bytes]:
+    async with subscription:
+        async for frame in subscription:
+            yield into_sse_event(frame)
+
+
+async def into_ndjson_envelopes_stream(subscription: Subscription) -> AsyncIterable[bytes]:
+    async with subscription:
+        async for frame in subscription:
+            yield into_envelope(frame) + b"\n"
+
+
+async def send_to_websocket(websocket: WebSocket, subscription: Subscription) -> None:
+    """
+    Sends every frame as a text message `{"event": ..., "id": ..., "data": ...}`, until either side closes.
+    """
+    await websocket.accept()
+    async with subscription, TaskGroup() as task_group:
+        sending = task_group.create_task(_send_frames(websocket, subscription))
+        # Incoming messages are ignored, but must be received to notice the client leaving
+        receiving = task_group.create_task(_receive_until_disconnect(websocket))
+        # Whichever side finishes first ends the other
+        sending.add_done_callback(lambda _: receiving.cancel())
+        receiving.add_done_callback(lambda _: sending.cancel())
+
+    if websocket.client_state is WebSocketState.CONNECTED:
+        code = WS_1008_POLICY_VIOLATION if subscription.disconnected_for_lag else WS_1000_NORMAL_CLOSURE
+        await websocket.close(code)
+
+
+async def _send_frames(websocket: WebSocket, subscription: Subscription) -> None:
+    try:
+        async for frame in subscription:
+            await websocket.send_text(into_envelope(frame).decode("utf-8"))
+    except (WebSocketDisconnect, OSError):
+        logger.debug(f"The {subscription.stream} WebSocket was closed by the client.")
+
+
+async def _receive_until_disconnect(websocket: WebSocket) -> None:
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
@@ -0,0 +1,46 @@
+from http.client import NOT_FOUND
+from typing import Optional
+
+from fastapi import Path, Query
+from starlette.responses import JSONResponse, Response
+
+from api.cursors import PageDirection, decode_cursor, paginate
+from api.v1.serializers.addresses import AddressRead, AddressTransactionRead
+from api.v1.serializers.pages import Page
+from core.api import HASH_PATTERN, NBERequest
+from utils.option import into_option
+
+
+async def get(request: NBERequest, public_key: str = Path(pattern=HASH_PATTERN)) -> Response:
+    address = await request.app.state.address_repository.get_by_public_key(bytes.fromhex(public_key))
+    return address.map(
+        lambda _address: JSONResponse(AddressRead.from_address(_address).model_dump(mode="json"))
+    ).unwrap_or_else(lambda: Response(status_code=NOT_FOUND))
+
+
+async def get_transactions(
+    request: NBERequest,
+    public_key: str = Path(pattern=HASH_PATTERN),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+) -> Response:
+    direction, cursor_key = decode_cursor(cursor, key_length=2) if cursor is not None else (PageDirection.NEXT, None)
+    entries = await request.app.state.address_repository.get_transactions_page(
+        bytes.fromhex(public_key),
+        limit + 1,
+        cursor=into_option(cursor_key),
+        newer=direction is PageDirection.PREV,
+    )
+    entries, next_cursor, prev_cursor = paginate(
+        entries,
+        limit=limit,
+        direction=direction,
+        is_first_page=cursor is None,
+        key=lambda entry: (entry.slot, entry.transaction_id),
+    )
+    page = Page[AddressTransactionRead](
+        items=[AddressTransactionRead.from_address_transaction(entry) for entry in entries],
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+    return JSONResponse(page.model_dump(mode="json"))
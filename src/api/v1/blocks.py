@@ -1,37 +1,393 @@
-from http.client import NOT_FOUND
-from typing import TYPE_CHECKING, AsyncIterator, List
+from http.client import BAD_REQUEST, NOT_FOUND
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Tuple
 
-from fastapi import Path, Query
+from fastapi import Depends, Header, HTTPException, Path, Query
 from rusty_results import Empty, Option, Some
 from starlette.responses import JSONResponse, Response
 
-from api.streams import into_ndjson_stream
-from api.v1.serializers.blocks import BlockRead
-from core.api import NBERequest, NDJsonStreamingResponse
+from api.cursors import PageDirection, decode_cursor, decode_resume_cursor, paginate
+from api.fields import FieldSet, get_fields_dependency
+from api.filters import StreamFilter, filter_blocks, get_stream_filter
+from api.streams import (
+    Frame,
+    SlowConsumerPolicy,
+    Transport,
+    into_ndjson_stream,
+    into_sse_stream,
+    send_to_websocket,
+)
+from api.v1.serializers.blocks import (
+    BLOCK_FIELDS,
+    BLOCK_HEADER_COLUMNS,
+    BlockHeaderRead,
+    BlockRead,
+    BlockRecord,
+)
+from api.v1.serializers.pages import Page
+from api.v1.serializers.transactions import TransactionRead
+from api.v1.transactions import get_transaction_fields
+from core.api import (
+    HASH_PATTERN,
+    HASHES_PATTERN,
+    IDS_PATTERN,
+    IMMUTABLE_CACHE_CONTROL,
+    ImmutableJSONResponse,
+    NBERequest,
+    NBEWebSocket,
+    NDJsonStreamingResponse,
+    NotModifiedResponse,
+    SseStreamingResponse,
+    accepts_event_stream,
+    accepts_ndjson,
+    get_matching_etag,
+    into_etag,
+    parse_batch,
+)
+from db.blocks import BlockCursor
 from models.block import Block
+from models.transactions.operations.contents import ContentType
+from models.transactions.transaction import Transaction
+from utils.option import into_option
 
 if TYPE_CHECKING:
     from core.app import NBE
 
+get_block_fields = get_fields_dependency(BLOCK_FIELDS)
 
-async def _get_blocks_stream_serialized(app: "NBE", block_from: Option[Block]) -> AsyncIterator[List[BlockRead]]:
-    _stream = app.state.block_repository.updates_stream(block_from)
+
+async def _get_blocks_stream_serialized(
+    app: "NBE", cursor: Option[BlockCursor], stream_filter: StreamFilter, fields: Option[FieldSet]
+) -> AsyncIterator[List[BlockRead]]:
+    columns = fields.map(lambda _fields: _fields.columns)
+    _stream = app.state.block_repository.updates_stream(
+        cursor, operation_type=stream_filter.operation_type, columns=columns
+    )
     async for blocks in _stream:
-        yield [BlockRead.from_block(block) for block in blocks]
+        # The filter reuses the attributes computed at ingestion, so it needs no columns of its own
+        blocks = await filter_blocks(app, stream_filter, blocks, columns=columns)
+        yield [BlockRead.from_block(block, fields=fields) for block in blocks]
+
+
+def _into_record_json(record: BlockRecord, fields: Option[FieldSet]) -> bytes:
+    data = record.ndjson.rstrip(b"\n")
+    return fields.map(lambda _fields: _fields.project_json(data)).unwrap_or(data)
+
+
+async def get_latest_records(app: "NBE", limit: int, stream_filter: StreamFilter) -> List[BlockRecord]:
+    if not stream_filter.is_empty:
+        return await _get_latest_records_filtered(app, limit, stream_filter)
+    tail_records: Option[List[BlockRecord]] = app.state.block_tail.latest(limit)
+    if tail_records.is_some:
+        return tail_records.unwrap()
+    latest_blocks = await app.state.block_repository.get_latest(limit)
+    return [BlockRecord.from_block(block) for block in latest_blocks]
+
+
+async def _get_latest_records_filtered(app: "NBE", limit: int, stream_filter: StreamFilter) -> List[BlockRecord]:
+    """
+    Past the hot tail, only the latest `limit` blocks with the requested operation type are considered: The criteria not
+    applied by the database may leave fewer than `limit` records.
+    """
+    tail_records: Option[List[BlockRecord]] = app.state.block_tail.latest(
+        limit, where=lambda record: stream_filter.matches_block(record.attributes)
+    )
+    if tail_records.is_some:
+        return tail_records.unwrap()
+    latest_blocks = await app.state.block_repository.get_page(limit, operation_type=stream_filter.operation_type)
+    matching_blocks = await filter_blocks(app, stream_filter, latest_blocks)
+    return [BlockRecord.from_block(block) for block in reversed(matching_blocks)]
+
+
+async def _get_bootstrap(
+    app: "NBE", prefetch_limit: int, stream_filter: StreamFilter, resume_cursor: Optional[str]
+) -> Tuple[Option[BlockCursor], List[BlockRecord]]:
+    """
+    Cursor to stream from, and the records to send before streaming.
+    """
+    if resume_cursor is not None:
+        return Some(decode_resume_cursor(resume_cursor, key_length=2)), []
+    latest_records = await get_latest_records(app, prefetch_limit, stream_filter)
+    cursor = Some(latest_records[-1].key) if latest_records else Empty()
+    return cursor, latest_records
+
+
+async def _get_blocks_frames(
+    app: "NBE",
+    cursor: Option[BlockCursor],
+    bootstrap_records: List[BlockRecord],
+    stream_filter: StreamFilter,
+    fields: Option[FieldSet],
+) -> AsyncIterator[Frame]:
+    for record in bootstrap_records:
+        yield Frame("block", _into_record_json(record, fields), record.cursor)
+    async for block_reads in _get_blocks_stream_serialized(app, cursor, stream_filter, fields):
+        for block_read in block_reads:
+            yield Frame("block", block_read.model_dump_json().encode("utf-8"), block_read.cursor)
 
 
-async def stream(request: NBERequest, prefetch_limit: int = Query(0, alias="prefetch-limit", ge=0)) -> Response:
-    latest_blocks = await request.app.state.block_repository.get_latest(prefetch_limit)
-    latest_block = Some(latest_blocks[-1]) if latest_blocks else Empty()
-    bootstrap_blocks: List[BlockRead] = [BlockRead.from_block(block) for block in latest_blocks]
+async def stream(
+    request: NBERequest,
+    prefetch_limit: int = Query(0, alias="prefetch-limit", ge=0),
+    stream_filter: StreamFilter = Depends(get_stream_filter),
+    fields: Option[FieldSet] = Depends(get_block_fields),
+    after: Optional[str] = Query(None, description="Resume right after the item carrying this cursor."),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    slow_consumer: Optional[SlowConsumerPolicy] = Query(None, alias="slow-consumer"),
+) -> Response:
+    """
+    Streams new items as they are ingested, after bootstrapping with the latest `prefetch-limit` ones.
+    When resuming (with `after`, or `Last-Event-ID`, which is sent on reconnection and takes precedence), only the
+    items after the resumed one are streamed, and `prefetch-limit` is ignored.
+    Items are sent as Server-Sent Events if the client accepts them, or as NDJSON otherwise.
+    """
+    cursor, bootstrap_records = await _get_bootstrap(request.app, prefetch_limit, stream_filter, last_event_id or after)
+    # Streams are resumed from their items' cursors, so those are always sent
+    fields = fields.map(lambda _fields: _fields.with_names("cursor"))
 
-    blocks_stream: AsyncIterator[List[BlockRead]] = _get_blocks_stream_serialized(request.app, latest_block)
+    if accepts_event_stream(request):
+        frames = _get_blocks_frames(request.app, cursor, bootstrap_records, stream_filter, fields)
+        subscription = request.app.state.subscriptions.subscribe(
+            frames, stream="blocks", transport=Transport.SSE, policy=slow_consumer
+        )
+        return SseStreamingResponse(into_sse_stream(subscription))
+
+    bootstrap_blocks = b"".join(_into_record_json(record, fields) + b"\n" for record in bootstrap_records)
+    blocks_stream: AsyncIterator[List[BlockRead]] = _get_blocks_stream_serialized(
+        request.app, cursor, stream_filter, fields
+    )
     ndjson_blocks_stream = into_ndjson_stream(blocks_stream, bootstrap_data=bootstrap_blocks)
     return NDJsonStreamingResponse(ndjson_blocks_stream)
 
 
-async def get(request: NBERequest, block_id: int = Path(ge=1)) -> Response:
+async def stream_websocket(
+    websocket: NBEWebSocket,
+    prefetch_limit: int = Query(0, alias="prefetch-limit", ge=0),
+    stream_filter: StreamFilter = Depends(get_stream_filter),
+    fields: Option[FieldSet] = Depends(get_block_fields),
+    after: Optional[str] = Query(None, description="Resume right after the item carrying this cursor."),
+    slow_consumer: Optional[SlowConsumerPolicy] = Query(None, alias="slow-consumer"),
+) -> None:
+    cursor, bootstrap_records = await _get_bootstrap(websocket.app, prefetch_limit, stream_filter, after)
+    fields = fields.map(lambda _fields: _fields.with_names("cursor"))
+    frames = _get_blocks_frames(websocket.app, cursor, bootstrap_records, stream_filter, fields)
+    subscription = websocket.app.state.subscriptions.subscribe(
+        frames, stream="blocks", transport=Transport.WEBSOCKET, policy=slow_consumer
+    )
+    await send_to_websocket(websocket, subscription)
+
+
+HEADER_ONLY_DESCRIPTION = (
+    "Return the block without its transactions (see `/blocks/{id}/transactions`), only their count."
+)
+
+
+def _check_representation(fields: Option[FieldSet], header_only: bool) -> None:
+    if fields.is_some and header_only:
+        raise HTTPException(BAD_REQUEST, detail="Only one of `fields` or `header-only` can be requested at once.")
+
+
+async def get(
+    request: NBERequest,
+    block_id: int = Path(ge=1),
+    fields: Option[FieldSet] = Depends(get_block_fields),
+    header_only: bool = Query(False, alias="header-only", description=HEADER_ONLY_DESCRIPTION),
+) -> Response:
+    _check_representation(fields, header_only)
+    if header_only:
+        etag = await _get_matching_etag_by_id(request, "header", block_id)
+        if etag.is_some:
+            return NotModifiedResponse(etag.unwrap())
+        block = await request.app.state.block_repository.get_by_id(block_id, columns=Some(BLOCK_HEADER_COLUMNS))
+        return await _into_block_header_response(request.app, block)
+    if fields.is_some:
+        block = await request.app.state.block_repository.get_by_id(block_id, columns=Some(fields.unwrap().columns))
+        return _into_sparse_block_response(block, fields.unwrap())
+    etag = await _get_matching_etag_by_id(request, "block", block_id)
+    if etag.is_some:
+        return NotModifiedResponse(etag.unwrap())
     block = await request.app.state.block_repository.get_by_id(block_id)
-    return block.map(lambda _block: JSONResponse(BlockRead.from_block(_block).model_dump(mode="json"))).unwrap_or_else(
-        lambda: Response(status_code=NOT_FOUND)
+    return block.map(_into_block_response).unwrap_or_else(lambda: Response(status_code=NOT_FOUND))
+
+
+async def get_by_hash(
+    request: NBERequest,
+    block_hash: str = Path(pattern=HASH_PATTERN),
+    fields: Option[FieldSet] = Depends(get_block_fields),
+    header_only: bool = Query(False, alias="header-only", description=HEADER_ONLY_DESCRIPTION),
+) -> Response:
+    _check_representation(fields, header_only)
+    if header_only:
+        etag = get_matching_etag(request, "header", item_hash=bytes.fromhex(block_hash))
+        if etag.is_some:
+            return NotModifiedResponse(etag.unwrap())
+        block = await request.app.state.block_repository.get_by_hash(
+            bytes.fromhex(block_hash), columns=Some(BLOCK_HEADER_COLUMNS)
+        )
+        return await _into_block_header_response(request.app, block)
+    if fields.is_some:
+        block = await request.app.state.block_repository.get_by_hash(
+            bytes.fromhex(block_hash), columns=Some(fields.unwrap().columns)
+        )
+        return _into_sparse_block_response(block, fields.unwrap())
+    etag = get_matching_etag(request, "block", item_hash=bytes.fromhex(block_hash))
+    if etag.is_some:
+        return NotModifiedResponse(etag.unwrap())
+    block = await request.app.state.block_repository.get_by_hash(bytes.fromhex(block_hash))
+    return block.map(_into_block_response).unwrap_or_else(lambda: Response(status_code=NOT_FOUND))
+
+
+async def _get_matching_etag_by_id(request: NBERequest, kind: str, block_id: int) -> Option[str]:
+    """
+    Ids are not stable across database resyncs, so an ETag only matches if it also carries the block's current hash.
+    Only that column is read, if the block is not cached. No ETag matches a missing block, so it gets its 404.
+    """
+    if "if-none-match" not in request.headers:
+        return Empty()
+    block = await request.app.state.block_repository.get_by_id(block_id, columns=Some(frozenset({"hash"})))
+    if block.is_empty:
+        return Empty()
+    return get_matching_etag(request, kind, item_id=block_id, item_hash=block.unwrap().hash)
+
+
+def _into_block_response(block: Block) -> Response:
+    content = BlockRead.from_block(block).model_dump(mode="json")
+    return ImmutableJSONResponse(content, etag=into_etag("block", block.id, block.hash))
+
+
+async def _into_block_header_response(app: "NBE", block: Option[Block]) -> Response:
+    """
+    Headers are immutable as well, but a distinct representation of the block, so they get ETags of their own.
+    """
+    if block.is_empty:
+        return Response(status_code=NOT_FOUND)
+    _block = block.unwrap()
+    transactions_count = await app.state.transaction_repository.count_by_block_id(_block.id)
+    content = BlockHeaderRead.from_block(_block, transactions_count=transactions_count).model_dump(mode="json")
+    return ImmutableJSONResponse(content, etag=into_etag("header", _block.id, _block.hash))
+
+
+def _into_sparse_block_response(block: Option[Block], fields: FieldSet) -> Response:
+    """
+    Sparse representations are cached as long as full ones, but without an ETag: Those are only issued for the full
+    representation, which revalidations are answered for without looking the block up.
+    """
+    if block.is_empty:
+        return Response(status_code=NOT_FOUND)
+    content = BlockRead.from_block(block.unwrap(), fields=Some(fields)).model_dump(mode="json")
+    return JSONResponse(content, headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL})
+
+
+async def get_list(
+    request: NBERequest,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    before_slot: Optional[int] = Query(None, ge=0),
+    after_slot: Optional[int] = Query(None, ge=0),
+    ids: Optional[str] = Query(None, pattern=IDS_PATTERN, description="Comma-separated ids to fetch in one go."),
+    hashes: Optional[str] = Query(
+        None, pattern=HASHES_PATTERN, description="Comma-separated hashes in hex format to fetch in one go."
+    ),
+    op_type: Optional[ContentType] = Query(None, description="Only list items with an operation of this type."),
+    fields: Option[FieldSet] = Depends(get_block_fields),
+) -> Response:
+    columns = fields.map(lambda _fields: _fields.columns)
+    block_ids, block_hashes = parse_batch(ids, hashes)
+    if block_ids is not None:
+        blocks = await request.app.state.block_repository.get_by_ids(block_ids, columns=columns)
+        return _into_batch_response(blocks, fields)
+    if block_hashes is not None:
+        blocks = await request.app.state.block_repository.get_by_hashes(block_hashes, columns=columns)
+        return _into_batch_response(blocks, fields)
+
+    direction, cursor_key = decode_cursor(cursor, key_length=2) if cursor is not None else (PageDirection.NEXT, None)
+    blocks = await request.app.state.block_repository.get_page(
+        limit + 1,
+        cursor=into_option(cursor_key),
+        newer=direction is PageDirection.PREV,
+        before_slot=into_option(before_slot),
+        after_slot=into_option(after_slot),
+        operation_type=into_option(op_type),
+        columns=columns,
+    )
+    blocks, next_cursor, prev_cursor = paginate(
+        blocks,
+        limit=limit,
+        direction=direction,
+        is_first_page=cursor is None and before_slot is None,
+        key=lambda block: (block.slot, block.id),
+    )
+    page = Page[BlockRead](
+        items=[BlockRead.from_block(block, fields=fields) for block in blocks],
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+    return JSONResponse(page.model_dump(mode="json"))
+
+
+def _into_batch_response(blocks: List[Option[Block]], fields: Option[FieldSet]) -> Response:
+    """
+    Missing items are returned as `null`, so the response stays aligned with the requested order.
+    """
+    content = [
+        block.map(lambda _block: BlockRead.from_block(_block, fields=fields).model_dump(mode="json")).unwrap_or(None)
+        for block in blocks
+    ]
+    return JSONResponse(content)
+
+
+async def _serialize_transactions(
+    batches: AsyncIterator[List[Transaction]], fields: Option[FieldSet]
+) -> AsyncIterator[List[TransactionRead]]:
+    async for transactions in batches:
+        yield [TransactionRead.from_transaction(transaction, fields=fields) for transaction in transactions]
+
+
+async def get_transactions(
+    request: NBERequest,
+    block_id: int = Path(ge=1),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Option[FieldSet] = Depends(get_transaction_fields),
+) -> Response:
+    """
+    The block's transactions in their order within it, keyset-paginated: `next_cursor` continues with the later ones.
+    If the client accepts NDJSON, all of them (after `cursor`, if given) are streamed instead, batch by batch as they are
+    read, so a large block is never held in memory at once. `limit` only applies to pages.
+    """
+    block = await request.app.state.block_repository.get_by_id(block_id, columns=Some(frozenset()))
+    if block.is_empty:
+        return Response(status_code=NOT_FOUND)
+
+    direction, cursor_key = decode_cursor(cursor, key_length=1) if cursor is not None else (PageDirection.NEXT, None)
+    transaction_cursor = into_option(cursor_key).map(lambda _cursor_key: _cursor_key[0])
+    columns = fields.map(lambda _fields: _fields.columns)
+    repository = request.app.state.transaction_repository
+
+    if accepts_ndjson(request):
+        if direction is not PageDirection.NEXT:
+            raise HTTPException(
+                BAD_REQUEST, detail="Invalid cursor: Transactions can only be streamed towards later ones."
+            )
+        batches = repository.iter_block_transactions(block_id, after=transaction_cursor, columns=columns)
+        return NDJsonStreamingResponse(into_ndjson_stream(_serialize_transactions(batches, fields)))
+
+    transactions = await repository.get_block_page(
+        block_id,
+        limit + 1,
+        cursor=transaction_cursor,
+        backwards=direction is PageDirection.PREV,
+        columns=columns,
+    )
+    transactions, next_cursor, prev_cursor = paginate(
+        transactions,
+        limit=limit,
+        direction=direction,
+        is_first_page=cursor is None,
+        key=lambda transaction: (transaction.id,),
+    )
+    page = Page[TransactionRead](
+        items=[TransactionRead.from_transaction(transaction, fields=fields) for transaction in transactions],
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
     )
+    return JSONResponse(page.model_dump(mode="json"))
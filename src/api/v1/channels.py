@@ -0,0 +1,46 @@
+from http.client import NOT_FOUND
+from typing import Optional
+
+from fastapi import Path, Query
+from starlette.responses import JSONResponse, Response
+
+from api.cursors import PageDirection, decode_cursor, paginate
+from api.v1.serializers.channels import ChannelOperationRead, ChannelRead
+from api.v1.serializers.pages import Page
+from core.api import HASH_PATTERN, NBERequest
+from utils.option import into_option
+
+
+async def get(request: NBERequest, channel_id: str = Path(pattern=HASH_PATTERN)) -> Response:
+    channel = await request.app.state.channel_repository.get_by_id(bytes.fromhex(channel_id))
+    return channel.map(
+        lambda _channel: JSONResponse(ChannelRead.from_channel(_channel).model_dump(mode="json"))
+    ).unwrap_or_else(lambda: Response(status_code=NOT_FOUND))
+
+
+async def get_operations(
+    request: NBERequest,
+    channel_id: str = Path(pattern=HASH_PATTERN),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+) -> Response:
+    direction, cursor_key = decode_cursor(cursor, key_length=3) if cursor is not None else (PageDirection.NEXT, None)
+    operations = await request.app.state.channel_repository.get_operations_page(
+        bytes.fromhex(channel_id),
+        limit + 1,
+        cursor=into_option(cursor_key),
+        newer=direction is PageDirection.PREV,
+    )
+    operations, next_cursor, prev_cursor = paginate(
+        operations,
+        limit=limit,
+        direction=direction,
+        is_first_page=cursor is None,
+        key=lambda operation: (operation.slot, operation.transaction_id, operation.operation_index),
+    )
+    page = Page[ChannelOperationRead](
+        items=[ChannelOperationRead.from_channel_operation(operation) for operation in operations],
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+    return JSONResponse(page.model_dump(mode="json"))
@@ -1,28 +1,60 @@
-from asyncio import sleep
-from typing import AsyncIterator
+from typing import AsyncIterator, Optional
 
+from fastapi import Query
 from starlette.responses import JSONResponse, Response
 
-from api.streams import into_ndjson_stream
-from core.api import NBERequest, NDJsonStreamingResponse
-from models.health import Health
-from node.api.base import NodeApi
-from node.api.serializers.health import HealthSerializer
+from api.streams import (
+    Frame,
+    SlowConsumerPolicy,
+    Transport,
+    into_ndjson_stream,
+    into_sse_stream,
+    send_to_websocket,
+)
+from core.api import (
+    NBERequest,
+    NBEWebSocket,
+    NDJsonStreamingResponse,
+    SseStreamingResponse,
+    accepts_event_stream,
+)
+from node.health import HealthMonitor
 
 
 async def get(request: NBERequest) -> Response:
-    response = await request.app.state.node_api.get_health()
-    return JSONResponse(response)
-
-
-async def _create_health_stream(node_api: NodeApi, *, poll_interval_seconds: int = 10) -> AsyncIterator[Health]:
-    while True:
-        health_serializer: HealthSerializer = await node_api.get_health()
-        yield health_serializer.into_health()
-        await sleep(poll_interval_seconds)
-
-
-async def stream(request: NBERequest) -> Response:
-    health_stream = _create_health_stream(request.app.state.node_api)
+    health = await request.app.state.health_monitor.get()
+    return JSONResponse(health.model_dump(mode="json"))
+
+
+async def get_health_frames(health_monitor: HealthMonitor) -> AsyncIterator[Frame]:
+    async for health in health_monitor.updates():
+        yield Frame("health", health.model_dump_json().encode("utf-8"))
+
+
+async def stream(
+    request: NBERequest, slow_consumer: Optional[SlowConsumerPolicy] = Query(None, alias="slow-consumer")
+) -> Response:
+    """
+    Streams the node's health, and then every change of it.
+    Items are sent as Server-Sent Events if the client accepts them, or as NDJSON otherwise.
+    """
+    if accepts_event_stream(request):
+        frames = get_health_frames(request.app.state.health_monitor)
+        subscription = request.app.state.subscriptions.subscribe(
+            frames, stream="health", transport=Transport.SSE, policy=slow_consumer
+        )
+        return SseStreamingResponse(into_sse_stream(subscription))
+
+    health_stream = request.app.state.health_monitor.updates()
     ndjson_health_stream = into_ndjson_stream(health_stream)
     return NDJsonStreamingResponse(ndjson_health_stream)
+
+
+async def stream_websocket(
+    websocket: NBEWebSocket, slow_consumer: Optional[SlowConsumerPolicy] = Query(None, alias="slow-consumer")
+) -> None:
+    frames = get_health_frames(websocket.app.state.health_monitor)
+    subscription = websocket.app.state.subscriptions.subscribe(
+        frames, stream="health", transport=Transport.WEBSOCKET, policy=slow_consumer
+    )
+    await send_to_websocket(websocket, subscription)
@@ -0,0 +1,76 @@
+from http.client import NOT_FOUND
+from typing import Optional
+
+from fastapi import Path, Query
+from starlette.responses import JSONResponse, Response
+
+from api.cursors import PageDirection, decode_cursor, paginate
+from api.v1.serializers.leaders import LeaderEpochRead, LeaderRead
+from api.v1.serializers.pages import Page
+from core.api import HASH_PATTERN, NBERequest
+from utils.option import into_option
+
+
+async def get_list(
+    request: NBERequest,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+) -> Response:
+    direction, cursor_key = decode_cursor(cursor, key_length=2) if cursor is not None else (PageDirection.NEXT, None)
+    leaders = await request.app.state.leader_repository.get_page(
+        limit + 1,
+        cursor=into_option(cursor_key),
+        newer=direction is PageDirection.PREV,
+    )
+    leaders, next_cursor, prev_cursor = paginate(
+        leaders,
+        limit=limit,
+        direction=direction,
+        is_first_page=cursor is None,
+        key=lambda leader: (leader.last_slot, leader.id),
+    )
+    page = Page[LeaderRead](
+        items=[LeaderRead.from_leader(leader) for leader in leaders],
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+    return JSONResponse(page.model_dump(mode="json"))
+
+
+async def get(request: NBERequest, leader_key: str = Path(pattern=HASH_PATTERN)) -> Response:
+    leader = await request.app.state.leader_repository.get_by_leader_key(bytes.fromhex(leader_key))
+    return leader.map(
+        lambda _leader: JSONResponse(LeaderRead.from_leader(_leader).model_dump(mode="json"))
+    ).unwrap_or_else(lambda: Response(status_code=NOT_FOUND))
+
+
+async def get_epochs(
+    request: NBERequest,
+    leader_key: str = Path(pattern=HASH_PATTERN),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+) -> Response:
+    leader = await request.app.state.leader_repository.get_by_leader_key(bytes.fromhex(leader_key))
+    if leader.is_empty:
+        return Response(status_code=NOT_FOUND)
+
+    direction, cursor_key = decode_cursor(cursor, key_length=1) if cursor is not None else (PageDirection.NEXT, None)
+    leader_epochs = await request.app.state.leader_repository.get_epochs_page(
+        leader.unwrap().id,
+        limit + 1,
+        cursor=into_option(cursor_key),
+        newer=direction is PageDirection.PREV,
+    )
+    leader_epochs, next_cursor, prev_cursor = paginate(
+        leader_epochs,
+        limit=limit,
+        direction=direction,
+        is_first_page=cursor is None,
+        key=lambda leader_epoch: (leader_epoch.epoch,),
+    )
+    page = Page[LeaderEpochRead](
+        items=[LeaderEpochRead.from_leader_epoch(leader_epoch) for leader_epoch in leader_epochs],
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+    return JSONResponse(page.model_dump(mode="json"))
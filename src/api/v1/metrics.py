@@ -0,0 +1,21 @@
+from starlette.responses import JSONResponse, Response
+
+from core import blobs
+from core.api import NBERequest
+
+
+async def get(request: NBERequest) -> Response:
+    with request.app.state.db_client.session() as session:
+        blob_store = blobs.get_stats(session.connection())
+    content = {
+        "cache": request.app.state.cache.stats(),
+        "block_tail": request.app.state.block_tail.stats(),
+        "transaction_tail": request.app.state.transaction_tail.stats(),
+        "subscriptions": request.app.state.subscriptions.stats(),
+        "health": request.app.state.health_monitor.stats(),
+        "response_compression": request.app.state.response_compression.stats(),
+        "admission": request.app.state.admission.stats(),
+        "blob_store": blob_store,
+        "compression": await request.app.state.compression_repository.get_stats(),
+    }
+    return JSONResponse(content)
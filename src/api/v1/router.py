@@ -1,6 +1,20 @@
 from fastapi import APIRouter
 
-from . import blocks, health, index, transactions
+from . import (
+    addresses,
+    blocks,
+    channels,
+    health,
+    index,
+    leaders,
+    metrics,
+    sdp,
+    search,
+    series,
+    stats,
+    stream,
+    transactions,
+)
 
 
 def create_v1_router() -> APIRouter:
@@ -10,11 +24,44 @@ def create_v1_router() -> APIRouter:
 
     router.add_api_route("/health", health.get, methods=["GET", "HEAD"])
     router.add_api_route("/health/stream", health.stream, methods=["GET", "HEAD"])
+    router.add_api_websocket_route("/health/stream", health.stream_websocket)
 
+    router.add_api_route("/stream", stream.stream, methods=["GET"])
+    router.add_api_websocket_route("/stream", stream.stream_websocket)
+
+    router.add_api_route("/metrics", metrics.get, methods=["GET"])
+
+    router.add_api_route("/stats", stats.get, methods=["GET"])
+    router.add_api_route("/stats/stream", stats.stream, methods=["GET"])
+    router.add_api_route("/series/{metric}", series.get, methods=["GET"])
+
+    router.add_api_route("/transactions", transactions.get_list, methods=["GET"])
     router.add_api_route("/transactions/{transaction_id:int}", transactions.get, methods=["GET"])
+    router.add_api_route("/transactions/by-hash/{transaction_hash}", transactions.get_by_hash, methods=["GET"])
     router.add_api_route("/transactions/stream", transactions.stream, methods=["GET"])
+    router.add_api_websocket_route("/transactions/stream", transactions.stream_websocket)
 
+    router.add_api_route("/blocks", blocks.get_list, methods=["GET"])
     router.add_api_route("/blocks/{block_id:int}", blocks.get, methods=["GET"])
+    router.add_api_route("/blocks/by-hash/{block_hash}", blocks.get_by_hash, methods=["GET"])
+    router.add_api_route("/blocks/{block_id:int}/transactions", blocks.get_transactions, methods=["GET"])
     router.add_api_route("/blocks/stream", blocks.stream, methods=["GET"])
+    router.add_api_websocket_route("/blocks/stream", blocks.stream_websocket)
+
+    router.add_api_route("/addresses/{public_key}", addresses.get, methods=["GET"])
+    router.add_api_route("/addresses/{public_key}/transactions", addresses.get_transactions, methods=["GET"])
+
+    router.add_api_route("/channels/{channel_id}", channels.get, methods=["GET"])
+    router.add_api_route("/channels/{channel_id}/operations", channels.get_operations, methods=["GET"])
+
+    router.add_api_route("/leaders", leaders.get_list, methods=["GET"])
+    router.add_api_route("/leaders/{leader_key}", leaders.get, methods=["GET"])
+    router.add_api_route("/leaders/{leader_key}/epochs", leaders.get_epochs, methods=["GET"])
+
+    router.add_api_route("/sdp/declarations", sdp.get_declarations, methods=["GET"])
+    router.add_api_route("/sdp/declarations/{declaration_id}", sdp.get_declaration, methods=["GET"])
+
+    router.add_api_route("/search", search.search, methods=["GET"])
+    router.add_api_route("/search/inscriptions", search.search_inscriptions, methods=["GET"])
 
     return router
@@ -0,0 +1,52 @@
+from http.client import NOT_FOUND
+from typing import Optional
+
+from fastapi import Path, Query
+from starlette.responses import JSONResponse, Response
+
+from api.cursors import PageDirection, decode_cursor, paginate
+from api.v1.serializers.pages import Page
+from api.v1.serializers.sdp import SdpDeclarationRead
+from core.api import HASH_PATTERN, NBERequest
+from models.sdp import SdpDeclarationStatus
+from models.transactions.operations.contents import SDPDeclareServiceType
+from utils.option import into_option
+
+
+async def get_declaration(request: NBERequest, declaration_id: str = Path(pattern=HASH_PATTERN)) -> Response:
+    declaration = await request.app.state.sdp_repository.get_by_declaration_id(bytes.fromhex(declaration_id))
+    return declaration.map(
+        lambda _declaration: JSONResponse(SdpDeclarationRead.from_sdp_declaration(_declaration).model_dump(mode="json"))
+    ).unwrap_or_else(lambda: Response(status_code=NOT_FOUND))
+
+
+async def get_declarations(
+    request: NBERequest,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    status: Optional[SdpDeclarationStatus] = Query(None),
+    service_type: Optional[SDPDeclareServiceType] = Query(None),
+    provider_id: Optional[str] = Query(None, pattern=HASH_PATTERN),
+) -> Response:
+    direction, cursor_key = decode_cursor(cursor, key_length=1) if cursor is not None else (PageDirection.NEXT, None)
+    declarations = await request.app.state.sdp_repository.get_page(
+        limit + 1,
+        cursor=into_option(cursor_key),
+        newer=direction is PageDirection.PREV,
+        status=into_option(status),
+        service_type=into_option(service_type),
+        provider_id=into_option(provider_id).map(bytes.fromhex),
+    )
+    declarations, next_cursor, prev_cursor = paginate(
+        declarations,
+        limit=limit,
+        direction=direction,
+        is_first_page=cursor is None,
+        key=lambda declaration: (declaration.id,),
+    )
+    page = Page[SdpDeclarationRead](
+        items=[SdpDeclarationRead.from_sdp_declaration(declaration) for declaration in declarations],
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+    return JSONResponse(page.model_dump(mode="json"))
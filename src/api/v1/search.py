@@ -0,0 +1,55 @@
+from http.client import BAD_REQUEST
+from typing import List, Optional
+
+from fastapi import HTTPException, Query
+from starlette.responses import JSONResponse, Response
+
+from api.cursors import PageDirection, decode_cursor, encode_cursor
+from api.v1.serializers.pages import Page
+from api.v1.serializers.search import InscriptionHit, SearchHit
+from core.api import HASH_PREFIX_PATTERN, NBERequest
+from db.inscriptions import MAX_SEARCH_OFFSET, into_match_query
+
+
+async def search(
+    request: NBERequest,
+    query: str = Query(alias="q", min_length=1, pattern=HASH_PREFIX_PATTERN, description="Hash prefix in hex format."),
+    limit: int = Query(10, ge=1, le=100),
+) -> Response:
+    hash_prefix = query.lower()
+    blocks = await request.app.state.block_repository.get_by_hash_prefix(hash_prefix, limit=limit)
+    transactions = await request.app.state.transaction_repository.get_by_hash_prefix(hash_prefix, limit=limit)
+
+    hits: List[SearchHit] = [SearchHit.from_block(block) for block in blocks]
+    hits.extend(SearchHit.from_transaction(transaction) for transaction in transactions)
+    content = [hit.model_dump(mode="json") for hit in hits]
+    return JSONResponse(content)
+
+
+async def search_inscriptions(
+    request: NBERequest,
+    query: str = Query(
+        alias="q", min_length=1, max_length=256, description="Terms to match. A trailing `*` matches a prefix."
+    ),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+) -> Response:
+    """
+    Ranked results are paginated by offset, since their order is not a key of the index. The cursor stays opaque.
+    """
+    match_query = into_match_query(query)
+    if match_query.is_empty:
+        raise HTTPException(BAD_REQUEST, detail="Query has no terms.")
+
+    _, (offset,) = decode_cursor(cursor, key_length=1) if cursor is not None else (PageDirection.NEXT, (0,))
+    if not 0 <= offset <= MAX_SEARCH_OFFSET:
+        raise HTTPException(BAD_REQUEST, detail="Invalid cursor.")
+    matches = await request.app.state.inscription_repository.search(match_query.unwrap(), limit + 1, offset=offset)
+
+    has_more = len(matches) > limit and offset + limit <= MAX_SEARCH_OFFSET
+    page = Page[InscriptionHit](
+        items=[InscriptionHit.from_inscription_match(match) for match in matches[:limit]],
+        next_cursor=encode_cursor(PageDirection.NEXT, (offset + limit,)) if has_more else None,
+        prev_cursor=encode_cursor(PageDirection.PREV, (max(0, offset - limit),)) if offset > 0 else None,
+    )
+    return JSONResponse(page.model_dump(mode="json"))
@@ -0,0 +1,37 @@
+from typing import Self
+
+from core.models import NbeSchema
+from core.types import HexBytes
+from models.address import Address, AddressTransaction
+
+
+class AddressRead(NbeSchema):
+    public_key: HexBytes
+    total_received: int
+    transactions_count: int
+    first_slot: int
+    last_slot: int
+
+    @classmethod
+    def from_address(cls, address: Address) -> Self:
+        return cls(
+            public_key=address.public_key,
+            total_received=address.total_received,
+            transactions_count=address.transactions_count,
+            first_slot=address.first_slot,
+            last_slot=address.last_slot,
+        )
+
+
+class AddressTransactionRead(NbeSchema):
+    transaction_id: int
+    slot: int
+    value: int
+
+    @classmethod
+    def from_address_transaction(cls, address_transaction: AddressTransaction) -> Self:
+        return cls(
+            transaction_id=address_transaction.transaction_id,
+            slot=address_transaction.slot,
+            value=address_transaction.value,
+        )
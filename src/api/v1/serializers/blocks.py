@@ -1,5 +1,11 @@
-from typing import List, Self
+from dataclasses import dataclass
+from typing import List, Mapping, Self, Tuple
 
+from rusty_results import Empty, Option
+
+from api.cursors import PageDirection, encode_cursor
+from api.fields import FieldSet, SparseField
+from api.filters import BlockAttributes
 from core.models import NbeSchema
 from core.types import HexBytes
 from models.block import Block
@@ -15,9 +21,16 @@ class BlockRead(NbeSchema):
     block_root: HexBytes
     proof_of_leadership: ProofOfLeadership
     transactions: List[Transaction]
+    cursor: str  # Resumes a stream right after this block
 
     @classmethod
-    def from_block(cls, block: Block) -> Self:
+    def from_block(cls, block: Block, *, fields: Option[FieldSet] = Empty()) -> Self:
+        """
+        With `fields`, only those are read from `block` (so it may have been loaded with just their columns), into a
+        sparse instance that only dumps them.
+        """
+        if fields.is_some:
+            return cls.model_construct(**fields.unwrap().get_values(block))
         return cls(
             id=block.id,
             hash=block.hash,
@@ -26,4 +39,78 @@ class BlockRead(NbeSchema):
             block_root=block.block_root,
             proof_of_leadership=block.proof_of_leadership,
             transactions=block.transactions,
+            cursor=encode_cursor(PageDirection.PREV, (block.slot, block.id)),
+        )
+
+
+class BlockHeaderRead(NbeSchema):
+    """
+    `BlockRead` without its transactions, which are listed by `/blocks/{id}/transactions`, but with their count.
+    """
+
+    id: int
+    hash: HexBytes
+    parent_block_hash: HexBytes
+    slot: int
+    block_root: HexBytes
+    proof_of_leadership: ProofOfLeadership
+    transactions_count: int
+    cursor: str
+
+    @classmethod
+    def from_block(cls, block: Block, *, transactions_count: int) -> Self:
+        return cls(
+            id=block.id,
+            hash=block.hash,
+            parent_block_hash=block.parent_block,
+            slot=block.slot,
+            block_root=block.block_root,
+            proof_of_leadership=block.proof_of_leadership,
+            transactions_count=transactions_count,
+            cursor=encode_cursor(PageDirection.PREV, (block.slot, block.id)),
+        )
+
+
+# `Block` attributes read by `BlockHeaderRead`
+BLOCK_HEADER_COLUMNS = frozenset(("hash", "parent_block", "slot", "block_root", "proof_of_leadership"))
+
+# `BlockRead`'s fields, in order, and the `Block` attributes they are read from
+BLOCK_FIELDS: Mapping[str, SparseField[Block]] = {
+    "id": SparseField(lambda block: block.id, ("id",)),
+    "hash": SparseField(lambda block: block.hash, ("hash",)),
+    "parent_block_hash": SparseField(lambda block: block.parent_block, ("parent_block",)),
+    "slot": SparseField(lambda block: block.slot, ("slot",)),
+    "block_root": SparseField(lambda block: block.block_root, ("block_root",)),
+    "proof_of_leadership": SparseField(lambda block: block.proof_of_leadership, ("proof_of_leadership",)),
+    "transactions": SparseField(lambda block: block.transactions, ("transactions",)),
+    "cursor": SparseField(lambda block: encode_cursor(PageDirection.PREV, (block.slot, block.id)), ("slot", "id")),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class BlockRecord:
+    """
+    Compact, pre-serialized `BlockRead` kept in memory for the latest blocks.
+    """
+
+    id: int
+    slot: int
+    attributes: BlockAttributes
+    ndjson: bytes
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        return self.slot, self.id
+
+    @property
+    def cursor(self) -> str:
+        return encode_cursor(PageDirection.PREV, self.key)
+
+    @classmethod
+    def from_block(cls, block: Block) -> Self:
+        return cls(
+            id=block.id,
+            slot=block.slot,
+            attributes=BlockAttributes.from_block(block),
+            ndjson=BlockRead.from_block(block).model_dump_ndjson(),
         )
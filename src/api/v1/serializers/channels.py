@@ -0,0 +1,44 @@
+from typing import Optional, Self
+
+from core.models import NbeSchema
+from core.types import HexBytes
+from models.channel import Channel, ChannelOperation
+from models.transactions.operations.contents import ContentType
+
+
+class ChannelRead(NbeSchema):
+    channel_id: HexBytes
+    operations_count: int
+    first_slot: int
+    last_slot: int
+
+    @classmethod
+    def from_channel(cls, channel: Channel) -> Self:
+        return cls(
+            channel_id=channel.channel_id,
+            operations_count=channel.operations_count,
+            first_slot=channel.first_slot,
+            last_slot=channel.last_slot,
+        )
+
+
+class ChannelOperationRead(NbeSchema):
+    slot: int
+    transaction_id: int
+    operation_index: int
+    type: ContentType
+    parent: Optional[HexBytes]
+    signer: Optional[HexBytes]
+    blob_size: Optional[int]
+
+    @classmethod
+    def from_channel_operation(cls, channel_operation: ChannelOperation) -> Self:
+        return cls(
+            slot=channel_operation.slot,
+            transaction_id=channel_operation.transaction_id,
+            operation_index=channel_operation.operation_index,
+            type=channel_operation.type,
+            parent=channel_operation.parent,
+            signer=channel_operation.signer,
+            blob_size=channel_operation.blob_size,
+        )
@@ -0,0 +1,30 @@
+from typing import Self
+
+from core.models import NbeSchema
+from core.types import HexBytes
+from models.leader import Leader, LeaderEpoch
+
+
+class LeaderRead(NbeSchema):
+    leader_key: HexBytes
+    blocks_count: int
+    first_slot: int
+    last_slot: int
+
+    @classmethod
+    def from_leader(cls, leader: Leader) -> Self:
+        return cls(
+            leader_key=leader.leader_key,
+            blocks_count=leader.blocks_count,
+            first_slot=leader.first_slot,
+            last_slot=leader.last_slot,
+        )
+
+
+class LeaderEpochRead(NbeSchema):
+    epoch: int
+    blocks_count: int
+
+    @classmethod
+    def from_leader_epoch(cls, leader_epoch: LeaderEpoch) -> Self:
+        return cls(epoch=leader_epoch.epoch, blocks_count=leader_epoch.blocks_count)
@@ -0,0 +1,11 @@
+from typing import Generic, List, Optional, TypeVar
+
+from core.models import NbeSchema
+
+T = TypeVar("T")
+
+
+class Page(NbeSchema, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
@@ -0,0 +1,38 @@
+from typing import List, Optional, Self
+
+from core.models import NbeSchema
+from core.types import HexBytes
+from models.sdp import SdpDeclaration, SdpDeclarationStatus
+from models.transactions.operations.contents import SDPDeclareServiceType
+
+
+class SdpDeclarationRead(NbeSchema):
+    declaration_id: HexBytes
+    status: SdpDeclarationStatus
+    service_type: Optional[SDPDeclareServiceType]
+    provider_id: Optional[HexBytes]
+    zk_id: Optional[HexBytes]
+    locked_note_id: Optional[HexBytes]
+    locators: List[str]
+    declared_slot: Optional[int]
+    last_active_slot: Optional[int]
+    last_active_nonce: Optional[HexBytes]
+    withdrawn_slot: Optional[int]
+    withdrawn_nonce: Optional[HexBytes]
+
+    @classmethod
+    def from_sdp_declaration(cls, sdp_declaration: SdpDeclaration) -> Self:
+        return cls(
+            declaration_id=sdp_declaration.declaration_id,
+            status=sdp_declaration.status,
+            service_type=sdp_declaration.service_type,
+            provider_id=sdp_declaration.provider_id,
+            zk_id=sdp_declaration.zk_id,
+            locked_note_id=sdp_declaration.locked_note_id,
+            locators=sdp_declaration.locators,
+            declared_slot=sdp_declaration.declared_slot,
+            last_active_slot=sdp_declaration.last_active_slot,
+            last_active_nonce=sdp_declaration.last_active_nonce,
+            withdrawn_slot=sdp_declaration.withdrawn_slot,
+            withdrawn_nonce=sdp_declaration.withdrawn_nonce,
+        )
@@ -0,0 +1,50 @@
+from enum import Enum
+from typing import Self
+
+from core.models import NbeSchema
+from core.types import HexBytes
+from db.inscriptions import InscriptionMatch
+from models.block import Block
+from models.transactions.transaction import Transaction
+
+
+class SearchHitType(Enum):
+    BLOCK = "block"
+    TRANSACTION = "transaction"
+
+
+class SearchHit(NbeSchema):
+    type: SearchHitType
+    id: int
+    hash: HexBytes
+    slot: int
+
+    @classmethod
+    def from_block(cls, block: Block) -> Self:
+        return cls(type=SearchHitType.BLOCK, id=block.id, hash=block.hash, slot=block.slot)
+
+    @classmethod
+    def from_transaction(cls, transaction: Transaction) -> Self:
+        return cls(
+            type=SearchHitType.TRANSACTION, id=transaction.id, hash=transaction.hash, slot=transaction.block.slot
+        )
+
+
+class InscriptionHit(NbeSchema):
+    channel_id: HexBytes
+    slot: int
+    transaction_id: int
+    operation_index: int
+    text: str
+    score: float
+
+    @classmethod
+    def from_inscription_match(cls, inscription_match: InscriptionMatch) -> Self:
+        return cls(
+            channel_id=inscription_match.channel_id,
+            slot=inscription_match.slot,
+            transaction_id=inscription_match.transaction_id,
+            operation_index=inscription_match.operation_index,
+            text=inscription_match.text,
+            score=inscription_match.score,
+        )
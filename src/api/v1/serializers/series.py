@@ -0,0 +1,46 @@
+from typing import List, Optional, Self
+
+from core.models import NbeSchema
+from core.sketch import QuantileSketch
+from models.series import SeriesBucket, SeriesMetric
+
+
+class SeriesPointRead(NbeSchema):
+    start_slot: int
+    count: int
+    min: int
+    max: int
+    sum: int
+    mean: float
+    p50: Optional[float]
+    p90: Optional[float]
+    p99: Optional[float]
+
+    @classmethod
+    def from_series_bucket(cls, series_bucket: SeriesBucket) -> Self:
+        sketch = QuantileSketch.from_json(series_bucket.sketch)
+        return cls(
+            start_slot=series_bucket.start_slot,
+            count=series_bucket.count,
+            min=series_bucket.min,
+            max=series_bucket.max,
+            sum=series_bucket.sum,
+            mean=series_bucket.sum / series_bucket.count,
+            p50=sketch.quantile(0.5),
+            p90=sketch.quantile(0.9),
+            p99=sketch.quantile(0.99),
+        )
+
+
+class SeriesRead(NbeSchema):
+    metric: SeriesMetric
+    resolution: int
+    points: List[SeriesPointRead]
+
+    @classmethod
+    def from_series_buckets(cls, metric: SeriesMetric, resolution: int, series_buckets: List[SeriesBucket]) -> Self:
+        return cls(
+            metric=metric,
+            resolution=resolution,
+            points=[SeriesPointRead.from_series_bucket(series_bucket) for series_bucket in series_buckets],
+        )
@@ -0,0 +1,53 @@
+from typing import Dict, List, Optional, Self
+
+from core.models import NbeSchema
+from db.stats import Stats
+from models.aliases import Gas
+from models.transactions.operations.contents import ContentType
+
+
+class GasPriceStatsRead(NbeSchema):
+    min: Optional[Gas]
+    max: Optional[Gas]
+    mean: Optional[float]
+
+
+class TransactionsWindowRead(NbeSchema):
+    slots: int
+    transactions_count: int
+    transactions_per_slot: float
+
+
+class StatsRead(NbeSchema):
+    blocks_count: int
+    transactions_count: int
+    operations_count: Dict[ContentType, int]
+    last_slot: Optional[int]
+    execution_gas_price: GasPriceStatsRead
+    storage_gas_price: GasPriceStatsRead
+    transactions_windows: List[TransactionsWindowRead]
+
+    @classmethod
+    def from_stats(cls, stats: Stats) -> Self:
+        chain_stats, transactions_by_window = stats
+        transactions_count = chain_stats.transactions_count
+        return cls(
+            blocks_count=chain_stats.blocks_count,
+            transactions_count=transactions_count,
+            operations_count={ContentType(_type): count for _type, count in chain_stats.operations_count.items()},
+            last_slot=chain_stats.last_slot,
+            execution_gas_price=GasPriceStatsRead(
+                min=chain_stats.execution_gas_price_min,
+                max=chain_stats.execution_gas_price_max,
+                mean=chain_stats.execution_gas_price_sum / transactions_count if transactions_count else None,
+            ),
+            storage_gas_price=GasPriceStatsRead(
+                min=chain_stats.storage_gas_price_min,
+                max=chain_stats.storage_gas_price_max,
+                mean=chain_stats.storage_gas_price_sum / transactions_count if transactions_count else None,
+            ),
+            transactions_windows=[
+                TransactionsWindowRead(slots=window, transactions_count=count, transactions_per_slot=count / window)
+                for window, count in transactions_by_window.items()
+            ],
+        )
@@ -1,5 +1,11 @@
-from typing import List, Self
+from dataclasses import dataclass
+from typing import List, Mapping, Self, Tuple
 
+from rusty_results import Empty, Option
+
+from api.cursors import PageDirection, encode_cursor
+from api.fields import FieldSet, SparseField
+from api.filters import TransactionAttributes
 from core.models import NbeSchema
 from core.types import HexBytes
 from models.aliases import Gas
@@ -18,9 +24,16 @@ class TransactionRead(NbeSchema):
     proof: HexBytes
     execution_gas_price: Gas
     storage_gas_price: Gas
+    cursor: str  # Resumes a stream right after this transaction
 
     @classmethod
-    def from_transaction(cls, transaction: Transaction) -> Self:
+    def from_transaction(cls, transaction: Transaction, *, fields: Option[FieldSet] = Empty()) -> Self:
+        """
+        With `fields`, only those are read from `transaction` (so it may have been loaded with just their columns),
+        into a sparse instance that only dumps them.
+        """
+        if fields.is_some:
+            return cls.model_construct(**fields.unwrap().get_values(transaction))
         return cls(
             id=transaction.id,
             block_id=transaction.block.id,
@@ -31,4 +44,56 @@ class TransactionRead(NbeSchema):
             proof=transaction.proof,
             execution_gas_price=transaction.execution_gas_price,
             storage_gas_price=transaction.storage_gas_price,
+            cursor=encode_cursor(PageDirection.PREV, (transaction.block.slot, transaction.block.id, transaction.id)),
+        )
+
+
+# `TransactionRead`'s fields, in order, and the `Transaction` attributes they are read from
+TRANSACTION_FIELDS: Mapping[str, SparseField[Transaction]] = {
+    "id": SparseField(lambda transaction: transaction.id, ("id",)),
+    "block_id": SparseField(lambda transaction: transaction.block_id, ("block_id",)),
+    "hash": SparseField(lambda transaction: transaction.hash, ("hash",)),
+    "operations": SparseField(lambda transaction: transaction.operations, ("operations",)),
+    "inputs": SparseField(lambda transaction: transaction.inputs, ("inputs",)),
+    "outputs": SparseField(lambda transaction: transaction.outputs, ("outputs",)),
+    "proof": SparseField(lambda transaction: transaction.proof, ("proof",)),
+    "execution_gas_price": SparseField(lambda transaction: transaction.execution_gas_price, ("execution_gas_price",)),
+    "storage_gas_price": SparseField(lambda transaction: transaction.storage_gas_price, ("storage_gas_price",)),
+    "cursor": SparseField(
+        lambda transaction: encode_cursor(
+            PageDirection.PREV, (transaction.block.slot, transaction.block.id, transaction.id)
+        ),
+        ("block",),
+    ),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class TransactionRecord:
+    """
+    Compact, pre-serialized `TransactionRead` kept in memory for the latest transactions.
+    """
+
+    id: int
+    block_id: int
+    slot: int
+    attributes: TransactionAttributes
+    ndjson: bytes
+
+    @property
+    def key(self) -> Tuple[int, int, int]:
+        return self.slot, self.block_id, self.id
+
+    @property
+    def cursor(self) -> str:
+        return encode_cursor(PageDirection.PREV, self.key)
+
+    @classmethod
+    def from_transaction(cls, transaction: Transaction) -> Self:
+        return cls(
+            id=transaction.id,
+            block_id=transaction.block.id,
+            slot=transaction.block.slot,
+            attributes=TransactionAttributes.from_transaction(transaction),
+            ndjson=TransactionRead.from_transaction(transaction).model_dump_ndjson(),
         )
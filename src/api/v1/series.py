@@ -0,0 +1,29 @@
+from http.client import BAD_REQUEST
+from typing import Optional
+
+from fastapi import HTTPException, Path, Query
+from starlette.responses import JSONResponse, Response
+
+from api.v1.serializers.series import SeriesRead
+from core.api import NBERequest
+from db.series import SERIES_RESOLUTIONS
+from models.series import SeriesMetric
+from utils.option import into_option
+
+
+async def get(
+    request: NBERequest,
+    metric: SeriesMetric = Path(),
+    resolution: int = Query(100, description=f"Slots per point: One of {', '.join(map(str, SERIES_RESOLUTIONS))}."),
+    from_slot: Optional[int] = Query(None, alias="from", ge=0),
+    to_slot: Optional[int] = Query(None, alias="to", ge=0),
+    limit: int = Query(1000, ge=1, le=1000, description="Maximum number of points, the latest ones first."),
+) -> Response:
+    if resolution not in SERIES_RESOLUTIONS:
+        raise HTTPException(BAD_REQUEST, detail=f"Resolution must be one of {SERIES_RESOLUTIONS}.")
+
+    series_buckets = await request.app.state.series_repository.get_buckets(
+        metric, resolution, limit, from_slot=into_option(from_slot), to_slot=into_option(to_slot)
+    )
+    series = SeriesRead.from_series_buckets(metric, resolution, series_buckets)
+    return JSONResponse(series.model_dump(mode="json"))
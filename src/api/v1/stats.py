@@ -0,0 +1,24 @@
+from typing import AsyncIterator
+
+from starlette.responses import JSONResponse, Response
+
+from api.streams import into_ndjson_stream
+from api.v1.serializers.stats import StatsRead
+from core.api import NBERequest, NDJsonStreamingResponse
+from db.stats import StatsRepository
+
+
+async def get(request: NBERequest) -> Response:
+    stats = await request.app.state.stats_repository.get_stats()
+    return JSONResponse(StatsRead.from_stats(stats).model_dump(mode="json"))
+
+
+async def _get_stats_stream_serialized(stats_repository: StatsRepository) -> AsyncIterator[StatsRead]:
+    async for stats in stats_repository.updates_stream():
+        yield StatsRead.from_stats(stats)
+
+
+async def stream(request: NBERequest) -> Response:
+    stats_stream = _get_stats_stream_serialized(request.app.state.stats_repository)
+    ndjson_stats_stream = into_ndjson_stream(stats_stream)
+    return NDJsonStreamingResponse(ndjson_stats_stream)
@@ -0,0 +1,196 @@
+from enum import Enum
+from typing import TYPE_CHECKING, AsyncIterator, FrozenSet, List, Optional, Tuple
+
+from fastapi import Depends, Header, Query
+from rusty_results import Empty, Option, Some
+from sqlalchemy.orm.attributes import set_committed_value
+from starlette.responses import Response
+
+from api.cursors import PageDirection, decode_resume_cursor, encode_cursor
+from api.filters import (
+    BlockAttributes,
+    StreamFilter,
+    get_block_attributes,
+    get_stream_filter,
+)
+from api.streams import (
+    Frame,
+    SlowConsumerPolicy,
+    Transport,
+    into_ndjson_envelopes_stream,
+    into_sse_stream,
+    merge_frames,
+    send_to_websocket,
+)
+from api.v1 import blocks, health, transactions
+from api.v1.serializers.blocks import BlockRead
+from api.v1.serializers.transactions import TransactionRead
+from core.api import (
+    NBERequest,
+    NBEWebSocket,
+    NDJsonStreamingResponse,
+    SseStreamingResponse,
+    accepts_event_stream,
+)
+from db.blocks import BlockCursor
+from models.block import Block
+
+if TYPE_CHECKING:
+    from core.app import NBE
+
+
+class Topic(Enum):
+    BLOCKS = "blocks"
+    TRANSACTIONS = "transactions"
+    HEALTH = "health"
+
+
+TOPIC_NAMES = "|".join(topic.value for topic in Topic)
+TOPICS_PATTERN = rf"^({TOPIC_NAMES})(,({TOPIC_NAMES}))*$"
+ALL_TOPICS = ",".join(topic.value for topic in Topic)
+
+
+def _parse_topics(topics: str) -> FrozenSet[Topic]:
+    return frozenset(Topic(topic) for topic in topics.split(","))
+
+
+async def _get_bootstrap(
+    app: "NBE",
+    topics: FrozenSet[Topic],
+    prefetch_limit: int,
+    stream_filter: StreamFilter,
+    resume_cursor: Optional[str],
+) -> Tuple[Option[BlockCursor], List[Frame]]:
+    """
+    Block cursor to stream from, and the frames to send before streaming.
+    Both blocks and transactions are streamed from the same block cursor, so resuming does not depend on the topics.
+    """
+    if resume_cursor is not None:
+        return Some(decode_resume_cursor(resume_cursor, key_length=2)), []
+
+    # Taken before the records, which are capped to it: Blocks ingested meanwhile are streamed instead
+    latest_blocks = await blocks.get_latest_records(app, 1, StreamFilter())
+    if not latest_blocks:
+        return Empty(), []
+    cursor = latest_blocks[-1].key
+
+    frames = []
+    if Topic.TRANSACTIONS in topics and prefetch_limit > 0:
+        transaction_records = await transactions.get_latest_records(app, prefetch_limit, stream_filter)
+        frames.extend(
+            Frame("transaction", record.ndjson.rstrip(b"\n"))
+            for record in transaction_records
+            if (record.slot, record.block_id) <= cursor
+        )
+    if Topic.BLOCKS in topics and prefetch_limit > 0:
+        block_records = await blocks.get_latest_records(app, prefetch_limit, stream_filter)
+        frames.extend(Frame("block", record.ndjson.rstrip(b"\n")) for record in block_records if record.key <= cursor)
+    if frames:
+        frames[-1] = frames[-1]._replace(id=encode_cursor(PageDirection.PREV, cursor))
+    return Some(cursor), frames
+
+
+def _into_block_frames(
+    block: Block, attributes: BlockAttributes, topics: FrozenSet[Topic], stream_filter: StreamFilter
+) -> List[Frame]:
+    """
+    A block's transactions first, then the block itself. Only the last frame carries an id, the block's cursor: Resuming
+    from it continues with the next block, so a connection lost halfway through a block's frames resends all of them.
+    """
+    frames = []
+    if Topic.TRANSACTIONS in topics:
+        attributes_by_id = {transaction.id: transaction for transaction in attributes.transactions}
+        for transaction in block.transactions:
+            if not stream_filter.matches_transaction(attributes_by_id[transaction.id]):
+                continue
+            # Loaded through the block, so their own reference to it was left unloaded
+            set_committed_value(transaction, "block", block)
+            transaction_read = TransactionRead.from_transaction(transaction)
+            frames.append(Frame("transaction", transaction_read.model_dump_json().encode("utf-8")))
+    if Topic.BLOCKS in topics and stream_filter.matches_block(attributes):
+        block_read = BlockRead.from_block(block)
+        frames.append(Frame("block", block_read.model_dump_json().encode("utf-8")))
+    if frames:
+        frames[-1] = frames[-1]._replace(id=encode_cursor(PageDirection.PREV, (block.slot, block.id)))
+    return frames
+
+
+async def _get_chain_frames(
+    app: "NBE",
+    topics: FrozenSet[Topic],
+    cursor: Option[BlockCursor],
+    bootstrap_frames: List[Frame],
+    stream_filter: StreamFilter,
+) -> AsyncIterator[Frame]:
+    """
+    Blocks and their transactions, off a single poller.
+    """
+    for frame in bootstrap_frames:
+        yield frame
+    _stream = app.state.block_repository.updates_stream(cursor, operation_type=stream_filter.operation_type)
+    async for new_blocks in _stream:
+        attributes = await get_block_attributes(app, stream_filter, new_blocks)
+        for block, block_attributes in zip(new_blocks, attributes):
+            # Blocks are fully loaded, so their attributes can always be computed
+            _block_attributes = block_attributes.unwrap_or_else(lambda: BlockAttributes.from_block(block))
+            for frame in _into_block_frames(block, _block_attributes, topics, stream_filter):
+                yield frame
+
+
+async def _get_frames(
+    app: "NBE",
+    topics: FrozenSet[Topic],
+    prefetch_limit: int,
+    stream_filter: StreamFilter,
+    resume_cursor: Optional[str],
+) -> AsyncIterator[Frame]:
+    streams = []
+    if Topic.BLOCKS in topics or Topic.TRANSACTIONS in topics:
+        cursor, bootstrap_frames = await _get_bootstrap(app, topics, prefetch_limit, stream_filter, resume_cursor)
+        streams.append(_get_chain_frames(app, topics, cursor, bootstrap_frames, stream_filter))
+    if Topic.HEALTH in topics:
+        streams.append(health.get_health_frames(app.state.health_monitor))
+    return merge_frames(*streams)
+
+
+async def stream(
+    request: NBERequest,
+    topics: str = Query(ALL_TOPICS, pattern=TOPICS_PATTERN, description="Comma-separated topics to subscribe to."),
+    prefetch_limit: int = Query(0, alias="prefetch-limit", ge=0),
+    stream_filter: StreamFilter = Depends(get_stream_filter),
+    after: Optional[str] = Query(None, description="Resume right after the block carrying this cursor."),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    slow_consumer: Optional[SlowConsumerPolicy] = Query(None, alias="slow-consumer"),
+) -> Response:
+    """
+    Streams the selected topics over a single connection, as typed frames (`block`, `transaction` and `health`).
+    Each block is preceded by its transactions. Frame ids are block cursors, so resuming (as in the per-topic streams)
+    continues with the block after the resumed one.
+    Frames are sent as Server-Sent Events if the client accepts them, or as NDJSON `{"event", "id", "data"}` lines
+    otherwise.
+    """
+    frames = await _get_frames(
+        request.app, _parse_topics(topics), prefetch_limit, stream_filter, last_event_id or after
+    )
+    transport = Transport.SSE if accepts_event_stream(request) else Transport.NDJSON
+    subscription = request.app.state.subscriptions.subscribe(
+        frames, stream="multiplexed", transport=transport, policy=slow_consumer
+    )
+    if transport is Transport.SSE:
+        return SseStreamingResponse(into_sse_stream(subscription))
+    return NDJsonStreamingResponse(into_ndjson_envelopes_stream(subscription))
+
+
+async def stream_websocket(
+    websocket: NBEWebSocket,
+    topics: str = Query(ALL_TOPICS, pattern=TOPICS_PATTERN, description="Comma-separated topics to subscribe to."),
+    prefetch_limit: int = Query(0, alias="prefetch-limit", ge=0),
+    stream_filter: StreamFilter = Depends(get_stream_filter),
+    after: Optional[str] = Query(None, description="Resume right after the block carrying this cursor."),
+    slow_consumer: Optional[SlowConsumerPolicy] = Query(None, alias="slow-consumer"),
+) -> None:
+    frames = await _get_frames(websocket.app, _parse_topics(topics), prefetch_limit, stream_filter, after)
+    subscription = websocket.app.state.subscriptions.subscribe(
+        frames, stream="multiplexed", transport=Transport.WEBSOCKET, policy=slow_consumer
+    )
+    await send_to_websocket(websocket, subscription)
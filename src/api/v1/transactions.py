@@ -1,43 +1,299 @@
 from http.client import NOT_FOUND
-from typing import TYPE_CHECKING, AsyncIterator, List
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Tuple
 
-from fastapi import Path, Query
+from fastapi import Depends, Header, Path, Query
 from rusty_results import Empty, Option, Some
 from starlette.responses import JSONResponse, Response
 
-from api.streams import into_ndjson_stream
-from api.v1.serializers.transactions import TransactionRead
-from core.api import NBERequest, NDJsonStreamingResponse
+from api.cursors import PageDirection, decode_cursor, decode_resume_cursor, paginate
+from api.fields import FieldSet, get_fields_dependency
+from api.filters import StreamFilter, filter_transactions, get_stream_filter
+from api.streams import (
+    Frame,
+    SlowConsumerPolicy,
+    Transport,
+    into_ndjson_stream,
+    into_sse_stream,
+    send_to_websocket,
+)
+from api.v1.serializers.pages import Page
+from api.v1.serializers.transactions import (
+    TRANSACTION_FIELDS,
+    TransactionRead,
+    TransactionRecord,
+)
+from core.api import (
+    HASH_PATTERN,
+    HASHES_PATTERN,
+    IDS_PATTERN,
+    IMMUTABLE_CACHE_CONTROL,
+    ImmutableJSONResponse,
+    NBERequest,
+    NBEWebSocket,
+    NDJsonStreamingResponse,
+    NotModifiedResponse,
+    SseStreamingResponse,
+    accepts_event_stream,
+    get_matching_etag,
+    into_etag,
+    parse_batch,
+)
+from db.transaction import TransactionCursor
+from models.transactions.operations.contents import ContentType
 from models.transactions.transaction import Transaction
+from utils.option import into_option
 
 if TYPE_CHECKING:
     from core.app import NBE
 
+get_transaction_fields = get_fields_dependency(TRANSACTION_FIELDS)
+
 
 async def _get_transactions_stream_serialized(
-    app: "NBE", transaction_from: Option[Transaction]
+    app: "NBE", cursor: Option[TransactionCursor], stream_filter: StreamFilter, fields: Option[FieldSet]
 ) -> AsyncIterator[List[TransactionRead]]:
-    _stream = app.state.transaction_repository.updates_stream(transaction_from)
+    columns = fields.map(lambda _fields: _fields.columns)
+    _stream = app.state.transaction_repository.updates_stream(
+        cursor, operation_type=stream_filter.operation_type, columns=columns
+    )
     async for transactions in _stream:
-        yield [TransactionRead.from_transaction(transaction) for transaction in transactions]
+        # The filter reuses the attributes computed at ingestion, so it needs no columns of its own
+        transactions = await filter_transactions(app, stream_filter, transactions, columns=columns)
+        yield [TransactionRead.from_transaction(transaction, fields=fields) for transaction in transactions]
+
 
+def _into_record_json(record: TransactionRecord, fields: Option[FieldSet]) -> bytes:
+    data = record.ndjson.rstrip(b"\n")
+    return fields.map(lambda _fields: _fields.project_json(data)).unwrap_or(data)
 
-async def stream(request: NBERequest, prefetch_limit: int = Query(0, alias="prefetch-limit", ge=0)) -> Response:
-    latest_transactions: List[Transaction] = await request.app.state.transaction_repository.get_latest(
-        prefetch_limit, ascending=True, preload_relationships=True
+
+async def get_latest_records(app: "NBE", limit: int, stream_filter: StreamFilter) -> List[TransactionRecord]:
+    if not stream_filter.is_empty:
+        return await _get_latest_records_filtered(app, limit, stream_filter)
+    tail_records: Option[List[TransactionRecord]] = app.state.transaction_tail.latest(limit)
+    if tail_records.is_some:
+        return tail_records.unwrap()
+    latest_transactions = await app.state.transaction_repository.get_latest(
+        limit, ascending=True, preload_relationships=True
     )
-    latest_transaction = Some(latest_transactions[-1]) if latest_transactions else Empty()
-    bootstrap_transactions = [TransactionRead.from_transaction(transaction) for transaction in latest_transactions]
+    return [TransactionRecord.from_transaction(transaction) for transaction in latest_transactions]
+
+
+async def _get_latest_records_filtered(app: "NBE", limit: int, stream_filter: StreamFilter) -> List[TransactionRecord]:
+    """
+    Past the hot tail, only the latest `limit` transactions with the requested operation type are considered: The
+    criteria not applied by the database may leave fewer than `limit` records.
+    """
+    tail_records: Option[List[TransactionRecord]] = app.state.transaction_tail.latest(
+        limit, where=lambda record: stream_filter.matches_transaction(record.attributes)
+    )
+    if tail_records.is_some:
+        return tail_records.unwrap()
+    latest_transactions = await app.state.transaction_repository.get_page(
+        limit, operation_type=stream_filter.operation_type
+    )
+    matching_transactions = await filter_transactions(app, stream_filter, latest_transactions)
+    return [TransactionRecord.from_transaction(transaction) for transaction in reversed(matching_transactions)]
+
 
+async def _get_bootstrap(
+    app: "NBE", prefetch_limit: int, stream_filter: StreamFilter, resume_cursor: Optional[str]
+) -> Tuple[Option[TransactionCursor], List[TransactionRecord]]:
+    """
+    Cursor to stream from, and the records to send before streaming.
+    """
+    if resume_cursor is not None:
+        return Some(decode_resume_cursor(resume_cursor, key_length=3)), []
+    latest_records = await get_latest_records(app, prefetch_limit, stream_filter)
+    cursor = Some(latest_records[-1].key) if latest_records else Empty()
+    return cursor, latest_records
+
+
+async def _get_transactions_frames(
+    app: "NBE",
+    cursor: Option[TransactionCursor],
+    bootstrap_records: List[TransactionRecord],
+    stream_filter: StreamFilter,
+    fields: Option[FieldSet],
+) -> AsyncIterator[Frame]:
+    for record in bootstrap_records:
+        yield Frame("transaction", _into_record_json(record, fields), record.cursor)
+    async for transaction_reads in _get_transactions_stream_serialized(app, cursor, stream_filter, fields):
+        for transaction_read in transaction_reads:
+            yield Frame("transaction", transaction_read.model_dump_json().encode("utf-8"), transaction_read.cursor)
+
+
+async def stream(
+    request: NBERequest,
+    prefetch_limit: int = Query(0, alias="prefetch-limit", ge=0),
+    stream_filter: StreamFilter = Depends(get_stream_filter),
+    fields: Option[FieldSet] = Depends(get_transaction_fields),
+    after: Optional[str] = Query(None, description="Resume right after the item carrying this cursor."),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    slow_consumer: Optional[SlowConsumerPolicy] = Query(None, alias="slow-consumer"),
+) -> Response:
+    """
+    Streams new items as they are ingested, after bootstrapping with the latest `prefetch-limit` ones.
+    When resuming (with `after`, or `Last-Event-ID`, which is sent on reconnection and takes precedence), only the
+    items after the resumed one are streamed, and `prefetch-limit` is ignored.
+    Items are sent as Server-Sent Events if the client accepts them, or as NDJSON otherwise.
+    """
+    cursor, bootstrap_records = await _get_bootstrap(request.app, prefetch_limit, stream_filter, last_event_id or after)
+    # Streams are resumed from their items' cursors, so those are always sent
+    fields = fields.map(lambda _fields: _fields.with_names("cursor"))
+
+    if accepts_event_stream(request):
+        frames = _get_transactions_frames(request.app, cursor, bootstrap_records, stream_filter, fields)
+        subscription = request.app.state.subscriptions.subscribe(
+            frames, stream="transactions", transport=Transport.SSE, policy=slow_consumer
+        )
+        return SseStreamingResponse(into_sse_stream(subscription))
+
+    bootstrap_transactions = b"".join(_into_record_json(record, fields) + b"\n" for record in bootstrap_records)
     transactions_stream: AsyncIterator[List[TransactionRead]] = _get_transactions_stream_serialized(
-        request.app, latest_transaction
+        request.app, cursor, stream_filter, fields
     )
     ndjson_transactions_stream = into_ndjson_stream(transactions_stream, bootstrap_data=bootstrap_transactions)
     return NDJsonStreamingResponse(ndjson_transactions_stream)
 
 
-async def get(request: NBERequest, transaction_id: int = Path(ge=1)) -> Response:
+async def stream_websocket(
+    websocket: NBEWebSocket,
+    prefetch_limit: int = Query(0, alias="prefetch-limit", ge=0),
+    stream_filter: StreamFilter = Depends(get_stream_filter),
+    fields: Option[FieldSet] = Depends(get_transaction_fields),
+    after: Optional[str] = Query(None, description="Resume right after the item carrying this cursor."),
+    slow_consumer: Optional[SlowConsumerPolicy] = Query(None, alias="slow-consumer"),
+) -> None:
+    cursor, bootstrap_records = await _get_bootstrap(websocket.app, prefetch_limit, stream_filter, after)
+    fields = fields.map(lambda _fields: _fields.with_names("cursor"))
+    frames = _get_transactions_frames(websocket.app, cursor, bootstrap_records, stream_filter, fields)
+    subscription = websocket.app.state.subscriptions.subscribe(
+        frames, stream="transactions", transport=Transport.WEBSOCKET, policy=slow_consumer
+    )
+    await send_to_websocket(websocket, subscription)
+
+
+async def get(
+    request: NBERequest,
+    transaction_id: int = Path(ge=1),
+    fields: Option[FieldSet] = Depends(get_transaction_fields),
+) -> Response:
+    if fields.is_some:
+        transaction = await request.app.state.transaction_repository.get_by_id(
+            transaction_id, columns=Some(fields.unwrap().columns)
+        )
+        return _into_sparse_transaction_response(transaction, fields.unwrap())
+    etag = await _get_matching_etag_by_id(request, transaction_id)
+    if etag.is_some:
+        return NotModifiedResponse(etag.unwrap())
     transaction = await request.app.state.transaction_repository.get_by_id(transaction_id)
-    return transaction.map(
-        lambda _transaction: JSONResponse(TransactionRead.from_transaction(_transaction).model_dump(mode="json"))
-    ).unwrap_or_else(lambda: Response(status_code=NOT_FOUND))
+    return transaction.map(_into_transaction_response).unwrap_or_else(lambda: Response(status_code=NOT_FOUND))
+
+
+async def get_by_hash(
+    request: NBERequest,
+    transaction_hash: str = Path(pattern=HASH_PATTERN),
+    fields: Option[FieldSet] = Depends(get_transaction_fields),
+) -> Response:
+    if fields.is_some:
+        transaction = await request.app.state.transaction_repository.get_by_hash(
+            bytes.fromhex(transaction_hash), columns=Some(fields.unwrap().columns)
+        )
+        return _into_sparse_transaction_response(transaction, fields.unwrap())
+    etag = get_matching_etag(request, "transaction", item_hash=bytes.fromhex(transaction_hash))
+    if etag.is_some:
+        return NotModifiedResponse(etag.unwrap())
+    transaction = await request.app.state.transaction_repository.get_by_hash(bytes.fromhex(transaction_hash))
+    return transaction.map(_into_transaction_response).unwrap_or_else(lambda: Response(status_code=NOT_FOUND))
+
+
+async def _get_matching_etag_by_id(request: NBERequest, transaction_id: int) -> Option[str]:
+    """
+    Ids are not stable across database resyncs, so an ETag only matches if it also carries the transaction's current
+    hash. Only that column is read, if the transaction is not cached. No ETag matches a missing transaction.
+    """
+    if "if-none-match" not in request.headers:
+        return Empty()
+    transaction = await request.app.state.transaction_repository.get_by_id(
+        transaction_id, columns=Some(frozenset({"hash"}))
+    )
+    if transaction.is_empty:
+        return Empty()
+    return get_matching_etag(request, "transaction", item_id=transaction_id, item_hash=transaction.unwrap().hash)
+
+
+def _into_transaction_response(transaction: Transaction) -> Response:
+    content = TransactionRead.from_transaction(transaction).model_dump(mode="json")
+    return ImmutableJSONResponse(content, etag=into_etag("transaction", transaction.id, transaction.hash))
+
+
+def _into_sparse_transaction_response(transaction: Option[Transaction], fields: FieldSet) -> Response:
+    """
+    Sparse representations are cached as long as full ones, but without an ETag: Those are only issued for the full
+    representation, which revalidations are answered for without looking the transaction up.
+    """
+    if transaction.is_empty:
+        return Response(status_code=NOT_FOUND)
+    content = TransactionRead.from_transaction(transaction.unwrap(), fields=Some(fields)).model_dump(mode="json")
+    return JSONResponse(content, headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL})
+
+
+async def get_list(
+    request: NBERequest,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    before_slot: Optional[int] = Query(None, ge=0),
+    after_slot: Optional[int] = Query(None, ge=0),
+    ids: Optional[str] = Query(None, pattern=IDS_PATTERN, description="Comma-separated ids to fetch in one go."),
+    hashes: Optional[str] = Query(
+        None, pattern=HASHES_PATTERN, description="Comma-separated hashes in hex format to fetch in one go."
+    ),
+    op_type: Optional[ContentType] = Query(None, description="Only list items with an operation of this type."),
+    fields: Option[FieldSet] = Depends(get_transaction_fields),
+) -> Response:
+    columns = fields.map(lambda _fields: _fields.columns)
+    transaction_ids, transaction_hashes = parse_batch(ids, hashes)
+    if transaction_ids is not None:
+        transactions = await request.app.state.transaction_repository.get_by_ids(transaction_ids, columns=columns)
+        return _into_batch_response(transactions, fields)
+    if transaction_hashes is not None:
+        transactions = await request.app.state.transaction_repository.get_by_hashes(transaction_hashes, columns=columns)
+        return _into_batch_response(transactions, fields)
+
+    direction, cursor_key = decode_cursor(cursor, key_length=3) if cursor is not None else (PageDirection.NEXT, None)
+    transactions = await request.app.state.transaction_repository.get_page(
+        limit + 1,
+        cursor=into_option(cursor_key),
+        newer=direction is PageDirection.PREV,
+        before_slot=into_option(before_slot),
+        after_slot=into_option(after_slot),
+        operation_type=into_option(op_type),
+        columns=columns,
+    )
+    transactions, next_cursor, prev_cursor = paginate(
+        transactions,
+        limit=limit,
+        direction=direction,
+        is_first_page=cursor is None and before_slot is None,
+        key=lambda transaction: (transaction.block.slot, transaction.block.id, transaction.id),
+    )
+    page = Page[TransactionRead](
+        items=[TransactionRead.from_transaction(transaction, fields=fields) for transaction in transactions],
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+    return JSONResponse(page.model_dump(mode="json"))
+
+
+def _into_batch_response(transactions: List[Option[Transaction]], fields: Option[FieldSet]) -> Response:
+    """
+    Missing items are returned as `null`, so the response stays aligned with the requested order.
+    """
+    content = [
+        transaction.map(
+            lambda _transaction: TransactionRead.from_transaction(_transaction, fields=fields).model_dump(mode="json")
+        ).unwrap_or(None)
+        for transaction in transactions
+    ]
+    return JSONResponse(content)
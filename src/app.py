@@ -1,5 +1,7 @@
 from fastapi import FastAPI
 
+from api.admission import AdmissionController, AdmissionMiddleware
+from api.compression import CompressionMiddleware, CompressionStats
 from core.app import NBE
 from frontend.statics import mount_statics
 from lifespan import lifespan
@@ -8,6 +10,22 @@ from router import create_router
 
 def create_app() -> FastAPI:
     app = NBE(lifespan=lifespan)
+    app.state.response_compression = CompressionStats()
+    app.add_middleware(
+        CompressionMiddleware,
+        min_bytes=app.settings.response_compression_min_bytes,
+        level=app.settings.response_compression_level,
+        stats=app.state.response_compression,
+    )
+    # Added last, so it runs first: Rejected requests are not even compressed
+    app.state.admission = AdmissionController(
+        max_streams=app.settings.stream_max_connections,
+        max_streams_per_ip=app.settings.stream_max_connections_per_ip,
+        stream_retry_after_seconds=app.settings.stream_retry_after_seconds,
+        lookup_rate=app.settings.lookup_rate_per_second,
+        lookup_burst=app.settings.lookup_burst,
+    )
+    app.add_middleware(AdmissionMiddleware, controller=app.state.admission)
     app = mount_statics(app)
     app.include_router(create_router())
     return app
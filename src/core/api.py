@@ -1,13 +1,34 @@
+from http.client import BAD_REQUEST, NOT_MODIFIED
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException
+from rusty_results import Empty, Option, Some
 from starlette.requests import Request
-from starlette.responses import ContentStream, StreamingResponse
+from starlette.responses import ContentStream, JSONResponse, Response, StreamingResponse
+from starlette.websockets import WebSocket
 
 from core.app import NBE
 
+HASH_PATTERN = r"^([0-9a-fA-F]{2})+$"
+HASH_PREFIX_PATTERN = r"^[0-9a-fA-F]+$"
+IDS_PATTERN = r"^\d+(,\d+)*$"
+HASHES_PATTERN = r"^([0-9a-fA-F]{2})+(,([0-9a-fA-F]{2})+)*$"
+MAX_BATCH_SIZE = 100
+
+# Stored blocks and transactions never change, so their representations can be cached for as long as allowed
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Part of the ETags of immutable items: Bumped whenever their representation changes, so cached copies are revalidated
+REPRESENTATION_VERSION = 1
+
 
 class NBERequest(Request):
     app: NBE
 
 
+class NBEWebSocket(WebSocket):
+    app: NBE
+
+
 class NDJsonStreamingResponse(StreamingResponse):
     def __init__(self, content: ContentStream):
         super().__init__(
@@ -19,3 +40,87 @@ class NDJsonStreamingResponse(StreamingResponse):
                 "X-Accel-Buffering": "no",
             },
         )
+
+
+class SseStreamingResponse(StreamingResponse):
+    def __init__(self, content: ContentStream):
+        super().__init__(
+            content,
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                "X-Accel-Buffering": "no",
+            },
+        )
+
+
+def into_etag(kind: str, item_id: int, item_hash: bytes) -> str:
+    """
+    Strong ETag of an immutable item. It carries both identifiers the item can be requested by, so a revalidation can
+    be answered from the request alone.
+    """
+    return f'"v{REPRESENTATION_VERSION}-{kind}-{item_id}-{item_hash.hex()}"'
+
+
+def get_matching_etag(
+    request: Request, kind: str, *, item_id: Optional[int] = None, item_hash: Optional[bytes] = None
+) -> Option[str]:
+    """
+    ETag the client holds for the item, out of its `If-None-Match`. Since the item never changes, any ETag issued for it
+    is still current, and the request can be answered with a 304 before loading the item.
+    Hashes identify an item on their own, but ids do not (they are reassigned if the database is resynced): Lookups by
+    id must pass the item's current `item_hash` as well.
+    """
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return Empty()
+    for etag in header.split(","):
+        etag = etag.strip().removeprefix("W/")
+        # Compressed representations carry their content coding as a 5th part (see `api.compression`)
+        parts = etag.strip('"').split("-")
+        if len(parts) not in (4, 5) or parts[0] != f"v{REPRESENTATION_VERSION}" or parts[1] != kind:
+            continue
+        if item_id is not None and parts[2] != str(item_id):
+            continue
+        if item_hash is not None and parts[3] != item_hash.hex():
+            continue
+        return Some(etag)
+    return Empty()
+
+
+class ImmutableJSONResponse(JSONResponse):
+    def __init__(self, content: Any, *, etag: str):
+        super().__init__(content, headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL})
+
+
+class NotModifiedResponse(Response):
+    def __init__(self, etag: str):
+        super().__init__(status_code=NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL})
+
+
+def accepts_event_stream(request: Request) -> bool:
+    """
+    Whether the client asked for Server-Sent Events (e.g. an `EventSource`), rather than NDJSON.
+    """
+    return "text/event-stream" in request.headers.get("accept", "")
+
+
+def accepts_ndjson(request: Request) -> bool:
+    """
+    Whether the client asked for NDJSON, on endpoints otherwise answering with a single JSON body.
+    """
+    return "application/x-ndjson" in request.headers.get("accept", "")
+
+
+def parse_batch(ids: Optional[str], hashes: Optional[str]) -> Tuple[Optional[List[int]], Optional[List[bytes]]]:
+    """
+    Parses the comma-separated `ids` and `hashes` query parameters of batched lookups.
+    """
+    if ids is not None and hashes is not None:
+        raise HTTPException(BAD_REQUEST, detail="Only one of `ids` or `hashes` can be requested at once.")
+    parsed_ids = [int(item) for item in ids.split(",")] if ids is not None else None
+    parsed_hashes = [bytes.fromhex(item) for item in hashes.split(",")] if hashes is not None else None
+    if len(parsed_ids or parsed_hashes or []) > MAX_BATCH_SIZE:
+        raise HTTPException(BAD_REQUEST, detail=f"At most {MAX_BATCH_SIZE} items can be requested at once.")
+    return parsed_ids, parsed_hashes
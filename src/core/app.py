@@ -6,10 +6,25 @@ from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from starlette.datastructures import State
 
+from api.admission import AdmissionController
+from api.compression import CompressionStats
+from api.streams import SlowConsumerPolicy, SubscriptionRegistry
+from core.cache import LruCache
+from core.ring import HotTail
+from db.addresses import AddressRepository
 from db.blocks import BlockRepository
+from db.channels import ChannelRepository
 from db.clients import DbClient
+from db.compression import CompressionRepository
+from db.inscriptions import InscriptionRepository
+from db.leaders import LeaderRepository
+from db.operations import OperationRepository
+from db.sdp import SdpRepository
+from db.series import SeriesRepository
+from db.stats import StatsRepository
 from db.transaction import TransactionRepository
 from node.api.base import NodeApi
+from node.health import HealthMonitor
 from node.manager.base import NodeManager
 from src import DIR_REPO
 
@@ -29,14 +44,50 @@ class NBESettings(BaseSettings):
     node_api_timeout: int = Field(alias="NBE_NODE_API_TIMEOUT", default=60)
     node_api_protocol: str = Field(alias="NBE_NODE_API_PROTOCOL", default="http")
 
+    cache_max_bytes: int = Field(alias="NBE_CACHE_MAX_BYTES", default=64 * 1024 * 1024, ge=0)
+    cache_negative_ttl_seconds: float = Field(alias="NBE_CACHE_NEGATIVE_TTL_SECONDS", default=5, ge=0)
+    hot_tail_capacity: int = Field(alias="NBE_HOT_TAIL_CAPACITY", default=1000, ge=0)
+    epoch_length_slots: int = Field(alias="NBE_EPOCH_LENGTH_SLOTS", default=21600, gt=0)
+    column_compression: bool = Field(alias="NBE_COLUMN_COMPRESSION", default=False)
+    compression_retrain_rows: int = Field(alias="NBE_COMPRESSION_RETRAIN_ROWS", default=100_000, gt=0)
+    stream_max_queued_frames: int = Field(alias="NBE_STREAM_MAX_QUEUED_FRAMES", default=256, gt=0)
+    stream_slow_consumer_policy: SlowConsumerPolicy = Field(
+        alias="NBE_STREAM_SLOW_CONSUMER_POLICY", default=SlowConsumerPolicy.SUMMARY
+    )
+    health_poll_interval_seconds: float = Field(alias="NBE_HEALTH_POLL_INTERVAL_SECONDS", default=10, gt=0)
+    health_ttl_seconds: float = Field(alias="NBE_HEALTH_TTL_SECONDS", default=15, gt=0)
+    response_compression_min_bytes: int = Field(alias="NBE_RESPONSE_COMPRESSION_MIN_BYTES", default=1024, ge=0)
+    response_compression_level: int = Field(alias="NBE_RESPONSE_COMPRESSION_LEVEL", default=6, ge=1, le=9)
+    stream_max_connections: int = Field(alias="NBE_STREAM_MAX_CONNECTIONS", default=1000, gt=0)
+    stream_max_connections_per_ip: int = Field(alias="NBE_STREAM_MAX_CONNECTIONS_PER_IP", default=20, gt=0)
+    stream_retry_after_seconds: int = Field(alias="NBE_STREAM_RETRY_AFTER_SECONDS", default=5, gt=0)
+    lookup_rate_per_second: float = Field(alias="NBE_LOOKUP_RATE_PER_SECOND", default=20, gt=0)
+    lookup_burst: int = Field(alias="NBE_LOOKUP_BURST", default=50, gt=0)
+
 
 class NBEState(State):
     signal_exit: bool = False  # TODO: asyncio.Event
     node_manager: Optional[NodeManager]
     node_api: Optional[NodeApi]
+    health_monitor: HealthMonitor
     db_client: DbClient
+    cache: LruCache
+    block_tail: HotTail
+    transaction_tail: HotTail
+    subscriptions: SubscriptionRegistry
+    response_compression: CompressionStats
+    admission: AdmissionController
     block_repository: BlockRepository
     transaction_repository: TransactionRepository
+    address_repository: AddressRepository
+    channel_repository: ChannelRepository
+    operation_repository: OperationRepository
+    sdp_repository: SdpRepository
+    leader_repository: LeaderRepository
+    stats_repository: StatsRepository
+    series_repository: SeriesRepository
+    inscription_repository: InscriptionRepository
+    compression_repository: CompressionRepository
     subscription_to_updates_handle: Task
     backfill_handle: Task
 
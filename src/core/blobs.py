@@ -0,0 +1,250 @@
+"""
+Content-addressed, deduplicated storage for the large values of JSON columns.
+
+Columns opting in (see `PydanticJsonColumn`'s `offload`) have their long strings (e.g. hex-encoded proofs) replaced by
+`{"$blob": <digest>}` references on write, and the strings stored once in the blob table, with a count of the
+references to them. References are rehydrated transparently on read.
+
+Blobs are written and read through the connection executing the statement that references them, so they are always
+part of the same transaction. Rows referencing blobs must be deleted through the ORM, which releases their references.
+"""
+
+import logging
+from contextvars import ContextVar
+from hashlib import blake2b
+from typing import Any, Dict, Iterator, List, Optional
+
+from rusty_results import Some
+from sqlalchemy import (
+    Connection,
+    Engine,
+    Integer,
+    String,
+    column,
+    delete,
+    event,
+    func,
+    inspect,
+    select,
+    table,
+    type_coerce,
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, attributes
+from sqlalchemy.types import NullType
+
+from core.cache import LruCache
+
+logger = logging.getLogger(__name__)
+
+BLOB_TABLE_NAME = "blob"
+BLOB_REFERENCE_KEY = "$blob"
+# Shorter strings are kept inline, since a reference would take about as much space as them
+MIN_OFFLOADED_LENGTH = 256
+
+_blob = table(
+    BLOB_TABLE_NAME,
+    column("digest", String),
+    column("data", String),
+    column("size", Integer),
+    column("refcount", Integer),
+)
+
+# Blobs are immutable, so cached ones never go stale
+_cache: LruCache[str] = LruCache(max_bytes=8 * 1024 * 1024, negative_ttl_seconds=0)
+
+# Connection executing the current statement, and the references its parameters added
+_connection: ContextVar[Optional[Connection]] = ContextVar("blob_store_connection", default=None)
+_pending_references: ContextVar[Optional[Dict[str, "_PendingBlob"]]] = ContextVar(
+    "blob_store_pending_references", default=None
+)
+
+
+class _PendingBlob:
+    __slots__ = ("data", "references")
+
+    def __init__(self, data: str):
+        self.data = data
+        self.references = 0
+
+
+def get_digest(data: str) -> str:
+    return blake2b(data.encode("utf-8"), digest_size=32).hexdigest()
+
+
+def _is_offloadable(value: Any) -> bool:
+    return isinstance(value, str) and len(value) >= MIN_OFFLOADED_LENGTH
+
+
+def _is_reference(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and BLOB_REFERENCE_KEY in value
+
+
+def offload(value: Any) -> Any:
+    """
+    Replaces the long strings in a JSON-compatible `value` with blob references. The blobs are written, or their
+    references counted, once the statement binding `value` is executed.
+    """
+    if _is_offloadable(value):
+        pending_references = _pending_references.get()
+        if pending_references is None:
+            pending_references = {}
+            _pending_references.set(pending_references)
+        digest = get_digest(value)
+        pending_references.setdefault(digest, _PendingBlob(value)).references += 1
+        return {BLOB_REFERENCE_KEY: digest}
+    if isinstance(value, list):
+        return [offload(item) for item in value]
+    if isinstance(value, dict):
+        return {key: offload(item) for key, item in value.items()}
+    return value
+
+
+def rehydrate(value: Any) -> Any:
+    """
+    Replaces the blob references in a JSON-compatible `value` with their strings.
+    """
+    if _is_reference(value):
+        return _get(value[BLOB_REFERENCE_KEY])
+    if isinstance(value, list):
+        return [rehydrate(item) for item in value]
+    if isinstance(value, dict):
+        return {key: rehydrate(item) for key, item in value.items()}
+    return value
+
+
+def iter_digests(value: Any) -> Iterator[str]:
+    """
+    Digests of the blobs a JSON-compatible `value` references, or would reference once offloaded.
+    """
+    if _is_offloadable(value):
+        yield get_digest(value)
+    elif _is_reference(value):
+        yield value[BLOB_REFERENCE_KEY]
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_digests(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_digests(item)
+
+
+def _get(digest: str) -> str:
+    cached = _cache.get(digest)
+    if cached.is_some:
+        return cached.unwrap().unwrap()
+
+    connection = _connection.get()
+    if connection is None:
+        raise RuntimeError(f"Cannot rehydrate blob {digest} outside a statement execution.")
+    data = connection.execute(select(_blob.c.data).where(_blob.c.digest == digest)).scalar_one_or_none()
+    if data is None:
+        raise LookupError(f"Blob {digest} is referenced but missing.")
+    _cache.put(digest, Some(data))
+    return data
+
+
+def _write_pending_references(connection: Connection) -> None:
+    pending_references = _pending_references.get()
+    if not pending_references:
+        return
+    _pending_references.set(None)
+
+    rows = [
+        {"digest": digest, "data": blob.data, "size": len(blob.data), "refcount": blob.references}
+        for digest, blob in pending_references.items()
+    ]
+    insert = postgresql_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    statement = insert(_blob).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[_blob.c.digest], set_={"refcount": _blob.c.refcount + statement.excluded.refcount}
+    )
+    connection.execute(statement)
+
+
+def _release(connection: Connection, digests: List[str]) -> None:
+    """
+    Drops one reference per digest (repeated digests drop several), and deletes the blobs left unreferenced.
+    """
+    if not digests:
+        return
+    references: Dict[str, int] = {}
+    for digest in digests:
+        references[digest] = references.get(digest, 0) + 1
+    for digest, count in references.items():
+        connection.execute(_blob.update().where(_blob.c.digest == digest).values(refcount=_blob.c.refcount - count))
+    connection.execute(delete(_blob).where(_blob.c.refcount <= 0))
+    _cache.invalidate(*references.keys())
+
+
+def get_stats(connection: Connection) -> Dict[str, int | float]:
+    """
+    Bytes actually stored against the bytes the references stand for, i.e.: what storing every value inline would take.
+    """
+    blobs, stored_bytes, referenced_bytes, references = connection.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(_blob.c.size), 0),
+            func.coalesce(func.sum(_blob.c.size * _blob.c.refcount), 0),
+            func.coalesce(func.sum(_blob.c.refcount), 0),
+        ).select_from(_blob)
+    ).one()
+    return {
+        "blobs": blobs,
+        "references": references,
+        "stored_bytes": stored_bytes,
+        "referenced_bytes": referenced_bytes,
+        "dedup_ratio": referenced_bytes / stored_bytes if stored_bytes else 1.0,
+    }
+
+
+@event.listens_for(Engine, "before_execute")
+def _on_before_execute(connection: Connection, *_) -> None:
+    _connection.set(connection)
+    # Parameters are bound after this: Leftovers come from a statement that failed to execute, and must not be counted
+    _pending_references.set(None)
+
+
+@event.listens_for(Engine, "after_execute")
+def _on_after_execute(connection: Connection, *_) -> None:
+    _write_pending_references(connection)
+
+
+@event.listens_for(Session, "before_flush")
+def _on_before_flush(session: Session, *_) -> None:
+    """
+    Releases the references held by the offloaded values of deleted rows, and by the replaced values of updated ones.
+    They are read back as stored, rather than recomputed from the instances, so exactly the counted references are dropped.
+    """
+    digests: List[str] = []
+    for instance in session.deleted:
+        digests.extend(_get_stored_digests(session, instance, changed_only=False))
+    for instance in session.dirty:
+        digests.extend(_get_stored_digests(session, instance, changed_only=True))
+    if digests:
+        _release(session.connection(), digests)
+
+
+def _get_stored_digests(session: Session, instance: Any, *, changed_only: bool) -> Iterator[str]:
+    state = inspect(instance)
+    if state.identity is None:
+        return
+    columns = [
+        column
+        for attribute in state.mapper.column_attrs
+        for column in attribute.columns[:1]
+        if getattr(column.type, "offload", False)
+        and (not changed_only or attributes.get_history(instance, attribute.key).has_changes())
+    ]
+    if not columns:
+        return
+
+    # Read as stored, so references are not rehydrated
+    statement = select(*(type_coerce(column, NullType()) for column in columns)).where(
+        *(column == value for column, value in zip(state.mapper.primary_key, state.identity))
+    )
+    row = session.connection().execute(statement).one_or_none()
+    for column, value in zip(columns, row or ()):
+        if value is not None:
+            yield from iter_digests(column.type.load_stored(value))
@@ -0,0 +1,214 @@
+import logging
+import sys
+from collections import OrderedDict
+from itertools import chain
+from time import monotonic
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+)
+
+from pydantic import BaseModel
+from rusty_results import Empty, Option, Some
+
+V = TypeVar("V")
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value: Any, _seen: Optional[Set[int]] = None) -> int:
+    """
+    Rough estimation of the memory held by `value`, in bytes.
+    Recurses through Pydantic/SQLModel fields, SQLModel relationships (e.g. a block's eagerly loaded transactions) and
+    containers. Objects reachable more than once (e.g. a transaction's back-reference to its block) are counted once.
+    It is not exact, but it is consistent, which is what the cache's memory budget needs.
+    """
+    seen = set() if _seen is None else _seen
+    if isinstance(value, BaseModel):
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+        size = sys.getsizeof(value)
+        attributes = chain(type(value).model_fields, getattr(type(value), "__sqlmodel_relationships__", ()))
+        for attribute in attributes:
+            size += estimate_size(value.__dict__.get(attribute), seen)
+        return size
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(item, seen) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(key, seen) + estimate_size(item, seen) for key, item in value.items()
+        )
+    return sys.getsizeof(value)
+
+
+class _Entry(NamedTuple):
+    value: Option
+    size: int
+    expires_at: Optional[float]
+
+
+class LruCache(Generic[V]):
+    """
+    In-process, size-bounded LRU cache.
+
+    Entries are accounted by their estimated memory footprint, and the least recently used ones are evicted once
+    `max_bytes` is exceeded.
+    Negative results (`Empty`) are cached as well, but they expire after `negative_ttl_seconds`, since the missing item
+    might be ingested at any time.
+    """
+
+    NEGATIVE_ENTRY_SIZE = 64
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int,
+        negative_ttl_seconds: float,
+        weigher: Callable[[V], int] = estimate_size,
+    ):
+        self.max_bytes = max_bytes
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.weigher = weigher
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._bytes: int = 0
+
+        self.hits: int = 0
+        self.negative_hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+        self.invalidations: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: Hashable) -> Option[Option[V]]:
+        """
+        Returns `Some(cached)` on a hit, where `cached` is the cached (possibly negative) result; `Empty` on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return Empty()
+
+        if entry.expires_at is not None and entry.expires_at <= monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return Empty()
+
+        self._entries.move_to_end(key)
+        if entry.value.is_some:
+            self.hits += 1
+        else:
+            self.negative_hits += 1
+        return Some(entry.value)
+
+    def put(self, key: Hashable, value: Option[V]) -> None:
+        if value.is_some:
+            size = self.weigher(value.unwrap())
+            expires_at = None
+        else:
+            size = self.NEGATIVE_ENTRY_SIZE
+            expires_at = monotonic() + self.negative_ttl_seconds
+
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {key}: its size ({size}B) exceeds the cache capacity ({self.max_bytes}B).")
+            self._remove(key)
+            return
+
+        self._remove(key)
+        self._entries[key] = _Entry(value, size, expires_at)
+        self._bytes += size
+        self._evict()
+
+    def invalidate(self, *keys: Hashable) -> None:
+        for key in keys:
+            if self._remove(key):
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Option[V]]]) -> Option[V]:
+        """
+        Read-through lookup: on a miss, `loader` is awaited and its result (positive or negative) is cached.
+        """
+        cached: Option[Option[V]] = self.get(key)
+        if cached.is_some:
+            return cached.unwrap()
+
+        value = await loader()
+        self.put(key, value)
+        return value
+
+    async def get_many_or_load(
+        self, keys: Sequence[Hashable], loader: Callable[[List[Hashable]], Awaitable[Mapping[Hashable, V]]]
+    ) -> List[Option[V]]:
+        """
+        Batched read-through lookup: `loader` is awaited once with all the missed keys, and returns the found values by
+        key. Keys missing from its result are cached as negative. Results are returned in the order of `keys`.
+        """
+        results: Dict[Hashable, Option[V]] = {}
+        missed: List[Hashable] = []
+        for key in dict.fromkeys(keys):
+            cached: Option[Option[V]] = self.get(key)
+            if cached.is_some:
+                results[key] = cached.unwrap()
+            else:
+                missed.append(key)
+
+        if missed:
+            loaded = await loader(missed)
+            for key in missed:
+                value = Some(loaded[key]) if key in loaded else Empty()
+                self.put(key, value)
+                results[key] = value
+
+        return [results[key] for key in keys]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        return True
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
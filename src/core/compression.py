@@ -0,0 +1,109 @@
+"""
+Dictionary compression for JSON columns.
+
+Columns opting in (see `PydanticJsonColumn`'s `compression`) store their values as zstd frames compressed with a
+dictionary trained from their own rows, once compression is enabled (`NBE_COLUMN_COMPRESSION`). Until then, they are
+plain JSON columns. Dictionaries are versioned: Each value records the version it was compressed
+with, so a column can be retrained at any time while older values keep decompressing with their own dictionary.
+
+Values are stored as a one-byte codec, followed by:
+- `RAW`: The JSON text, for values compression would not shrink (e.g. empty lists).
+- `ZSTD`: The dictionary version (0 if there was none yet) as a 4-byte big-endian integer, and the zstd frame.
+"""
+
+import json
+import logging
+import struct
+from compression import zstd
+from typing import Any, Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+CODEC_RAW = 0
+CODEC_ZSTD = 1
+NO_DICTIONARY = 0
+COMPRESSION_LEVEL = 3
+DICTIONARY_SIZE = 64 * 1024
+
+_VERSION = struct.Struct(">I")
+
+# Whether opted-in columns are compressed. Must be set before the database is first used, as it changes their type
+_enabled = False
+# Dictionaries by column name, then version
+_dictionaries: Dict[str, Dict[int, zstd.ZstdDict]] = {}
+# Version new values are compressed with, by column name
+_current_versions: Dict[str, int] = {}
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def register(name: str, version: int, content: bytes) -> None:
+    """
+    Makes a dictionary available for decompression, and for compression if it is the column's latest version.
+    """
+    _dictionaries.setdefault(name, {})[version] = zstd.ZstdDict(content)
+    if version > _current_versions.get(name, NO_DICTIONARY):
+        _current_versions[name] = version
+
+
+def get_current_version(name: str) -> int:
+    return _current_versions.get(name, NO_DICTIONARY)
+
+
+def train(samples: Iterable[bytes], *, size: int = DICTIONARY_SIZE) -> bytes:
+    return zstd.train_dict(list(samples), size).dict_content
+
+
+def encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def compress(name: str, value: Any) -> bytes:
+    """
+    Compresses a JSON-compatible `value` with the column's current dictionary.
+    """
+    data = encode(value)
+    version = get_current_version(name)
+    zstd_dict = _dictionaries[name][version] if version != NO_DICTIONARY else None
+    frame = zstd.compress(data, COMPRESSION_LEVEL, zstd_dict=zstd_dict)
+    if len(frame) + _VERSION.size >= len(data):
+        return bytes((CODEC_RAW,)) + data
+    return bytes((CODEC_ZSTD,)) + _VERSION.pack(version) + frame
+
+
+def decompress(name: str, stored: Any) -> Any:
+    """
+    Inverse of `compress`. Values stored before the column opted in (JSON text or already parsed) are passed through.
+    """
+    if isinstance(stored, str):
+        return json.loads(stored)
+    if not isinstance(stored, (bytes, bytearray, memoryview)):
+        return stored
+    return json.loads(decompress_bytes(name, bytes(stored)))
+
+
+def decompress_bytes(name: str, stored: bytes) -> bytes:
+    """
+    Returns the JSON text of a stored value.
+    """
+    codec = stored[0]
+    if codec == CODEC_RAW:
+        return stored[1:]
+    if codec != CODEC_ZSTD:
+        raise ValueError(f"Unknown compression codec {codec} for {name}.")
+
+    (version,) = _VERSION.unpack_from(stored, 1)
+    frame = stored[1 + _VERSION.size :]
+    if version == NO_DICTIONARY:
+        return zstd.decompress(frame)
+    zstd_dict = _dictionaries.get(name, {}).get(version)
+    if zstd_dict is None:
+        raise LookupError(f"Dictionary {version} for {name} is not registered.")
+    return zstd.decompress(frame, zstd_dict=zstd_dict)
@@ -1,6 +1,10 @@
-from typing import Literal
+from typing import Collection, List, Literal, Optional, Sequence, Tuple, Type
 
-from sqlalchemy import Float, Integer, String, cast, func
+from rusty_results import Option
+from sqlalchemy import Float, Integer, String, and_, cast, func, inspect, tuple_
+from sqlalchemy.orm import load_only, noload
+from sqlalchemy.sql.base import ExecutableOption
+from sqlmodel import SQLModel
 
 
 def order_by_json(
@@ -20,3 +24,60 @@ def jget(sql_expr, path: str, *, into_type: Literal["int", "float", "text"] = "t
         case "text":
             expression = cast(expression, String)
     return expression
+
+
+def _increment_bytes(data: bytes) -> Optional[bytes]:
+    """
+    Smallest byte string greater than every string prefixed by `data`, or `None` if there is none (all 0xff).
+    """
+    stripped = data.rstrip(b"\xff")
+    if not stripped:
+        return None
+    return stripped[:-1] + bytes([stripped[-1] + 1])
+
+
+def hex_prefix_range(hex_prefix: str) -> Tuple[bytes, Optional[bytes]]:
+    """
+    Translates a hex prefix (of any length, odd included) into the `[lower, upper)` range of byte strings it covers.
+    """
+    if len(hex_prefix) % 2 == 0:
+        lower = bytes.fromhex(hex_prefix)
+        return lower, _increment_bytes(lower)
+    lower = bytes.fromhex(hex_prefix + "0")
+    return lower, _increment_bytes(bytes.fromhex(hex_prefix + "f"))
+
+
+def starts_with_hex(sql_expr, hex_prefix: str):
+    """
+    Prefix filter on a binary column expressed as a range, so it is resolved by seeking the column's index.
+    """
+    lower, upper = hex_prefix_range(hex_prefix)
+    if upper is None:
+        return sql_expr >= lower
+    return and_(sql_expr >= lower, sql_expr < upper)
+
+
+def keyset(statement, columns: Sequence, cursor: Option[Tuple[int, ...]], *, newer: bool = False):
+    """
+    Keyset pagination over `columns`: Seeks past `cursor` instead of using OFFSET, so every page costs the same as long
+    as `columns` are indexed.
+    Selects the rows older than `cursor` in descending order or, if `newer`, the ones newer than it in ascending order.
+    """
+    if cursor.is_some:
+        key, cursor_key = tuple_(*columns), tuple_(*cursor.unwrap())
+        statement = statement.where(key > cursor_key if newer else key < cursor_key)
+    return statement.order_by(*(column.asc() if newer else column.desc() for column in columns))
+
+
+def load_only_columns(model: Type[SQLModel], columns: Collection[str]) -> List[ExecutableOption]:
+    """
+    Loader options for `model` that only load the given attributes (columns, or relationships): Other columns are
+    deferred, so they are neither read nor decoded (e.g. JSON columns), and other relationships are not loaded at all.
+    Deferred attributes cannot be read once the session is closed, so callers must only read the ones they loaded.
+    """
+    mapper = inspect(model)
+    options: List[ExecutableOption] = [
+        load_only(*(getattr(model, key) for key in mapper.column_attrs.keys() if key in columns))
+    ]
+    options.extend(noload(getattr(model, key)) for key in mapper.relationships.keys() if key not in columns)
+    return options
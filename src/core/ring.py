@@ -0,0 +1,112 @@
+from collections import deque
+from itertools import islice
+from typing import Callable, Dict, Generic, Iterable, List, Optional, Protocol, TypeVar
+
+from rusty_results import Empty, Option, Some
+
+
+class Keyed(Protocol):
+    @property
+    def key(self) -> tuple: ...
+
+
+R = TypeVar("R", bound=Keyed)
+
+
+class HotTail(Generic[R]):
+    """
+    Fixed-capacity ring buffer holding the most recent records, ordered by their `key`.
+
+    Records are expected to arrive mostly in order, so appending is O(1). Late records (e.g. from backfilling) are
+    inserted in place if they fall inside the buffer, or dropped if they are older than its oldest record.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._records: deque[R] = deque(maxlen=capacity)
+        # Whether the buffer holds every existing record, i.e.: the database has never held more than `capacity`
+        self._complete: bool = False
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def warm(self, records: Iterable[R], *, complete: bool) -> None:
+        self.extend(records)
+        self._complete = complete and len(self._records) < self.capacity
+
+    def extend(self, records: Iterable[R]) -> None:
+        for record in records:
+            self.append(record)
+
+    def append(self, record: R) -> None:
+        if self.capacity == 0:
+            return
+
+        if not self._records or self._records[-1].key < record.key:
+            self._push(record)
+            return
+
+        if len(self._records) == self.capacity and record.key < self._records[0].key:
+            self._complete = False
+            return
+
+        # Out of order: Find its position from the end, where late records are most likely to land
+        index = len(self._records)
+        while index > 0 and record.key < self._records[index - 1].key:
+            index -= 1
+        if index > 0 and self._records[index - 1].key == record.key:
+            return
+        if len(self._records) == self.capacity:
+            self._records.popleft()
+            self._complete = False
+            index -= 1
+        self._records.insert(index, record)
+
+    def latest(self, limit: int, *, where: Optional[Callable[[R], bool]] = None) -> Option[List[R]]:
+        """
+        Returns the latest `limit` records in ascending order, or `Empty` if the buffer cannot guarantee having them.
+        If `where` is given, only the records matching it are considered.
+        """
+        if limit == 0:
+            return Some([])
+        if where is not None:
+            return self._latest_matching(limit, where)
+        if limit > len(self._records) and not self._complete:
+            return Empty()
+        start = max(0, len(self._records) - limit)
+        return Some(list(islice(self._records, start, None)))
+
+    def get(self, key: tuple) -> Option[R]:
+        """
+        The record with `key`, if buffered. Searched from the end, where the records just appended are.
+        """
+        for record in reversed(self._records):
+            if record.key == key:
+                return Some(record)
+            if record.key < key:
+                break
+        return Empty()
+
+    def _latest_matching(self, limit: int, where: Callable[[R], bool]) -> Option[List[R]]:
+        matching: List[R] = []
+        for record in reversed(self._records):
+            if where(record):
+                matching.append(record)
+                if len(matching) == limit:
+                    break
+        if len(matching) < limit and not self._complete:
+            return Empty()
+        matching.reverse()
+        return Some(matching)
+
+    def stats(self) -> Dict[str, int | bool]:
+        return {
+            "records": len(self._records),
+            "capacity": self.capacity,
+            "complete": self._complete,
+        }
+
+    def _push(self, record: R) -> None:
+        if len(self._records) == self.capacity:
+            self._complete = False
+        self._records.append(record)
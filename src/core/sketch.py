@@ -0,0 +1,70 @@
+from math import ceil, log
+from typing import Dict, Iterable, Mapping, Self
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch for non-negative values, with bounded relative error (as in DDSketch).
+
+    Values are counted in logarithmic bins, each `(1 + relative_accuracy) / (1 - relative_accuracy)` times wider than
+    the previous one, so any quantile is estimated within `relative_accuracy` of its actual value.
+    Its size grows with the logarithm of the values' range, not with their count, and sketches of disjoint sets of values
+    can be merged by adding up their bins. That makes it fit for incremental rollups.
+    """
+
+    def __init__(self, bins: Mapping[int, int] | None = None, *, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = log(self._gamma)
+        # Bin 0 holds the zeros; bin `i > 0` holds the values in (gamma^(i-2), gamma^(i-1)]
+        self.bins: Dict[int, int] = dict(bins or {})
+
+    @property
+    def count(self) -> int:
+        return sum(self.bins.values())
+
+    def add(self, value: float, count: int = 1) -> None:
+        index = self._get_bin_index(value)
+        self.bins[index] = self.bins.get(index, 0) + count
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Estimated value at quantile `q` (within [0, 1]), or `None` if the sketch is empty.
+        """
+        total = self.count
+        if total == 0:
+            return None
+
+        rank = q * (total - 1)
+        seen = 0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                return self._get_bin_value(index)
+        return self._get_bin_value(max(self.bins))
+
+    def to_json(self) -> Dict[str, int]:
+        return {str(index): count for index, count in self.bins.items()}
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, int], *, relative_accuracy: float = 0.01) -> Self:
+        return cls({int(index): count for index, count in data.items()}, relative_accuracy=relative_accuracy)
+
+    def _get_bin_index(self, value: float) -> int:
+        if value <= 0:
+            return 0
+        return max(1, ceil(log(value) / self._log_gamma) + 1)
+
+    def _get_bin_value(self, index: int) -> float:
+        if index == 0:
+            return 0
+        # Midpoint, in relative terms, of (gamma^(i-2), gamma^(i-1)]
+        return 2 * self._gamma ** (index - 1) / (self._gamma + 1)
@@ -1,10 +1,13 @@
+import json
 import logging
-from typing import Any, Generic, List, Literal, TypeVar
+from typing import Any, Generic, List, Literal, Optional, TypeVar
 
 from pydantic import TypeAdapter
 from pydantic.config import ExtraValues
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.types import JSON as SA_JSON, TypeDecorator
+from sqlalchemy.types import JSON as SA_JSON, LargeBinary, TypeDecorator
+
+from core import blobs, compression as compression_
 
 T = TypeVar("T")
 
@@ -53,22 +56,38 @@ class PydanticJsonColumn(TypeDecorator, Generic[T]):
     impl = SA_JSON
     cache_ok = True
 
-    def __init__(self, model: type[T], *, many: bool = False) -> None:
+    def __init__(
+        self, model: type[T], *, many: bool = False, offload: bool = False, compression: Optional[str] = None
+    ) -> None:
         """
         The passed model must be a non-list type. To specify a list of models, pass `many=True`.
+        With `offload=True`, long values are moved to the deduplicated blob store, and the column holds references to
+        them (see `core.blobs`).
+        With `compression`, values are stored compressed with the dictionaries trained under that name, in a binary
+        column, if column compression is enabled (see `core.compression`).
         """
         super().__init__()
         self.many = many
+        self.offload = offload
+        self.compression = compression
         self._ta = _TypeAdapter(List[model] if many else model)
 
-    # Use JSONB on Postgres, JSON elsewhere
+    @property
+    def is_compressed(self) -> bool:
+        return self.compression is not None and compression_.is_enabled()
+
+    # Use JSONB on Postgres, JSON elsewhere; Compressed values are opaque bytes everywhere
     def load_dialect_impl(self, dialect):
+        if self.is_compressed:
+            return dialect.type_descriptor(LargeBinary())
         return dialect.type_descriptor(JSONB()) if dialect.name == "postgresql" else dialect.type_descriptor(SA_JSON())
 
     # Python -> DB (on INSERT/UPDATE)
     def process_bind_param(self, value: Any, _dialect) -> Any:
         if value is None:
-            return [] if self.many else None
+            if not self.many:
+                return None
+            value = []
 
         # If given JSON text/bytes, validate from JSON; else from Python
         if isinstance(value, (str, bytes, bytearray)):
@@ -78,10 +97,27 @@ class PydanticJsonColumn(TypeDecorator, Generic[T]):
 
         # Dump to plain Python (dict/list) for the JSON column
         plain = self._ta.dump_python(model_value, mode="json")
+        if self.offload:
+            plain = blobs.offload(plain)
+        if self.is_compressed:
+            return compression_.compress(self.compression, plain)
         return plain
 
     # DB -> Python (on SELECT)
     def process_result_value(self, value: Any, _dialect):
         if value is None:
             return [] if self.many else None
+        value = self.load_stored(value)
+        if self.offload:
+            value = blobs.rehydrate(value)
         return self._ta.validate_python(value)
+
+    def load_stored(self, value: Any) -> Any:
+        """
+        Plain JSON value of a value as stored (or as returned by the driver), with its blob references left in place.
+        """
+        if self.compression is not None:
+            return compression_.decompress(self.compression, value)
+        if isinstance(value, (str, bytes, bytearray)):
+            return json.loads(value)
+        return value
@@ -1,4 +1,4 @@
-from typing import Annotated
+from typing import Annotated, Any
 
 from pydantic import AfterValidator, BeforeValidator, PlainSerializer
 
@@ -7,7 +7,17 @@ def hexify(data: bytes) -> str:
     return data.hex()
 
 
+def unhexify(data: Any) -> Any:
+    """
+    Hex strings, as `HexBytes` are serialized to JSON, are read back as the bytes they encode.
+    """
+    if isinstance(data, str):
+        return bytes.fromhex(data)
+    return data
+
+
 HexBytes = Annotated[
     bytes,
+    BeforeValidator(unhexify),
     PlainSerializer(hexify, return_type=str, when_used="json"),
 ]
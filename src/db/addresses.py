@@ -0,0 +1,88 @@
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+from rusty_results import Empty, Option, Some
+from sqlmodel import Session, select
+
+from core.db import keyset
+from db.clients import DbClient
+from db.indexer import Indexer
+from models.address import Address, AddressTransaction
+from models.block import Block
+
+# (slot, transaction id) of the last delivered AddressTransaction
+AddressTransactionCursor = Tuple[int, int]
+
+
+class AddressRepository(Indexer):
+    """
+    Index of the transactions paying each public key, maintained at ingestion time.
+
+    Transaction inputs reference notes by id only, so spends cannot be attributed to a public key: Rather than a balance,
+    `Address.total_received` is the running total of the values received.
+    """
+
+    def __init__(self, client: DbClient):
+        self.client = client
+
+    def index(self, session: Session, blocks: Sequence[Block]) -> None:
+        entries: List[AddressTransaction] = []
+        for block in blocks:
+            for transaction in block.transactions:
+                values: Dict[bytes, int] = defaultdict(int)
+                for output in transaction.outputs:
+                    values[output.public_key] += output.value
+                entries.extend(
+                    AddressTransaction(
+                        public_key=public_key, slot=block.slot, transaction_id=transaction.id, value=value
+                    )
+                    for public_key, value in values.items()
+                )
+        if not entries:
+            return
+
+        session.add_all(entries)
+
+        entries_by_public_key: Dict[bytes, List[AddressTransaction]] = defaultdict(list)
+        for entry in entries:
+            entries_by_public_key[entry.public_key].append(entry)
+        for public_key, address_entries in entries_by_public_key.items():
+            slots = [entry.slot for entry in address_entries]
+            address = session.get(Address, public_key) or Address(
+                public_key=public_key,
+                total_received=0,
+                transactions_count=0,
+                first_slot=min(slots),
+                last_slot=max(slots),
+            )
+            address.total_received += sum(entry.value for entry in address_entries)
+            address.transactions_count += len(address_entries)
+            address.first_slot = min(address.first_slot, *slots)
+            address.last_slot = max(address.last_slot, *slots)
+            session.add(address)
+
+    async def get_by_public_key(self, public_key: bytes) -> Option[Address]:
+        with self.client.session() as session:
+            if (address := session.get(Address, public_key)) is not None:
+                return Some(address)
+            else:
+                return Empty()
+
+    async def get_transactions_page(
+        self,
+        public_key: bytes,
+        limit: int,
+        *,
+        cursor: Option[AddressTransactionCursor] = Empty(),
+        newer: bool = False,
+    ) -> List[AddressTransaction]:
+        """
+        Keyset pagination over (slot, transaction id), seeking the primary key index.
+        Returns up to `limit` entries older than `cursor` in descending order or, if `newer`, the ones newer than
+        `cursor` in ascending order.
+        """
+        statement = select(AddressTransaction).where(AddressTransaction.public_key == public_key)
+        statement = keyset(statement, (AddressTransaction.slot, AddressTransaction.transaction_id), cursor, newer=newer)
+
+        with self.client.session() as session:
+            return session.exec(statement.limit(limit)).all()
@@ -1,14 +1,39 @@
 import logging
 from asyncio import sleep
-from typing import AsyncIterator, List
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from rusty_results import Empty, Option, Some
 from sqlalchemy import Result, Select
-from sqlalchemy.orm import aliased
+from sqlalchemy.orm import aliased, selectinload
 from sqlmodel import select
 
+from core.cache import LruCache
+from core.db import keyset, load_only_columns, starts_with_hex
 from db.clients import DbClient
+from db.indexer import Indexer
+from db.operations import get_page_keys, has_operation_type
 from models.block import Block
+from models.transactions.operations.contents import ContentType
+from models.transactions.transaction import Transaction
+from utils.option import into_option
+
+logger = logging.getLogger(__name__)
+
+# (slot, id) of the last delivered Block
+BlockCursor = Tuple[int, int]
+BlocksListener = Callable[[List[Block]], None]
+# Always loaded, even if not requested, since blocks are paginated and streamed by them
+BLOCK_KEY_COLUMNS = frozenset(("id", "slot"))
 
 
 def get_latest_statement(limit: int, *, output_ascending: bool = True) -> Select:
@@ -23,20 +48,73 @@ def get_latest_statement(limit: int, *, output_ascending: bool = True) -> Select
     return select(latest).options().order_by(latest.slot.asc(), latest.id.asc())  # type: ignore[arg-type]
 
 
+def _load_columns(statement: Select, columns: Option[FrozenSet[str]]) -> Select:
+    """
+    With `columns`, only those (and the key) of the selected blocks are loaded.
+    """
+    if columns.is_empty:
+        return statement
+    return statement.options(*load_only_columns(Block, BLOCK_KEY_COLUMNS.union(columns.unwrap())))
+
+
+def _get_block_cache_keys(block: Block) -> List[tuple]:
+    keys = [("block", "id", block.id), ("block", "hash", block.hash)]
+    for transaction in block.transactions:
+        keys.extend((("transaction", "id", transaction.id), ("transaction", "hash", transaction.hash)))
+    return keys
+
+
 class BlockRepository:
     """
     FIXME: Assumes slots are sequential and one block per slot
     """
 
-    def __init__(self, client: DbClient):
+    def __init__(self, client: DbClient, *, cache: Optional[LruCache] = None, indexers: Sequence[Indexer] = ()):
         self.client = client
+        self.cache = cache
+        self.indexers = list(indexers)
+        self.listeners: List[BlocksListener] = []
+
+    def subscribe(self, listener: BlocksListener) -> None:
+        """
+        Registers a listener that is called with the fully loaded blocks after each successful `create`.
+        """
+        self.listeners.append(listener)
 
     async def create(self, *blocks: Block) -> None:
         with self.client.session() as session:
             session.add_all(list(blocks))
+            session.flush()
+            for indexer in self.indexers:
+                indexer.index(session, blocks)
+            block_ids = [block.id for block in blocks]
+            cache_keys = [key for block in blocks for key in _get_block_cache_keys(block)]
             session.commit()
 
-    async def get_by_id(self, block_id: int) -> Option[Block]:
+        # New rows can only turn cached negative results stale
+        if self.cache is not None:
+            self.cache.invalidate(*cache_keys)
+
+        if self.listeners:
+            # Committed instances are expired, so listeners get a fresh copy
+            created_blocks = await self._reload(block_ids)
+            for listener in self.listeners:
+                try:
+                    listener(created_blocks)
+                except Exception as error:
+                    logger.exception(f"Error while notifying created blocks to {listener}: {error}")
+
+    async def get_by_id(self, block_id: int, *, columns: Option[FrozenSet[str]] = Empty()) -> Option[Block]:
+        """
+        With `columns`, only those are loaded, unless the block is cached. Partially loaded blocks are not cached.
+        """
+        if columns.is_some:
+            return await self._get_partial(("block", "id", block_id), Block.id == block_id, columns)
+        if self.cache is None:
+            return await self._get_by_id(block_id)
+        return await self.cache.get_or_load(("block", "id", block_id), lambda: self._get_by_id(block_id))
+
+    async def _get_by_id(self, block_id: int) -> Option[Block]:
         statement = select(Block).where(Block.id == block_id)
 
         with self.client.session() as session:
@@ -46,7 +124,17 @@ class BlockRepository:
             else:
                 return Empty()
 
-    async def get_by_hash(self, block_hash: str) -> Option[Block]:
+    async def get_by_hash(self, block_hash: bytes, *, columns: Option[FrozenSet[str]] = Empty()) -> Option[Block]:
+        """
+        With `columns`, only those are loaded, unless the block is cached. Partially loaded blocks are not cached.
+        """
+        if columns.is_some:
+            return await self._get_partial(("block", "hash", block_hash), Block.hash == block_hash, columns)
+        if self.cache is None:
+            return await self._get_by_hash(block_hash)
+        return await self.cache.get_or_load(("block", "hash", block_hash), lambda: self._get_by_hash(block_hash))
+
+    async def _get_by_hash(self, block_hash: bytes) -> Option[Block]:
         statement = select(Block).where(Block.hash == block_hash)
 
         with self.client.session() as session:
@@ -56,6 +144,86 @@ class BlockRepository:
             else:
                 return Empty()
 
+    async def _get_partial(self, key: tuple, condition, columns: Option[FrozenSet[str]]) -> Option[Block]:
+        if self.cache is not None and (cached := self.cache.get(key)).is_some:
+            return cached.unwrap()
+        statement = _load_columns(select(Block).where(condition), columns)
+
+        with self.client.session() as session:
+            return into_option(session.exec(statement).one_or_none())
+
+    async def get_by_hash_prefix(self, hash_prefix: str, *, limit: int) -> List[Block]:
+        """
+        Only the key and hash of the matching blocks are loaded, which is all a search hit shows.
+        """
+        statement = (
+            _load_columns(select(Block), Some(frozenset({"hash"})))
+            .where(starts_with_hex(Block.hash, hash_prefix))
+            .order_by(Block.hash.asc())
+            .limit(limit)
+        )
+
+        with self.client.session() as session:
+            return session.exec(statement).all()
+
+    async def _reload(self, block_ids: List[int]) -> List[Block]:
+        statement = (
+            select(Block)
+            .options(selectinload(Block.transactions).selectinload(Transaction.block))
+            .where(Block.id.in_(block_ids))
+            .order_by(Block.slot.asc(), Block.id.asc())
+        )
+
+        with self.client.session() as session:
+            return session.exec(statement).all()
+
+    async def get_by_ids(
+        self, block_ids: Sequence[int], *, columns: Option[FrozenSet[str]] = Empty()
+    ) -> List[Option[Block]]:
+        """
+        Resolves all ids with a single query, besides the ones already cached. Results follow the order of `block_ids`.
+        With `columns`, only those are loaded for the blocks not cached, which are not cached either.
+        """
+        return await self._get_many("id", block_ids, columns)
+
+    async def get_by_hashes(
+        self, block_hashes: Sequence[bytes], *, columns: Option[FrozenSet[str]] = Empty()
+    ) -> List[Option[Block]]:
+        """
+        Resolves all hashes with a single query, besides the ones already cached. Results follow the order of
+        `block_hashes`.
+        With `columns`, only those are loaded for the blocks not cached, which are not cached either.
+        """
+        return await self._get_many("hash", block_hashes, columns)
+
+    async def _get_many(
+        self, field: Literal["id", "hash"], values: Sequence, columns: Option[FrozenSet[str]]
+    ) -> List[Option[Block]]:
+        keys = [("block", field, value) for value in values]
+        if columns.is_some:
+            cached: Dict[tuple, Option[Block]] = {}
+            if self.cache is not None:
+                for key in keys:
+                    if (hit := self.cache.get(key)).is_some:
+                        cached[key] = hit.unwrap()
+            missed_keys = [key for key in keys if key not in cached]
+            blocks = await self._load_many(field, missed_keys, columns=columns) if missed_keys else {}
+            return [cached[key] if key in cached else into_option(blocks.get(key)) for key in keys]
+        if self.cache is None:
+            blocks = await self._load_many(field, keys)
+            return [into_option(blocks.get(key)) for key in keys]
+        return await self.cache.get_many_or_load(keys, lambda missed_keys: self._load_many(field, missed_keys))
+
+    async def _load_many(
+        self, field: Literal["id", "hash"], keys: Sequence[tuple], *, columns: Option[FrozenSet[str]] = Empty()
+    ) -> Dict[tuple, Block]:
+        column = getattr(Block, field)
+        statement = _load_columns(select(Block).where(column.in_([key[2] for key in keys])), columns)
+
+        with self.client.session() as session:
+            blocks: List[Block] = session.exec(statement).all()
+        return {("block", field, getattr(block, field)): block for block in blocks}
+
     async def get_latest(self, limit: int, *, ascending: bool = True) -> List[Block]:
         if limit == 0:
             return []
@@ -67,6 +235,54 @@ class BlockRepository:
             b = results.all()
             return b
 
+    async def get_page(
+        self,
+        limit: int,
+        *,
+        cursor: Option[BlockCursor] = Empty(),
+        newer: bool = False,
+        before_slot: Option[int] = Empty(),
+        after_slot: Option[int] = Empty(),
+        operation_type: Option[ContentType] = Empty(),
+        columns: Option[FrozenSet[str]] = Empty(),
+    ) -> List[Block]:
+        """
+        Keyset pagination over (slot, id): It seeks the index instead of using OFFSET, so every page costs the same.
+        Returns up to `limit` blocks older than `cursor` in descending order or, if `newer`, the ones newer than `cursor`
+        in ascending order.
+        If `operation_type` is set, only blocks with an operation of that type are returned, paginating the operations
+        index instead.
+        With `columns`, only those are loaded.
+        """
+        if operation_type.is_some:
+            page = get_page_keys(
+                operation_type.unwrap(),
+                ("slot", "block_id"),
+                limit,
+                cursor=cursor,
+                newer=newer,
+                before_slot=before_slot,
+                after_slot=after_slot,
+            )
+            statement = keyset(
+                _load_columns(select(Block).join(page, Block.id == page.c.block_id), columns),
+                (page.c.slot, page.c.block_id),
+                Empty(),
+                newer=newer,
+            )
+            with self.client.session() as session:
+                return session.exec(statement).all()
+
+        statement = _load_columns(select(Block), columns)
+        if before_slot.is_some:
+            statement = statement.where(Block.slot < before_slot.unwrap())
+        if after_slot.is_some:
+            statement = statement.where(Block.slot > after_slot.unwrap())
+        statement = keyset(statement, (Block.slot, Block.id), cursor, newer=newer)
+
+        with self.client.session() as session:
+            return session.exec(statement.limit(limit)).all()
+
     async def get_earliest(self) -> Option[Block]:
         statement = select(Block).order_by(Block.slot.asc()).limit(1)
 
@@ -78,24 +294,33 @@ class BlockRepository:
                 return Empty()
 
     async def updates_stream(
-        self, block_from: Option[Block], *, timeout_seconds: int = 1
+        self,
+        cursor: Option[BlockCursor],
+        *,
+        operation_type: Option[ContentType] = Empty(),
+        columns: Option[FrozenSet[str]] = Empty(),
+        timeout_seconds: int = 1,
+        batch_size: int = 100,
     ) -> AsyncIterator[List[Block]]:
-        slot_cursor: int = block_from.map(lambda block: block.slot).unwrap_or(0)
-        id_cursor: int = block_from.map(lambda block: block.id + 1).unwrap_or(0)
-
+        """
+        Yields the blocks after `cursor` in batches of at most `batch_size` (e.g. when catching up after resuming), and
+        then new blocks as they are stored. With `columns`, only those are loaded.
+        """
         while True:
-            statement = (
-                select(Block)
-                .where(Block.slot >= slot_cursor, Block.id >= id_cursor)
-                .order_by(Block.slot.asc(), Block.id.asc())
-            )
+            # Row-value comparison: Ids do not grow with slots (e.g. backfilled blocks), so keys cannot be compared apart
+            statement = keyset(_load_columns(select(Block), columns), (Block.slot, Block.id), cursor, newer=True)
+            statement = statement.limit(batch_size)
+            if operation_type.is_some:
+                from_slot = cursor.map(lambda _cursor: _cursor[0]).unwrap_or(0)
+                statement = statement.where(
+                    has_operation_type(Block.id, "block_id", operation_type.unwrap(), from_slot=from_slot)
+                )
 
             with self.client.session() as session:
                 blocks: List[Block] = session.exec(statement).all()
 
             if len(blocks) > 0:
-                slot_cursor = blocks[-1].slot
-                id_cursor = blocks[-1].id + 1
+                cursor = Some((blocks[-1].slot, blocks[-1].id))
                 yield blocks
             else:
                 await sleep(timeout_seconds)
@@ -0,0 +1,132 @@
+from collections import defaultdict
+from typing import Dict, List, Sequence, Set, Tuple
+
+from rusty_results import Empty, Option, Some
+from sqlmodel import Session, select
+
+from core.db import keyset
+from db.clients import DbClient
+from db.indexer import Indexer
+from models.block import Block
+from models.channel import Channel, ChannelOperation
+from models.transactions.operations.contents import (
+    ChannelBlob,
+    ChannelInscribe,
+    ChannelSetKeys,
+    NbeContent,
+)
+from models.transactions.operations.operation import Operation
+
+# (slot, transaction id, operation index) of the last delivered ChannelOperation
+ChannelOperationCursor = Tuple[int, int, int]
+
+
+def _into_channel_operation(
+    content: NbeContent, *, slot: int, transaction_id: int, operation_index: int
+) -> Option[ChannelOperation]:
+    position = {"slot": slot, "transaction_id": transaction_id, "operation_index": operation_index}
+    match content:
+        case ChannelInscribe():
+            return Some(
+                ChannelOperation(
+                    channel_id=content.channel_id,
+                    type=content.type,
+                    parent=content.parent,
+                    signer=content.signer,
+                    **position,
+                )
+            )
+        case ChannelBlob():
+            return Some(
+                ChannelOperation(
+                    channel_id=content.channel,
+                    type=content.type,
+                    parent=content.parent,
+                    signer=content.signer,
+                    blob_size=content.blob_size,
+                    **position,
+                )
+            )
+        case ChannelSetKeys():
+            return Some(ChannelOperation(channel_id=content.channel, type=content.type, **position))
+        case _:
+            return Empty()
+
+
+class ChannelRepository(Indexer):
+    """
+    Index of the operations of each channel, maintained at ingestion time.
+    """
+
+    def __init__(self, client: DbClient):
+        self.client = client
+
+    def index(self, session: Session, blocks: Sequence[Block]) -> None:
+        entries: List[ChannelOperation] = []
+        for block in blocks:
+            for transaction in block.transactions:
+                operations: List[Operation] = transaction.operations
+                for operation_index, operation in enumerate(operations):
+                    entry = _into_channel_operation(
+                        operation.content,
+                        slot=block.slot,
+                        transaction_id=transaction.id,
+                        operation_index=operation_index,
+                    )
+                    if entry.is_some:
+                        entries.append(entry.unwrap())
+        if not entries:
+            return
+
+        session.add_all(entries)
+
+        entries_by_channel: Dict[bytes, List[ChannelOperation]] = defaultdict(list)
+        for entry in entries:
+            entries_by_channel[entry.channel_id].append(entry)
+        for channel_id, channel_entries in entries_by_channel.items():
+            slots = [entry.slot for entry in channel_entries]
+            channel = session.get(Channel, channel_id) or Channel(
+                channel_id=channel_id, operations_count=0, first_slot=min(slots), last_slot=max(slots)
+            )
+            channel.operations_count += len(channel_entries)
+            channel.first_slot = min(channel.first_slot, *slots)
+            channel.last_slot = max(channel.last_slot, *slots)
+            session.add(channel)
+
+    async def get_by_id(self, channel_id: bytes) -> Option[Channel]:
+        with self.client.session() as session:
+            if (channel := session.get(Channel, channel_id)) is not None:
+                return Some(channel)
+            else:
+                return Empty()
+
+    async def get_operating_transaction_ids(self, channel_id: bytes, transaction_ids: Sequence[int]) -> Set[int]:
+        """
+        Which of `transaction_ids` operate on the channel.
+        """
+        if not transaction_ids:
+            return set()
+        statement = select(ChannelOperation.transaction_id).where(
+            ChannelOperation.channel_id == channel_id, ChannelOperation.transaction_id.in_(transaction_ids)
+        )
+        with self.client.session() as session:
+            return set(session.exec(statement).all())
+
+    async def get_operations_page(
+        self,
+        channel_id: bytes,
+        limit: int,
+        *,
+        cursor: Option[ChannelOperationCursor] = Empty(),
+        newer: bool = False,
+    ) -> List[ChannelOperation]:
+        statement = select(ChannelOperation).where(ChannelOperation.channel_id == channel_id)
+        statement = keyset(
+            statement,
+            (ChannelOperation.slot, ChannelOperation.transaction_id, ChannelOperation.operation_index),
+            cursor,
+            newer=newer,
+        )
+
+        with self.client.session() as session:
+            return session.exec(statement.limit(limit)).all()
@@ -0,0 +1,165 @@
+import logging
+from asyncio import to_thread
+from compression.zstd import ZstdError
+from time import perf_counter
+from typing import Dict, List
+
+from rusty_results import Empty, Option, Some
+from sqlalchemy import Column, func, type_coerce
+from sqlalchemy.types import NullType
+from sqlmodel import SQLModel, select
+
+from core import compression
+from core.sqlmodel import PydanticJsonColumn
+from db.clients import DbClient
+from models.compression import CompressionDictionary
+
+logger = logging.getLogger(__name__)
+
+# Rows a column needs before its first dictionary is trained
+MIN_TRAINING_ROWS = 1000
+# Latest rows a dictionary is trained from
+TRAINING_ROWS = 10_000
+# Latest rows compression stats are measured on
+STATS_ROWS = 1000
+
+
+def get_compressed_columns() -> Dict[str, Column]:
+    """
+    Columns storing compressed values, by the name they compress under. None unless column compression is enabled.
+    """
+    return {
+        column.type.compression: column
+        for table in SQLModel.metadata.sorted_tables
+        for column in table.columns
+        if isinstance(column.type, PydanticJsonColumn) and column.type.is_compressed
+    }
+
+
+class CompressionRepository:
+    """
+    Persists the dictionaries of compressed columns, and retrains them as rows accumulate.
+    """
+
+    def __init__(self, client: DbClient, *, retrain_rows: int):
+        self.client = client
+        self.retrain_rows = retrain_rows
+
+    async def load(self) -> None:
+        """
+        Registers every stored dictionary. Must run before compressed columns are read or written.
+        """
+        with self.client.session() as session:
+            dictionaries = session.exec(select(CompressionDictionary).order_by(CompressionDictionary.id)).all()
+            for dictionary in dictionaries:
+                compression.register(dictionary.name, dictionary.id, dictionary.content)
+        logger.debug(f"Loaded {len(dictionaries)} compression dictionaries.")
+
+    async def train_due(self) -> List[str]:
+        """
+        Trains a new dictionary for each column that has none yet, or has had `retrain_rows` rows written since its
+        latest one. Returns the names of the retrained columns.
+        Training takes seconds on large tables, so it runs in a worker thread rather than blocking the event loop.
+        """
+        return await to_thread(self._train_due)
+
+    async def train(self, name: str) -> Option[CompressionDictionary]:
+        """
+        Trains a dictionary out of the column's latest rows, and makes it the one new values are compressed with.
+        Values written until then keep being decompressed with the dictionary they were written with.
+        """
+        return await to_thread(self._train, name)
+
+    def _train_due(self) -> List[str]:
+        trained = []
+        for name, column in get_compressed_columns().items():
+            latest = self._get_latest(name)
+            last_row_id = latest.map(lambda dictionary: dictionary.last_row_id).unwrap_or(0)
+            required_rows = self.retrain_rows if latest.is_some else MIN_TRAINING_ROWS
+            if self._count_rows_after(column, last_row_id) < required_rows:
+                continue
+            if self._train(name).is_some:
+                trained.append(name)
+        return trained
+
+    def _train(self, name: str) -> Option[CompressionDictionary]:
+        column = get_compressed_columns()[name]
+        row_id_column = self._get_row_id_column(column)
+        with self.client.session() as session:
+            statement = (
+                select(row_id_column, type_coerce(column, NullType()))
+                .order_by(row_id_column.desc())
+                .limit(TRAINING_ROWS)
+            )
+            rows = session.exec(statement).all()
+            if len(rows) < MIN_TRAINING_ROWS:
+                return Empty()
+
+            # Trained on the values as compressed, i.e.: after offloading
+            samples = [compression.encode(column.type.load_stored(value)) for _, value in rows]
+            try:
+                content = compression.train(samples)
+            except ZstdError as error:
+                logger.warning(f"Could not train a compression dictionary for {name}: {error}")
+                return Empty()
+
+            dictionary = CompressionDictionary(
+                name=name, content=content, samples_count=len(samples), last_row_id=rows[0][0]
+            )
+            session.add(dictionary)
+            session.commit()
+            session.refresh(dictionary)
+
+        compression.register(name, dictionary.id, dictionary.content)
+        logger.info(f"Trained compression dictionary {dictionary.id} for {name} out of {len(samples)} rows.")
+        return Some(dictionary)
+
+    async def get_latest(self, name: str) -> Option[CompressionDictionary]:
+        return self._get_latest(name)
+
+    def _get_latest(self, name: str) -> Option[CompressionDictionary]:
+        with self.client.session() as session:
+            statement = (
+                select(CompressionDictionary)
+                .where(CompressionDictionary.name == name)
+                .order_by(CompressionDictionary.id.desc())
+                .limit(1)
+            )
+            dictionary = session.exec(statement).first()
+            return Some(dictionary) if dictionary is not None else Empty()
+
+    async def get_stats(self) -> Dict[str, Dict[str, int | float]]:
+        """
+        Size reduction and decoding throughput of each compressed column, measured on its latest rows.
+        """
+        stats = {}
+        for name, column in get_compressed_columns().items():
+            row_id_column = self._get_row_id_column(column)
+            with self.client.session() as session:
+                statement = select(type_coerce(column, NullType())).order_by(row_id_column.desc()).limit(STATS_ROWS)
+                values = [value for value in session.exec(statement).all() if isinstance(value, bytes)]
+
+            start = perf_counter()
+            plain_bytes = sum(len(compression.decompress_bytes(name, value)) for value in values)
+            elapsed = perf_counter() - start
+            stored_bytes = sum(len(value) for value in values)
+            stats[name] = {
+                "dictionary_version": compression.get_current_version(name),
+                "rows": len(values),
+                "plain_bytes": plain_bytes,
+                "stored_bytes": stored_bytes,
+                "ratio": plain_bytes / stored_bytes if stored_bytes else 1.0,
+                "decode_bytes_per_second": plain_bytes / elapsed if elapsed else 0.0,
+            }
+        return stats
+
+    def _count_rows_after(self, column: Column, row_id: int) -> int:
+        row_id_column = self._get_row_id_column(column)
+        with self.client.session() as session:
+            statement = select(func.count()).select_from(column.table).where(row_id_column > row_id)
+            return session.exec(statement).one()
+
+    @staticmethod
+    def _get_row_id_column(column: Column) -> Column:
+        (row_id_column,) = column.table.primary_key.columns
+        return row_id_column
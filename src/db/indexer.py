@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+from sqlmodel import Session
+
+from models.block import Block
+
+
+class Indexer(ABC):
+    """
+    Maintains derived tables out of ingested blocks.
+
+    Indexers run inside the ingestion transaction, after the blocks have been flushed (so ids are assigned) and before
+    they are committed, so indexes are never out of sync with the blocks they derive from.
+    They work on the in-memory blocks, since some of their data (e.g. operation contents' specific fields) does not
+    survive the round trip through the JSON columns.
+    """
+
+    @abstractmethod
+    def index(self, session: Session, blocks: Sequence[Block]) -> None:
+        pass
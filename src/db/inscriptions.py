@@ -0,0 +1,115 @@
+import unicodedata
+from typing import List, NamedTuple, Sequence
+
+from rusty_results import Empty, Option, Some
+from sqlalchemy import insert, literal_column
+from sqlmodel import Session, select
+
+from db.clients import DbClient
+from db.indexer import Indexer
+from models.block import Block
+from models.inscription import INSCRIPTION_FTS_TABLE_NAME, inscription_fts
+from models.transactions.operations.contents import ChannelInscribe
+from models.transactions.operations.operation import Operation
+
+# Deepest ranked result reachable through pagination: Ranking costs the same for every page, but deep pages are hardly
+# ever relevant, and they are the ones scrapers would abuse
+MAX_SEARCH_OFFSET = 1000
+# Matches ranked per query, the latest ones
+MAX_RANKED_CANDIDATES = 10_000
+
+
+class InscriptionMatch(NamedTuple):
+    channel_id: bytes
+    slot: int
+    transaction_id: int
+    operation_index: int
+    text: str
+    score: float
+
+
+def decode_inscription_text(inscription: bytes) -> Option[str]:
+    """
+    Returns the inscription as text if it is valid UTF-8 without control characters (besides whitespace), which tells
+    text apart from binary payloads.
+    """
+    try:
+        text = inscription.decode("utf-8")
+    except UnicodeDecodeError:
+        return Empty()
+    if not text.strip():
+        return Empty()
+    if any(unicodedata.category(character) == "Cc" and character not in "\t\n\r" for character in text):
+        return Empty()
+    return Some(text)
+
+
+def into_match_query(query: str) -> Option[str]:
+    """
+    Turns user input into an FTS5 query matching every term literally, so FTS5 operators and syntax errors cannot be
+    injected. A trailing `*` keeps a term as a prefix.
+    """
+    terms: List[str] = []
+    for term in query.split():
+        is_prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if term:
+            terms.append('"' + term.replace('"', '""') + '"' + ("*" if is_prefix else ""))
+    return Some(" ".join(terms)) if terms else Empty()
+
+
+class InscriptionRepository(Indexer):
+    """
+    Full-text index of the `ChannelInscribe` inscriptions that are text, maintained at ingestion time.
+    """
+
+    def __init__(self, client: DbClient):
+        self.client = client
+
+    def index(self, session: Session, blocks: Sequence[Block]) -> None:
+        rows = []
+        for block in blocks:
+            for transaction in block.transactions:
+                operations: List[Operation] = transaction.operations
+                for operation_index, operation in enumerate(operations):
+                    if not isinstance(operation.content, ChannelInscribe):
+                        continue
+                    text = decode_inscription_text(operation.content.inscription)
+                    if text.is_some:
+                        rows.append(
+                            {
+                                "text": text.unwrap(),
+                                "channel_id": operation.content.channel_id,
+                                "slot": block.slot,
+                                "transaction_id": transaction.id,
+                                "operation_index": operation_index,
+                            }
+                        )
+        if rows:
+            session.exec(insert(inscription_fts).values(rows))
+
+    async def search(self, match_query: str, limit: int, *, offset: int = 0) -> List[InscriptionMatch]:
+        """
+        Returns the inscriptions matching `match_query`, best first, as ranked by BM25.
+        Only the latest `MAX_RANKED_CANDIDATES` matches are ranked: FTS5 yields them in insertion order and stops there,
+        which bounds the cost of terms present in millions of inscriptions. Rarer terms are ranked exhaustively.
+        """
+        candidates = (
+            select(
+                inscription_fts.c.channel_id,
+                inscription_fts.c.slot,
+                inscription_fts.c.transaction_id,
+                inscription_fts.c.operation_index,
+                inscription_fts.c.text,
+                literal_column("rank").label("rank"),
+            )
+            .where(literal_column(INSCRIPTION_FTS_TABLE_NAME).op("MATCH")(match_query))
+            .order_by(inscription_fts.c.rowid.desc())
+            .limit(MAX_RANKED_CANDIDATES)
+            .subquery()
+        )
+        statement = select(*candidates.c).order_by(candidates.c.rank).limit(limit).offset(offset)
+
+        with self.client.session() as session:
+            # BM25 scores are negative, lower being better: They are flipped, so a higher score is a better match
+            return [InscriptionMatch(*row[:5], score=-row[5]) for row in session.exec(statement).all()]
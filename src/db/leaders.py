@@ -0,0 +1,87 @@
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+from rusty_results import Empty, Option, Some
+from sqlmodel import Session, select
+
+from core.db import keyset
+from db.clients import DbClient
+from db.indexer import Indexer
+from models.block import Block
+from models.leader import Leader, LeaderEpoch
+
+# (last slot, id) of the last delivered Leader
+LeaderCursor = Tuple[int, int]
+# (epoch,) of the last delivered LeaderEpoch
+LeaderEpochCursor = Tuple[int]
+
+
+class LeaderRepository(Indexer):
+    """
+    Index of the blocks produced by each leader, maintained at ingestion time.
+    Every block updates a fixed number of rows (its leader's aggregates and epoch bucket), regardless of the chain's
+    length.
+    """
+
+    def __init__(self, client: DbClient, *, epoch_length_slots: int):
+        self.client = client
+        self.epoch_length_slots = epoch_length_slots
+
+    def index(self, session: Session, blocks: Sequence[Block]) -> None:
+        slots_by_leader_key: Dict[bytes, List[int]] = defaultdict(list)
+        for block in blocks:
+            slots_by_leader_key[block.proof_of_leadership.leader_key].append(block.slot)
+
+        statement = select(Leader).where(Leader.leader_key.in_(slots_by_leader_key.keys()))
+        leaders: Dict[bytes, Leader] = {leader.leader_key: leader for leader in session.exec(statement).all()}
+        for leader_key, slots in slots_by_leader_key.items():
+            leader = leaders.setdefault(
+                leader_key, Leader(leader_key=leader_key, blocks_count=0, first_slot=min(slots), last_slot=max(slots))
+            )
+            leader.blocks_count += len(slots)
+            leader.first_slot = min(leader.first_slot, *slots)
+            leader.last_slot = max(leader.last_slot, *slots)
+            session.add(leader)
+        # New leaders need their ids for the epoch buckets
+        session.flush()
+
+        for leader_key, slots in slots_by_leader_key.items():
+            leader_id = leaders[leader_key].id
+            blocks_by_epoch: Dict[int, int] = defaultdict(int)
+            for slot in slots:
+                blocks_by_epoch[slot // self.epoch_length_slots] += 1
+            for epoch, blocks_count in blocks_by_epoch.items():
+                leader_epoch = session.get(LeaderEpoch, (leader_id, epoch)) or LeaderEpoch(
+                    leader_id=leader_id, epoch=epoch, blocks_count=0
+                )
+                leader_epoch.blocks_count += blocks_count
+                session.add(leader_epoch)
+
+    async def get_by_leader_key(self, leader_key: bytes) -> Option[Leader]:
+        statement = select(Leader).where(Leader.leader_key == leader_key)
+
+        with self.client.session() as session:
+            if (leader := session.exec(statement).one_or_none()) is not None:
+                return Some(leader)
+            else:
+                return Empty()
+
+    async def get_epochs_page(
+        self, leader_id: int, limit: int, *, cursor: Option[LeaderEpochCursor] = Empty(), newer: bool = False
+    ) -> List[LeaderEpoch]:
+        statement = select(LeaderEpoch).where(LeaderEpoch.leader_id == leader_id)
+        statement = keyset(statement, (LeaderEpoch.epoch,), cursor, newer=newer)
+
+        with self.client.session() as session:
+            return session.exec(statement.limit(limit)).all()
+
+    async def get_page(
+        self, limit: int, *, cursor: Option[LeaderCursor] = Empty(), newer: bool = False
+    ) -> List[Leader]:
+        """
+        Keyset pagination over (last slot, id), most recently active leaders first.
+        """
+        statement = keyset(select(Leader), (Leader.last_slot, Leader.id), cursor, newer=newer)
+
+        with self.client.session() as session:
+            return session.exec(statement.limit(limit)).all()
@@ -0,0 +1,76 @@
+from typing import Literal, Sequence, Tuple
+
+from rusty_results import Option
+from sqlalchemy import ColumnElement, Subquery
+from sqlmodel import Session, select
+
+from core.db import keyset
+from db.clients import DbClient
+from db.indexer import Indexer
+from models.block import Block
+from models.operation import TransactionOperation
+from models.transactions.operations.contents import ContentType
+
+OperationKeyColumn = Literal["slot", "block_id", "transaction_id"]
+
+
+class OperationRepository(Indexer):
+    """
+    Index of every Transaction's operations by type, maintained at ingestion time.
+    Blocks and Transactions are filtered by operation type through it, instead of decoding their operations.
+    """
+
+    def __init__(self, client: DbClient):
+        self.client = client
+
+    def index(self, session: Session, blocks: Sequence[Block]) -> None:
+        session.add_all(
+            TransactionOperation(
+                transaction_id=transaction.id,
+                operation_index=operation_index,
+                block_id=block.id,
+                slot=block.slot,
+                type=operation.content.type,
+            )
+            for block in blocks
+            for transaction in block.transactions
+            for operation_index, operation in enumerate(transaction.operations)
+        )
+
+
+def get_page_keys(
+    operation_type: ContentType,
+    key_columns: Sequence[OperationKeyColumn],
+    limit: int,
+    *,
+    cursor: Option[Tuple[int, ...]],
+    newer: bool,
+    before_slot: Option[int],
+    after_slot: Option[int],
+) -> Subquery:
+    """
+    Keyset page of the distinct `key_columns` of the operations of type `operation_type`.
+    It seeks the (type, slot, block id, transaction id) index, so a filtered page costs the same as an unfiltered one
+    regardless of how rare the operation type is.
+    """
+    columns = [getattr(TransactionOperation, column) for column in key_columns]
+    statement = select(*columns).where(TransactionOperation.type == operation_type).distinct()
+    if before_slot.is_some:
+        statement = statement.where(TransactionOperation.slot < before_slot.unwrap())
+    if after_slot.is_some:
+        statement = statement.where(TransactionOperation.slot > after_slot.unwrap())
+    return keyset(statement, columns, cursor, newer=newer).limit(limit).subquery()
+
+
+def has_operation_type(
+    column: ColumnElement[int], key_column: OperationKeyColumn, operation_type: ContentType, *, from_slot: int
+) -> ColumnElement[bool]:
+    """
+    Keeps the rows whose `column` matches the `key_column` of an operation of type `operation_type` at or past
+    `from_slot`. Meant for polling updates, where the slot bound keeps the index range small.
+    """
+    return column.in_(
+        select(getattr(TransactionOperation, key_column)).where(
+            TransactionOperation.type == operation_type, TransactionOperation.slot >= from_slot
+        )
+    )
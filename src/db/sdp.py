@@ -0,0 +1,144 @@
+from hashlib import blake2b
+from typing import Dict, List, Sequence, Tuple
+
+from rusty_results import Empty, Option, Some
+from sqlmodel import Session, select
+
+from core.db import keyset
+from db.clients import DbClient
+from db.indexer import Indexer
+from models.block import Block
+from models.sdp import SdpDeclaration, SdpDeclarationStatus
+from models.transactions.operations.contents import (
+    SDPActive,
+    SDPDeclare,
+    SDPDeclareServiceType,
+    SDPWithdraw,
+)
+from models.transactions.operations.operation import Operation
+
+# (id,) of the last delivered SdpDeclaration
+SdpDeclarationCursor = Tuple[int]
+
+SdpContent = SDPDeclare | SDPActive | SDPWithdraw
+
+
+def get_declaration_id(declaration: SDPDeclare) -> bytes:
+    """
+    As defined by the Service Declaration Protocol: `Hash(service_type || provider_id || zk_id || locators)`.
+    `SDPActive` and `SDPWithdraw` reference their declaration by it.
+    """
+    hasher = blake2b(digest_size=32)
+    hasher.update(declaration.service_type.value.encode("utf-8"))
+    hasher.update(declaration.provider_id)
+    hasher.update(declaration.zk_id)
+    for locator in declaration.locators:
+        hasher.update(locator)
+    return hasher.digest()
+
+
+def _get_referenced_declaration_id(content: SdpContent) -> bytes:
+    match content:
+        case SDPDeclare():
+            return get_declaration_id(content)
+        case SDPActive() | SDPWithdraw():
+            return content.declaration_id
+
+
+def _apply(declaration: SdpDeclaration, content: SdpContent, slot: int) -> None:
+    """
+    Folds an operation into its declaration's state. Each field keeps the latest value by slot, so the result does not
+    depend on the order in which blocks are ingested.
+    """
+    match content:
+        case SDPDeclare():
+            declaration.service_type = content.service_type
+            declaration.provider_id = content.provider_id
+            declaration.zk_id = content.zk_id
+            declaration.locked_note_id = content.locked_note_id
+            declaration.locators = [locator.hex() for locator in content.locators]
+            declaration.declared_slot = slot
+        case SDPActive():
+            if declaration.last_active_slot is None or declaration.last_active_slot <= slot:
+                declaration.last_active_slot = slot
+                declaration.last_active_nonce = content.nonce
+        case SDPWithdraw():
+            if declaration.withdrawn_slot is None or declaration.withdrawn_slot <= slot:
+                declaration.withdrawn_slot = slot
+                declaration.withdrawn_nonce = content.nonce
+
+    if declaration.withdrawn_slot is not None:
+        declaration.status = SdpDeclarationStatus.WITHDRAWN
+    elif declaration.last_active_slot is not None:
+        declaration.status = SdpDeclarationStatus.ACTIVE
+    else:
+        declaration.status = SdpDeclarationStatus.DECLARED
+
+
+class SdpRepository(Indexer):
+    """
+    Current state of every service declaration, maintained at ingestion time from the SDP operations.
+    """
+
+    def __init__(self, client: DbClient):
+        self.client = client
+
+    def index(self, session: Session, blocks: Sequence[Block]) -> None:
+        events: List[Tuple[bytes, SdpContent, int]] = []
+        for block in blocks:
+            for transaction in block.transactions:
+                operations: List[Operation] = transaction.operations
+                for operation in operations:
+                    if isinstance(operation.content, (SDPDeclare, SDPActive, SDPWithdraw)):
+                        content = operation.content
+                        events.append((_get_referenced_declaration_id(content), content, block.slot))
+        if not events:
+            return
+
+        declaration_ids = {declaration_id for declaration_id, _, _ in events}
+        statement = select(SdpDeclaration).where(SdpDeclaration.declaration_id.in_(declaration_ids))
+        declarations: Dict[bytes, SdpDeclaration] = {
+            declaration.declaration_id: declaration for declaration in session.exec(statement).all()
+        }
+        for declaration_id, content, slot in events:
+            declaration = declarations.get(declaration_id)
+            if declaration is None:
+                declaration = SdpDeclaration(declaration_id=declaration_id, status=SdpDeclarationStatus.DECLARED)
+                declarations[declaration_id] = declaration
+            _apply(declaration, content, slot)
+        session.add_all(declarations.values())
+
+    async def get_by_declaration_id(self, declaration_id: bytes) -> Option[SdpDeclaration]:
+        statement = select(SdpDeclaration).where(SdpDeclaration.declaration_id == declaration_id)
+
+        with self.client.session() as session:
+            if (declaration := session.exec(statement).one_or_none()) is not None:
+                return Some(declaration)
+            else:
+                return Empty()
+
+    async def get_page(
+        self,
+        limit: int,
+        *,
+        cursor: Option[SdpDeclarationCursor] = Empty(),
+        newer: bool = False,
+        status: Option[SdpDeclarationStatus] = Empty(),
+        service_type: Option[SDPDeclareServiceType] = Empty(),
+        provider_id: Option[bytes] = Empty(),
+    ) -> List[SdpDeclaration]:
+        """
+        Keyset pagination over id, most recently indexed first. Each filter seeks its own (filter, id) index, so pages
+        cost the same regardless of the number of declarations or of the operations that built them.
+        """
+        statement = select(SdpDeclaration)
+        if status.is_some:
+            statement = statement.where(SdpDeclaration.status == status.unwrap())
+        if service_type.is_some:
+            statement = statement.where(SdpDeclaration.service_type == service_type.unwrap())
+        if provider_id.is_some:
+            statement = statement.where(SdpDeclaration.provider_id == provider_id.unwrap())
+        statement = keyset(statement, (SdpDeclaration.id,), cursor, newer=newer)
+
+        with self.client.session() as session:
+            return session.exec(statement.limit(limit)).all()
@@ -0,0 +1,179 @@
+from asyncio import sleep
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from rusty_results import Empty, Option
+from sqlalchemy import delete, func
+from sqlmodel import Session, select
+
+from core.sketch import QuantileSketch
+from db.clients import DbClient
+from db.indexer import Indexer
+from models.block import Block
+from models.channel import ChannelOperation
+from models.series import SeriesBucket, SeriesMetric
+from models.transactions.operations.contents import ChannelBlob, ContentType
+from models.transactions.operations.operation import Operation
+from models.transactions.transaction import Transaction
+
+# Bucket sizes, in slots, every metric is rolled up at
+SERIES_RESOLUTIONS = (10, 100, 1000)
+# Slots rebuilt per backfilling step. A multiple of every resolution, so buckets are always rebuilt whole
+BACKFILL_CHUNK_SLOTS = 10 * max(SERIES_RESOLUTIONS)
+
+# (metric, slot, value)
+Sample = Tuple[SeriesMetric, int, int]
+# (metric, resolution, start slot)
+SeriesBucketKey = Tuple[SeriesMetric, int, int]
+
+
+def _get_block_samples(block: Block) -> Iterator[Sample]:
+    yield SeriesMetric.TRANSACTIONS, block.slot, len(block.transactions)
+    for transaction in block.transactions:
+        yield SeriesMetric.EXECUTION_GAS_PRICE, block.slot, transaction.execution_gas_price
+        yield SeriesMetric.STORAGE_GAS_PRICE, block.slot, transaction.storage_gas_price
+        operations: List[Operation] = transaction.operations
+        for operation in operations:
+            if isinstance(operation.content, ChannelBlob):
+                yield SeriesMetric.BLOB_BYTES, block.slot, operation.content.blob_size
+
+
+class _Rollups:
+    """
+    Buckets touched by a batch of samples: Each is loaded (or created) once, updated in memory, and written back once.
+    """
+
+    def __init__(self, session: Session, *, load_existing: bool):
+        self.session = session
+        self.load_existing = load_existing
+        self._buckets: Dict[SeriesBucketKey, SeriesBucket] = {}
+        self._sketches: Dict[SeriesBucketKey, QuantileSketch] = {}
+
+    def add(self, metric: SeriesMetric, slot: int, value: int) -> None:
+        for resolution in SERIES_RESOLUTIONS:
+            key = (metric, resolution, slot - slot % resolution)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._load(key) or SeriesBucket(
+                    metric=metric, resolution=resolution, start_slot=key[2], count=0, min=value, max=value, sum=0
+                )
+                self._buckets[key] = bucket
+                self._sketches[key] = QuantileSketch.from_json(bucket.sketch)
+
+            bucket.count += 1
+            bucket.min = min(bucket.min, value)
+            bucket.max = max(bucket.max, value)
+            bucket.sum += value
+            self._sketches[key].add(value)
+
+    def write(self) -> None:
+        for key, bucket in self._buckets.items():
+            # Reassigned, since in-place mutations of JSON columns are not tracked
+            bucket.sketch = self._sketches[key].to_json()
+        self.session.add_all(self._buckets.values())
+
+    def _load(self, key: SeriesBucketKey) -> SeriesBucket | None:
+        return self.session.get(SeriesBucket, key) if self.load_existing else None
+
+
+class SeriesRepository(Indexer):
+    """
+    Multi-resolution rollups of per-transaction and per-block metrics, to chart them without reading their raw rows.
+    Buckets are updated incrementally at ingestion time; `backfill` rebuilds them for blocks ingested before the series
+    existed.
+    """
+
+    def __init__(self, client: DbClient):
+        self.client = client
+
+    def index(self, session: Session, blocks: Sequence[Block]) -> None:
+        rollups = _Rollups(session, load_existing=True)
+        for block in blocks:
+            for metric, slot, value in _get_block_samples(block):
+                rollups.add(metric, slot, value)
+        rollups.write()
+
+    async def is_empty(self) -> bool:
+        with self.client.session() as session:
+            return session.exec(select(SeriesBucket.start_slot).limit(1)).first() is None
+
+    async def backfill(self) -> None:
+        """
+        Rebuilds every bucket out of the stored blocks, one chunk of slots at a time.
+        Each chunk reads only the columns it needs, and is rebuilt and committed in a single synchronous step, so
+        ingestion cannot interleave with it: Blocks ingested meanwhile are either part of the rebuild or indexed after
+        it, but never counted twice.
+        """
+        with self.client.session() as session:
+            first_slot, last_slot = session.exec(select(func.min(Block.slot), func.max(Block.slot))).one()
+        if first_slot is None:
+            return
+
+        start_slot = first_slot - first_slot % BACKFILL_CHUNK_SLOTS
+        while start_slot <= last_slot:
+            with self.client.session() as session:
+                self._rebuild(session, start_slot, start_slot + BACKFILL_CHUNK_SLOTS)
+                session.commit()
+            start_slot += BACKFILL_CHUNK_SLOTS
+            # Let ingestion and requests through between chunks
+            await sleep(0)
+
+    @staticmethod
+    def _rebuild(session: Session, start_slot: int, end_slot: int) -> None:
+        session.exec(
+            delete(SeriesBucket).where(SeriesBucket.start_slot >= start_slot, SeriesBucket.start_slot < end_slot)
+        )
+        rollups = _Rollups(session, load_existing=False)
+
+        gas_prices = select(Block.slot, Transaction.execution_gas_price, Transaction.storage_gas_price).join(
+            Block, Transaction.block_id == Block.id
+        )
+        for slot, execution_gas_price, storage_gas_price in session.exec(
+            gas_prices.where(Block.slot >= start_slot, Block.slot < end_slot)
+        ):
+            rollups.add(SeriesMetric.EXECUTION_GAS_PRICE, slot, execution_gas_price)
+            rollups.add(SeriesMetric.STORAGE_GAS_PRICE, slot, storage_gas_price)
+
+        transactions_counts = (
+            select(Block.slot, func.count(Transaction.id))
+            .outerjoin(Transaction, Transaction.block_id == Block.id)
+            .group_by(Block.id)
+        )
+        for slot, transactions_count in session.exec(
+            transactions_counts.where(Block.slot >= start_slot, Block.slot < end_slot)
+        ):
+            rollups.add(SeriesMetric.TRANSACTIONS, slot, transactions_count)
+
+        # Blob sizes do not survive the operations' JSON column, but the channels index keeps them
+        blob_sizes = select(ChannelOperation.slot, ChannelOperation.blob_size).where(
+            ChannelOperation.type == ContentType.CHANNEL_BLOB
+        )
+        for slot, blob_size in session.exec(
+            blob_sizes.where(ChannelOperation.slot >= start_slot, ChannelOperation.slot < end_slot)
+        ):
+            rollups.add(SeriesMetric.BLOB_BYTES, slot, blob_size)
+
+        rollups.write()
+
+    async def get_buckets(
+        self,
+        metric: SeriesMetric,
+        resolution: int,
+        limit: int,
+        *,
+        from_slot: Option[int] = Empty(),
+        to_slot: Option[int] = Empty(),
+    ) -> List[SeriesBucket]:
+        """
+        Returns up to the latest `limit` buckets overlapping [`from_slot`, `to_slot`], in ascending order.
+        """
+        statement = select(SeriesBucket).where(SeriesBucket.metric == metric, SeriesBucket.resolution == resolution)
+        if from_slot.is_some:
+            statement = statement.where(SeriesBucket.start_slot > from_slot.unwrap() - resolution)
+        if to_slot.is_some:
+            statement = statement.where(SeriesBucket.start_slot <= to_slot.unwrap())
+        statement = statement.order_by(SeriesBucket.start_slot.desc()).limit(limit)
+
+        with self.client.session() as session:
+            buckets: List[SeriesBucket] = session.exec(statement).all()
+        buckets.reverse()
+        return buckets
@@ -0,0 +1,166 @@
+from asyncio import sleep
+from collections import Counter
+from typing import AsyncIterator, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func
+from sqlmodel import Session, select
+
+from db.clients import DbClient
+from db.indexer import Indexer
+from models.block import Block
+from models.stats import ChainStats, SlotStats
+from models.transactions.transaction import Transaction
+
+CHAIN_STATS_ID = 1
+# Transactions decoded at once while counting the operations of an existing chain
+BACKFILL_BATCH_SIZE = 1000
+# Sizes, in slots, of the windows over the latest slots to compute the transactions rate over
+TRANSACTIONS_PER_SLOT_WINDOWS = (10, 100, 1000)
+
+# Chain stats, and the transactions count in each window of `TRANSACTIONS_PER_SLOT_WINDOWS`
+Stats = Tuple[ChainStats, Dict[int, int]]
+
+
+def _min(current: Optional[int], value: int) -> int:
+    return value if current is None else min(current, value)
+
+
+def _max(current: Optional[int], value: int) -> int:
+    return value if current is None else max(current, value)
+
+
+class StatsRepository(Indexer):
+    """
+    Chain-wide statistics, maintained at ingestion time so reading them costs the same regardless of the chain's
+    length: A single row of counters, plus per-slot counters whose latest slots are summed for the rates.
+    """
+
+    def __init__(self, client: DbClient):
+        self.client = client
+
+    def index(self, session: Session, blocks: Sequence[Block]) -> None:
+        chain_stats = session.get(ChainStats, CHAIN_STATS_ID) or ChainStats(id=CHAIN_STATS_ID)
+        operations_count = Counter(chain_stats.operations_count)
+        slot_counts: Dict[int, Tuple[int, int]] = {}
+
+        for block in blocks:
+            chain_stats.blocks_count += 1
+            chain_stats.last_slot = _max(chain_stats.last_slot, block.slot)
+            blocks_count, transactions_count = slot_counts.get(block.slot, (0, 0))
+            slot_counts[block.slot] = (blocks_count + 1, transactions_count + len(block.transactions))
+
+            for transaction in block.transactions:
+                chain_stats.transactions_count += 1
+                chain_stats.execution_gas_price_min = _min(
+                    chain_stats.execution_gas_price_min, transaction.execution_gas_price
+                )
+                chain_stats.execution_gas_price_max = _max(
+                    chain_stats.execution_gas_price_max, transaction.execution_gas_price
+                )
+                chain_stats.execution_gas_price_sum += transaction.execution_gas_price
+                chain_stats.storage_gas_price_min = _min(
+                    chain_stats.storage_gas_price_min, transaction.storage_gas_price
+                )
+                chain_stats.storage_gas_price_max = _max(
+                    chain_stats.storage_gas_price_max, transaction.storage_gas_price
+                )
+                chain_stats.storage_gas_price_sum += transaction.storage_gas_price
+                operations_count.update(operation.content.type.value for operation in transaction.operations)
+
+        # Reassigned, since in-place mutations of JSON columns are not tracked
+        chain_stats.operations_count = dict(operations_count)
+        session.add(chain_stats)
+
+        for slot, (blocks_count, transactions_count) in slot_counts.items():
+            slot_stats = session.get(SlotStats, slot) or SlotStats(slot=slot, blocks_count=0, transactions_count=0)
+            slot_stats.blocks_count += blocks_count
+            slot_stats.transactions_count += transactions_count
+            session.add(slot_stats)
+
+    async def is_empty(self) -> bool:
+        with self.client.session() as session:
+            return session.get(ChainStats, CHAIN_STATS_ID) is None
+
+    async def backfill(self) -> None:
+        """
+        Seeds the counters out of the blocks stored before they existed, if any, with one aggregate pass.
+        It is a single synchronous step, so it must run before ingestion starts for no block to be counted twice.
+        """
+        with self.client.session() as session:
+            blocks_count, last_slot = session.exec(select(func.count(Block.id), func.max(Block.slot))).one()
+            if blocks_count == 0:
+                return
+
+            gas_prices = session.exec(
+                select(
+                    func.count(Transaction.id),
+                    func.min(Transaction.execution_gas_price),
+                    func.max(Transaction.execution_gas_price),
+                    func.coalesce(func.sum(Transaction.execution_gas_price), 0),
+                    func.min(Transaction.storage_gas_price),
+                    func.max(Transaction.storage_gas_price),
+                    func.coalesce(func.sum(Transaction.storage_gas_price), 0),
+                )
+            ).one()
+            operations_count: Counter[str] = Counter()
+            operations = select(Transaction.operations).execution_options(yield_per=BACKFILL_BATCH_SIZE)
+            for transaction_operations in session.exec(operations):
+                operations_count.update(operation.content.type.value for operation in transaction_operations)
+
+            session.add(
+                ChainStats(
+                    id=CHAIN_STATS_ID,
+                    blocks_count=blocks_count,
+                    transactions_count=gas_prices[0],
+                    operations_count=dict(operations_count),
+                    last_slot=last_slot,
+                    execution_gas_price_min=gas_prices[1],
+                    execution_gas_price_max=gas_prices[2],
+                    execution_gas_price_sum=gas_prices[3],
+                    storage_gas_price_min=gas_prices[4],
+                    storage_gas_price_max=gas_prices[5],
+                    storage_gas_price_sum=gas_prices[6],
+                )
+            )
+
+            session.exec(delete(SlotStats))
+            transactions_by_slot = dict(
+                session.exec(
+                    select(Block.slot, func.count(Transaction.id))
+                    .join(Transaction, Transaction.block_id == Block.id)
+                    .group_by(Block.slot)
+                ).all()
+            )
+            for slot, slot_blocks_count in session.exec(select(Block.slot, func.count(Block.id)).group_by(Block.slot)):
+                session.add(
+                    SlotStats(
+                        slot=slot,
+                        blocks_count=slot_blocks_count,
+                        transactions_count=transactions_by_slot.get(slot, 0),
+                    )
+                )
+            session.commit()
+
+    async def get_stats(self) -> Stats:
+        with self.client.session() as session:
+            chain_stats = session.get(ChainStats, CHAIN_STATS_ID) or ChainStats(id=CHAIN_STATS_ID)
+            transactions_by_window: Dict[int, int] = {}
+            if chain_stats.last_slot is not None:
+                for window in TRANSACTIONS_PER_SLOT_WINDOWS:
+                    statement = select(func.coalesce(func.sum(SlotStats.transactions_count), 0)).where(
+                        SlotStats.slot > chain_stats.last_slot - window
+                    )
+                    transactions_by_window[window] = session.exec(statement).one()
+            return chain_stats, transactions_by_window
+
+    async def updates_stream(self, *, timeout_seconds: int = 1) -> AsyncIterator[Stats]:
+        """
+        Yields the current stats, and then again every time they change.
+        """
+        blocks_count: Optional[int] = None
+        while True:
+            stats = await self.get_stats()
+            if stats[0].blocks_count != blocks_count:
+                blocks_count = stats[0].blocks_count
+                yield stats
+            await sleep(timeout_seconds)
@@ -1,15 +1,35 @@
 import logging
 from asyncio import sleep
-from typing import AsyncIterator, List
+from typing import (
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from rusty_results import Empty, Option, Some
-from sqlalchemy import Result, Select
+from sqlalchemy import Result, Select, func, tuple_
 from sqlalchemy.orm import aliased, selectinload
 from sqlmodel import select
 
+from core.cache import LruCache
+from core.db import keyset, load_only_columns, starts_with_hex
+from db.blocks import BLOCK_KEY_COLUMNS
 from db.clients import DbClient
+from db.operations import get_page_keys, has_operation_type
 from models.block import Block
+from models.transactions.operations.contents import ContentType
 from models.transactions.transaction import Transaction
+from utils.option import into_option
+
+# (slot, block id, id) of the last delivered Transaction
+TransactionCursor = Tuple[int, int, int]
+# Always loaded, even if not requested, since transactions are paginated and streamed by them (and their block's)
+TRANSACTION_KEY_COLUMNS = frozenset(("id", "block_id", "block"))
 
 
 def get_latest_statement(limit: int, *, output_ascending: bool, preload_relationships: bool) -> Select:
@@ -32,16 +52,54 @@ def get_latest_statement(limit: int, *, output_ascending: bool, preload_relation
     return statement
 
 
+def _load_columns(statement: Select, columns: Option[FrozenSet[str]]) -> Select:
+    """
+    Loads the selected transactions along with their block or, with `columns`, only those (and the key) along with
+    their block's key.
+    """
+    if columns.is_empty:
+        return statement.options(selectinload(Transaction.block))
+    return statement.options(
+        *load_only_columns(Transaction, TRANSACTION_KEY_COLUMNS.union(columns.unwrap())),
+        selectinload(Transaction.block).options(*load_only_columns(Block, BLOCK_KEY_COLUMNS)),
+    )
+
+
 class TransactionRepository:
-    def __init__(self, client: DbClient):
+    def __init__(self, client: DbClient, *, cache: Optional[LruCache] = None):
         self.client = client
+        self.cache = cache
 
     async def create(self, *transaction: Transaction) -> None:
         with self.client.session() as session:
             session.add_all(list(transaction))
+            session.flush()
+            cache_keys = [
+                key
+                for _transaction in transaction
+                for key in (("transaction", "id", _transaction.id), ("transaction", "hash", _transaction.hash))
+            ]
             session.commit()
 
-    async def get_by_id(self, transaction_id: int) -> Option[Transaction]:
+        # New rows can only turn cached negative results stale
+        if self.cache is not None:
+            self.cache.invalidate(*cache_keys)
+
+    async def get_by_id(self, transaction_id: int, *, columns: Option[FrozenSet[str]] = Empty()) -> Option[Transaction]:
+        """
+        With `columns`, only those are loaded, unless the transaction is cached. Partially loaded transactions are not
+        cached.
+        """
+        if columns.is_some:
+            key = ("transaction", "id", transaction_id)
+            return await self._get_partial(key, Transaction.id == transaction_id, columns)
+        if self.cache is None:
+            return await self._get_by_id(transaction_id)
+        return await self.cache.get_or_load(
+            ("transaction", "id", transaction_id), lambda: self._get_by_id(transaction_id)
+        )
+
+    async def _get_by_id(self, transaction_id: int) -> Option[Transaction]:
         statement = select(Transaction).where(Transaction.id == transaction_id)
 
         with self.client.session() as session:
@@ -51,7 +109,23 @@ class TransactionRepository:
             else:
                 return Empty()
 
-    async def get_by_hash(self, transaction_hash: str) -> Option[Transaction]:
+    async def get_by_hash(
+        self, transaction_hash: bytes, *, columns: Option[FrozenSet[str]] = Empty()
+    ) -> Option[Transaction]:
+        """
+        With `columns`, only those are loaded, unless the transaction is cached. Partially loaded transactions are not
+        cached.
+        """
+        if columns.is_some:
+            key = ("transaction", "hash", transaction_hash)
+            return await self._get_partial(key, Transaction.hash == transaction_hash, columns)
+        if self.cache is None:
+            return await self._get_by_hash(transaction_hash)
+        return await self.cache.get_or_load(
+            ("transaction", "hash", transaction_hash), lambda: self._get_by_hash(transaction_hash)
+        )
+
+    async def _get_by_hash(self, transaction_hash: bytes) -> Option[Transaction]:
         statement = select(Transaction).where(Transaction.hash == transaction_hash)
 
         with self.client.session() as session:
@@ -61,6 +135,133 @@ class TransactionRepository:
             else:
                 return Empty()
 
+    async def _get_partial(self, key: tuple, condition, columns: Option[FrozenSet[str]]) -> Option[Transaction]:
+        if self.cache is not None and (cached := self.cache.get(key)).is_some:
+            return cached.unwrap()
+        statement = _load_columns(select(Transaction).where(condition), columns)
+
+        with self.client.session() as session:
+            return into_option(session.exec(statement).one_or_none())
+
+    async def get_by_hash_prefix(self, hash_prefix: str, *, limit: int) -> List[Transaction]:
+        """
+        Only the key and hash of the matching transactions, and their block's key (e.g. its slot), are loaded, which is
+        all a search hit shows.
+        """
+        statement = (
+            _load_columns(select(Transaction), Some(frozenset({"hash"})))
+            .where(starts_with_hex(Transaction.hash, hash_prefix))
+            .order_by(Transaction.hash.asc())
+            .limit(limit)
+        )
+
+        with self.client.session() as session:
+            return session.exec(statement).all()
+
+    async def get_by_ids(
+        self, transaction_ids: Sequence[int], *, columns: Option[FrozenSet[str]] = Empty()
+    ) -> List[Option[Transaction]]:
+        """
+        Resolves all ids with a single query, besides the ones already cached. Results follow the order of `transaction_ids`.
+        With `columns`, only those are loaded for the transactions not cached, which are not cached either.
+        """
+        return await self._get_many("id", transaction_ids, columns)
+
+    async def get_by_hashes(
+        self, transaction_hashes: Sequence[bytes], *, columns: Option[FrozenSet[str]] = Empty()
+    ) -> List[Option[Transaction]]:
+        """
+        Resolves all hashes with a single query, besides the ones already cached. Results follow the order of
+        `transaction_hashes`.
+        With `columns`, only those are loaded for the transactions not cached, which are not cached either.
+        """
+        return await self._get_many("hash", transaction_hashes, columns)
+
+    async def _get_many(
+        self, field: Literal["id", "hash"], values: Sequence, columns: Option[FrozenSet[str]]
+    ) -> List[Option[Transaction]]:
+        keys = [("transaction", field, value) for value in values]
+        if columns.is_some:
+            cached: Dict[tuple, Option[Transaction]] = {}
+            if self.cache is not None:
+                for key in keys:
+                    if (hit := self.cache.get(key)).is_some:
+                        cached[key] = hit.unwrap()
+            missed_keys = [key for key in keys if key not in cached]
+            transactions = await self._load_many(field, missed_keys, columns=columns) if missed_keys else {}
+            return [cached[key] if key in cached else into_option(transactions.get(key)) for key in keys]
+        if self.cache is None:
+            transactions = await self._load_many(field, keys)
+            return [into_option(transactions.get(key)) for key in keys]
+        return await self.cache.get_many_or_load(keys, lambda missed_keys: self._load_many(field, missed_keys))
+
+    async def _load_many(
+        self, field: Literal["id", "hash"], keys: Sequence[tuple], *, columns: Option[FrozenSet[str]] = Empty()
+    ) -> Dict[tuple, Transaction]:
+        column = getattr(Transaction, field)
+        statement = select(Transaction).where(column.in_([key[2] for key in keys]))
+        if columns.is_some:
+            statement = _load_columns(statement, columns)
+
+        with self.client.session() as session:
+            transactions: List[Transaction] = session.exec(statement).all()
+        return {("transaction", field, getattr(transaction, field)): transaction for transaction in transactions}
+
+    async def get_block_page(
+        self,
+        block_id: int,
+        limit: int,
+        *,
+        cursor: Option[int] = Empty(),
+        backwards: bool = False,
+        columns: Option[FrozenSet[str]] = Empty(),
+    ) -> List[Transaction]:
+        """
+        Keyset pagination over the transactions of a block, in their order within it (by id), seeking the block's index.
+        Returns up to `limit` transactions after the `cursor` id in ascending order or, if `backwards`, the ones before it
+        in descending order. With `columns`, only those are loaded.
+        """
+        statement = select(Transaction).where(Transaction.block_id == block_id)
+        if columns.is_some:
+            statement = statement.options(
+                *load_only_columns(Transaction, TRANSACTION_KEY_COLUMNS.union(columns.unwrap()))
+            )
+        # All of them share the same block, so only its key is loaded, rather than along with all of its transactions
+        statement = statement.options(
+            selectinload(Transaction.block).options(*load_only_columns(Block, BLOCK_KEY_COLUMNS))
+        )
+        statement = keyset(statement, (Transaction.id,), cursor.map(lambda _cursor: (_cursor,)), newer=not backwards)
+
+        with self.client.session() as session:
+            return session.exec(statement.limit(limit)).all()
+
+    async def iter_block_transactions(
+        self,
+        block_id: int,
+        *,
+        after: Option[int] = Empty(),
+        columns: Option[FrozenSet[str]] = Empty(),
+        batch_size: int = 100,
+    ) -> AsyncIterator[List[Transaction]]:
+        """
+        Yields the transactions of a block after the `after` id, in order, in batches of at most `batch_size`. Each batch
+        is read on its own, so only one is held in memory at once, however many transactions the block has.
+        """
+        cursor = after
+        while True:
+            transactions = await self.get_block_page(block_id, batch_size, cursor=cursor, columns=columns)
+            if transactions:
+                yield transactions
+            if len(transactions) < batch_size:
+                return
+            cursor = Some(transactions[-1].id)
+
+    async def count_by_block_id(self, block_id: int) -> int:
+        statement = select(func.count()).select_from(Transaction).where(Transaction.block_id == block_id)
+
+        with self.client.session() as session:
+            return session.exec(statement).one()
+
     async def get_latest(
         self, limit: int, *, ascending: bool = False, preload_relationships: bool = False
     ) -> List[Transaction]:
@@ -73,33 +274,103 @@ class TransactionRepository:
             results: Result[Transaction] = session.exec(statement)
             return results.all()
 
+    async def get_page(
+        self,
+        limit: int,
+        *,
+        cursor: Option[TransactionCursor] = Empty(),
+        newer: bool = False,
+        before_slot: Option[int] = Empty(),
+        after_slot: Option[int] = Empty(),
+        operation_type: Option[ContentType] = Empty(),
+        columns: Option[FrozenSet[str]] = Empty(),
+    ) -> List[Transaction]:
+        """
+        Keyset pagination over (slot, block id, id): It seeks the indexes instead of using OFFSET, so every page costs
+        the same.
+        Returns up to `limit` transactions older than `cursor` in descending order or, if `newer`, the ones newer than
+        `cursor` in ascending order.
+        If `operation_type` is set, only transactions with an operation of that type are returned, paginating the
+        operations index instead.
+        With `columns`, only those are loaded.
+        """
+        if operation_type.is_some:
+            page = get_page_keys(
+                operation_type.unwrap(),
+                ("slot", "block_id", "transaction_id"),
+                limit,
+                cursor=cursor,
+                newer=newer,
+                before_slot=before_slot,
+                after_slot=after_slot,
+            )
+            statement = keyset(
+                _load_columns(select(Transaction), columns).join(page, Transaction.id == page.c.transaction_id),
+                (page.c.slot, page.c.block_id, page.c.transaction_id),
+                Empty(),
+                newer=newer,
+            )
+            with self.client.session() as session:
+                return session.exec(statement).all()
+
+        block_key = tuple_(Block.slot, Block.id)
+        key = tuple_(Block.slot, Block.id, Transaction.id)
+        statement = _load_columns(select(Transaction), columns).join(Block, Transaction.block_id == Block.id)
+        if cursor.is_some:
+            slot, block_id, transaction_id = cursor.unwrap()
+            cursor_block_key = tuple_(slot, block_id)
+            cursor_key = tuple_(slot, block_id, transaction_id)
+            # The block-level bound is redundant, but lets the planner seek the block index
+            if newer:
+                statement = statement.where(block_key >= cursor_block_key, key > cursor_key)
+            else:
+                statement = statement.where(block_key <= cursor_block_key, key < cursor_key)
+        if before_slot.is_some:
+            statement = statement.where(Block.slot < before_slot.unwrap())
+        if after_slot.is_some:
+            statement = statement.where(Block.slot > after_slot.unwrap())
+        if newer:
+            statement = statement.order_by(Block.slot.asc(), Block.id.asc(), Transaction.id.asc())
+        else:
+            statement = statement.order_by(Block.slot.desc(), Block.id.desc(), Transaction.id.desc())
+
+        with self.client.session() as session:
+            return session.exec(statement.limit(limit)).all()
+
     async def updates_stream(
-        self, transaction_from: Option[Transaction], *, timeout_seconds: int = 1
+        self,
+        cursor: Option[TransactionCursor],
+        *,
+        operation_type: Option[ContentType] = Empty(),
+        columns: Option[FrozenSet[str]] = Empty(),
+        timeout_seconds: int = 1,
+        batch_size: int = 100,
     ) -> AsyncIterator[List[Transaction]]:
-        slot_cursor = transaction_from.map(lambda transaction: transaction.block.slot).unwrap_or(0)
-        block_id_cursor = transaction_from.map(lambda transaction: transaction.block.id).unwrap_or(0)
-        transaction_id_cursor = transaction_from.map(lambda transaction: transaction.id + 1).unwrap_or(0)
-
+        """
+        Yields the transactions after `cursor` in batches of at most `batch_size` (e.g. when catching up after
+        resuming), and then new transactions as they are stored. With `columns`, only those are loaded.
+        """
         while True:
-            statement = (
-                select(Transaction)
-                .options(selectinload(Transaction.block))
-                .join(Block, Transaction.block_id == Block.id)
-                .where(
-                    Block.slot >= slot_cursor,
-                    Block.id >= block_id_cursor,
-                    Transaction.id >= transaction_id_cursor,
-                )
-                .order_by(Block.slot.asc(), Block.id.asc(), Transaction.id.asc())
+            # Row-value comparison: Ids do not grow with slots (e.g. backfilled blocks), so keys cannot be compared apart
+            statement = keyset(
+                _load_columns(select(Transaction), columns).join(Block, Transaction.block_id == Block.id),
+                (Block.slot, Block.id, Transaction.id),
+                cursor,
+                newer=True,
             )
+            statement = statement.limit(batch_size)
+            if operation_type.is_some:
+                from_slot = cursor.map(lambda _cursor: _cursor[0]).unwrap_or(0)
+                statement = statement.where(
+                    has_operation_type(Transaction.id, "transaction_id", operation_type.unwrap(), from_slot=from_slot)
+                )
 
             with self.client.session() as session:
                 transactions: List[Transaction] = session.exec(statement).all()
 
             if len(transactions) > 0:
-                slot_cursor = transactions[-1].block.slot
-                block_id_cursor = transactions[-1].block.id
-                transaction_id_cursor = transactions[-1].id + 1
+                last = transactions[-1]
+                cursor = Some((last.block.slot, last.block.id, last.id))
                 yield transactions
             else:
                 await sleep(timeout_seconds)
@@ -1,6 +1,7 @@
 import typing
 from contextlib import AsyncExitStack, asynccontextmanager
 
+from api.lifespan import api_lifespan
 from node.lifespan import node_lifespan
 
 if typing.TYPE_CHECKING:
@@ -11,4 +12,5 @@ if typing.TYPE_CHECKING:
 async def lifespan(app: "NBE"):
     async with AsyncExitStack() as stack:
         await stack.enter_async_context(node_lifespan(app))
+        await stack.enter_async_context(api_lifespan(app))
         yield
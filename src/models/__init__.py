@@ -1,4 +1,14 @@
+from .address import Address, AddressTransaction
+from .blob import Blob
 from .block import Block
+from .channel import Channel, ChannelOperation
+from .compression import CompressionDictionary
 from .header import ProofOfLeadership
 from .health import Health
+from .inscription import inscription_fts
+from .leader import Leader, LeaderEpoch
+from .operation import TransactionOperation
+from .sdp import SdpDeclaration, SdpDeclarationStatus
+from .series import SeriesBucket, SeriesMetric
+from .stats import ChainStats, SlotStats
 from .transactions import Transaction
@@ -0,0 +1,31 @@
+from sqlmodel import Field
+
+from core.models import NbeModel
+from core.types import HexBytes
+
+
+class Address(NbeModel, table=True):
+    """
+    Aggregates of the notes paid to a public key.
+    """
+
+    __tablename__ = "address"
+
+    public_key: HexBytes = Field(primary_key=True)
+    total_received: int = Field(nullable=False)
+    transactions_count: int = Field(nullable=False)
+    first_slot: int = Field(nullable=False)
+    last_slot: int = Field(nullable=False)
+
+
+class AddressTransaction(NbeModel, table=True):
+    """
+    Index entry of a Transaction paying a public key. Its primary key doubles as the index to page by (slot, id).
+    """
+
+    __tablename__ = "address_transaction"
+
+    public_key: HexBytes = Field(primary_key=True)
+    slot: int = Field(primary_key=True)
+    transaction_id: int = Field(primary_key=True, foreign_key="transaction.id")
+    value: int = Field(nullable=False)
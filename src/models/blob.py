@@ -0,0 +1,17 @@
+from sqlmodel import Field
+
+from core.blobs import BLOB_TABLE_NAME
+from core.models import NbeModel
+
+
+class Blob(NbeModel, table=True):
+    """
+    Value offloaded from a JSON column, stored once regardless of how many rows reference it.
+    """
+
+    __tablename__ = BLOB_TABLE_NAME
+
+    digest: str = Field(primary_key=True, description="BLAKE2b-256 of the value, in hex format.")
+    data: str = Field(nullable=False)
+    size: int = Field(nullable=False)
+    refcount: int = Field(nullable=False, description="Number of references to the value across all JSON columns.")
@@ -1,7 +1,7 @@
 import logging
 from typing import TYPE_CHECKING, List, Self
 
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlmodel import Field, Relationship
 
 from core.models import TimestampedModel
@@ -18,6 +18,7 @@ logger = logging.getLogger(__name__)
 
 class Block(TimestampedModel, table=True):
     __tablename__ = "block"
+    __table_args__ = (Index("ix_block_slot_id", "slot", "id"),)
 
     # --- Columns --- #
 
@@ -26,7 +27,7 @@ class Block(TimestampedModel, table=True):
     slot: int = Field(nullable=False)
     block_root: HexBytes = Field(nullable=False)
     proof_of_leadership: ProofOfLeadership = Field(
-        sa_column=Column(PydanticJsonColumn(ProofOfLeadership), nullable=False)
+        sa_column=Column(PydanticJsonColumn(ProofOfLeadership, offload=True), nullable=False)
     )
 
     # --- Relationships --- #
@@ -0,0 +1,38 @@
+from typing import Optional
+
+from sqlmodel import Field
+
+from core.models import NbeModel
+from core.types import HexBytes
+from models.transactions.operations.contents import ContentType
+
+
+class Channel(NbeModel, table=True):
+    """
+    Aggregates of the operations of a channel.
+    """
+
+    __tablename__ = "channel"
+
+    channel_id: HexBytes = Field(primary_key=True)
+    operations_count: int = Field(nullable=False)
+    first_slot: int = Field(nullable=False)
+    last_slot: int = Field(nullable=False)
+
+
+class ChannelOperation(NbeModel, table=True):
+    """
+    Index entry of a channel operation (`ChannelInscribe`, `ChannelBlob` or `ChannelSetKeys`).
+    Its primary key doubles as the index to page by (slot, transaction id, operation index).
+    """
+
+    __tablename__ = "channel_operation"
+
+    channel_id: HexBytes = Field(primary_key=True)
+    slot: int = Field(primary_key=True)
+    transaction_id: int = Field(primary_key=True, foreign_key="transaction.id")
+    operation_index: int = Field(primary_key=True)
+    type: ContentType = Field(nullable=False)
+    parent: Optional[HexBytes] = Field(default=None, description="Link to the previous message in the channel.")
+    signer: Optional[HexBytes] = Field(default=None)
+    blob_size: Optional[int] = Field(default=None)
@@ -0,0 +1,18 @@
+from sqlalchemy import Index
+from sqlmodel import Field
+
+from core.models import TimestampedModel
+
+
+class CompressionDictionary(TimestampedModel, table=True):
+    """
+    Dictionary trained to compress a JSON column. Its `id` is the version recorded in the values compressed with it.
+    """
+
+    __tablename__ = "compression_dictionary"
+    __table_args__ = (Index("ix_compression_dictionary_name_id", "name", "id"),)
+
+    name: str = Field(nullable=False, description="Name the column compresses under.")
+    content: bytes = Field(nullable=False)
+    samples_count: int = Field(nullable=False)
+    last_row_id: int = Field(nullable=False, description="Latest row of the column when the dictionary was trained.")
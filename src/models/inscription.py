@@ -0,0 +1,33 @@
+from sqlalchemy import DDL, Integer, LargeBinary, String, column, event, table
+from sqlmodel import SQLModel
+
+# FTS5 virtual tables cannot be declared as models, so it's created alongside them and queried through a lightweight
+# table construct. Only the inscription's text is tokenized: The other columns locate the operation it comes from.
+INSCRIPTION_FTS_TABLE_NAME = "inscription_fts"
+
+inscription_fts = table(
+    INSCRIPTION_FTS_TABLE_NAME,
+    column("rowid", Integer),
+    column("text", String),
+    column("channel_id", LargeBinary),
+    column("slot", Integer),
+    column("transaction_id", Integer),
+    column("operation_index", Integer),
+)
+
+event.listen(
+    SQLModel.metadata,
+    "after_create",
+    DDL(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {INSCRIPTION_FTS_TABLE_NAME} USING fts5("
+        "text, "
+        "channel_id UNINDEXED, "
+        "slot UNINDEXED, "
+        "transaction_id UNINDEXED, "
+        "operation_index UNINDEXED, "
+        "tokenize = 'unicode61 remove_diacritics 2', "
+        # Prefix indexes, so `term*` queries do not scan the whole vocabulary
+        "prefix = '2 3'"
+        ")"
+    ).execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,31 @@
+from sqlalchemy import Index
+from sqlmodel import Field
+
+from core.models import IdNbeModel, NbeModel
+from core.types import HexBytes
+
+
+class Leader(IdNbeModel, table=True):
+    """
+    Aggregates of the blocks produced by a leader, identified by the `leader_key` of their proof of leadership.
+    """
+
+    __tablename__ = "leader"
+    __table_args__ = (Index("ix_leader_last_slot_id", "last_slot", "id"),)
+
+    leader_key: HexBytes = Field(nullable=False, unique=True)
+    blocks_count: int = Field(nullable=False)
+    first_slot: int = Field(nullable=False)
+    last_slot: int = Field(nullable=False)
+
+
+class LeaderEpoch(NbeModel, table=True):
+    """
+    Blocks produced by a leader within an epoch.
+    """
+
+    __tablename__ = "leader_epoch"
+
+    leader_id: int = Field(primary_key=True, foreign_key="leader.id")
+    epoch: int = Field(primary_key=True)
+    blocks_count: int = Field(nullable=False)
@@ -0,0 +1,20 @@
+from sqlalchemy import Index
+from sqlmodel import Field
+
+from core.models import NbeModel
+from models.transactions.operations.contents import ContentType
+
+
+class TransactionOperation(NbeModel, table=True):
+    """
+    Index entry of a Transaction's operation, to find Transactions and Blocks by operation type.
+    """
+
+    __tablename__ = "transaction_operation"
+    __table_args__ = (Index("ix_transaction_operation_type_slot", "type", "slot", "block_id", "transaction_id"),)
+
+    transaction_id: int = Field(primary_key=True, foreign_key="transaction.id")
+    operation_index: int = Field(primary_key=True)
+    block_id: int = Field(nullable=False, foreign_key="block.id")
+    slot: int = Field(nullable=False)
+    type: ContentType = Field(nullable=False)
@@ -0,0 +1,46 @@
+from enum import Enum
+from typing import List, Optional
+
+from sqlalchemy import JSON, Column, Index
+from sqlmodel import Field
+
+from core.models import IdNbeModel
+from core.types import HexBytes
+from models.transactions.operations.contents import SDPDeclareServiceType
+
+
+class SdpDeclarationStatus(Enum):
+    DECLARED = "Declared"
+    ACTIVE = "Active"
+    WITHDRAWN = "Withdrawn"
+
+
+class SdpDeclaration(IdNbeModel, table=True):
+    """
+    Current state of a service declaration, folded from its `SDPDeclare`, `SDPActive` and `SDPWithdraw` operations.
+
+    Blocks are not ingested in order (backfilling runs backwards), so an `SDPActive` or `SDPWithdraw` may be indexed
+    before its `SDPDeclare`: Until then, the declaration's own fields are unknown and `declared_slot` is `None`.
+    """
+
+    __tablename__ = "sdp_declaration"
+    __table_args__ = (
+        Index("ix_sdp_declaration_status_id", "status", "id"),
+        Index("ix_sdp_declaration_service_type_id", "service_type", "id"),
+        Index("ix_sdp_declaration_provider_id_id", "provider_id", "id"),
+    )
+
+    declaration_id: HexBytes = Field(nullable=False, unique=True)
+    status: SdpDeclarationStatus = Field(nullable=False)
+    service_type: Optional[SDPDeclareServiceType] = Field(default=None)
+    provider_id: Optional[HexBytes] = Field(default=None)
+    zk_id: Optional[HexBytes] = Field(default=None)
+    locked_note_id: Optional[HexBytes] = Field(default=None)
+    locators: List[str] = Field(
+        default_factory=list, sa_column=Column(JSON, nullable=False), description="Locators in hex format."
+    )
+    declared_slot: Optional[int] = Field(default=None)
+    last_active_slot: Optional[int] = Field(default=None)
+    last_active_nonce: Optional[HexBytes] = Field(default=None)
+    withdrawn_slot: Optional[int] = Field(default=None)
+    withdrawn_nonce: Optional[HexBytes] = Field(default=None)
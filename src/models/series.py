@@ -0,0 +1,32 @@
+from enum import Enum
+from typing import Dict
+
+from sqlalchemy import JSON, Column
+from sqlmodel import Field
+
+from core.models import NbeModel
+
+
+class SeriesMetric(Enum):
+    EXECUTION_GAS_PRICE = "execution_gas_price"  # Per transaction
+    STORAGE_GAS_PRICE = "storage_gas_price"  # Per transaction
+    TRANSACTIONS = "transactions"  # Transactions count per block
+    BLOB_BYTES = "blob_bytes"  # Size per `ChannelBlob` operation
+
+
+class SeriesBucket(NbeModel, table=True):
+    """
+    Rollup of a metric's values over the `resolution` slots starting at `start_slot`.
+    `sketch` holds the `QuantileSketch` bins of the values, to estimate their percentiles.
+    """
+
+    __tablename__ = "series_bucket"
+
+    metric: SeriesMetric = Field(primary_key=True)
+    resolution: int = Field(primary_key=True)
+    start_slot: int = Field(primary_key=True)
+    count: int = Field(nullable=False)
+    min: int = Field(nullable=False)
+    max: int = Field(nullable=False)
+    sum: int = Field(nullable=False)
+    sketch: Dict[str, int] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
@@ -0,0 +1,41 @@
+from typing import Dict, Optional
+
+from sqlalchemy import JSON, Column
+from sqlmodel import Field
+
+from core.models import IdNbeModel, NbeModel
+from models.aliases import Gas
+
+
+class ChainStats(IdNbeModel, table=True):
+    """
+    Chain-wide counters, kept in a single row updated by every ingestion.
+    Gas price sums are kept instead of means, so they can be updated incrementally.
+    """
+
+    __tablename__ = "chain_stats"
+
+    blocks_count: int = Field(default=0, nullable=False)
+    transactions_count: int = Field(default=0, nullable=False)
+    operations_count: Dict[str, int] = Field(
+        default_factory=dict, sa_column=Column(JSON, nullable=False), description="Operations count by type."
+    )
+    last_slot: Optional[int] = Field(default=None)
+    execution_gas_price_min: Optional[Gas] = Field(default=None)
+    execution_gas_price_max: Optional[Gas] = Field(default=None)
+    execution_gas_price_sum: Gas = Field(default=0, nullable=False)
+    storage_gas_price_min: Optional[Gas] = Field(default=None)
+    storage_gas_price_max: Optional[Gas] = Field(default=None)
+    storage_gas_price_sum: Gas = Field(default=0, nullable=False)
+
+
+class SlotStats(NbeModel, table=True):
+    """
+    Counters of a single slot, to compute rates over the latest slots.
+    """
+
+    __tablename__ = "slot_stats"
+
+    slot: int = Field(primary_key=True)
+    blocks_count: int = Field(nullable=False)
+    transactions_count: int = Field(nullable=False)
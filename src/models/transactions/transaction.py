@@ -1,7 +1,7 @@
 import logging
 from typing import List, Optional
 
-from sqlalchemy import JSON, Column
+from sqlalchemy import JSON, Column, Index
 from sqlmodel import Field, Relationship
 
 from core.models import TimestampedModel
@@ -17,17 +17,25 @@ logger = logging.getLogger(__name__)
 
 class Transaction(TimestampedModel, table=True):
     __tablename__ = "transaction"
+    __table_args__ = (Index("ix_transaction_block_id_id", "block_id", "id"),)
 
     # --- Columns --- #
 
     block_id: Optional[int] = Field(default=None, foreign_key="block.id", nullable=False)
     hash: HexBytes = Field(nullable=False, unique=True)
     operations: List[Operation] = Field(
-        default_factory=list, sa_column=Column(PydanticJsonColumn(Operation, many=True), nullable=False)
+        default_factory=list,
+        sa_column=Column(
+            PydanticJsonColumn(Operation, many=True, offload=True, compression="transaction_operations"),
+            nullable=False,
+        ),
+    )
+    inputs: List[Fr] = Field(
+        default_factory=list, sa_column=Column(PydanticJsonColumn(Fr, many=True, offload=True), nullable=False)
     )
-    inputs: List[Fr] = Field(default_factory=list, sa_column=Column(PydanticJsonColumn(Fr, many=True), nullable=False))
     outputs: List[Note] = Field(
-        default_factory=list, sa_column=Column(PydanticJsonColumn(Note, many=True), nullable=False)
+        default_factory=list,
+        sa_column=Column(PydanticJsonColumn(Note, many=True, compression="transaction_outputs"), nullable=False),
     )
     proof: HexBytes = Field(min_length=128, max_length=128, nullable=False)
     execution_gas_price: Gas
@@ -35,7 +35,8 @@ class HttpNodeApi(NodeApi):
 
     async def get_health(self) -> HealthSerializer:
         url = urljoin(self.base_url, self.ENDPOINT_INFO)
-        response = requests.get(url, timeout=60)
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.get(url)
         if response.status_code == 200:
             return HealthSerializer.from_healthy()
         else:
@@ -0,0 +1,104 @@
+import logging
+from asyncio import Event, Lock
+from time import monotonic
+from typing import AsyncIterator, Dict, NamedTuple, Optional
+
+from models.health import Health
+from node.api.base import NodeApi
+
+logger = logging.getLogger(__name__)
+
+
+class HealthCheck(NamedTuple):
+    health: Health
+    checked_at: float  # Monotonic
+
+
+class HealthMonitor:
+    """
+    Node's health, shared by every reader of it: The node is queried by a single poller (see `refresh`), no matter how
+    many clients are connected.
+    The latest check is cached, and is served as-is while it is younger than `ttl_seconds`. Streams are only sent the
+    checks that change the health.
+    """
+
+    def __init__(self, node_api: NodeApi, *, ttl_seconds: float):
+        self.node_api = node_api
+        self.ttl_seconds = ttl_seconds
+
+        self._latest: Optional[HealthCheck] = None
+        # Set, and replaced, whenever the health changes
+        self._changed = Event()
+        # Serializes checks, so concurrent readers of a stale health share the same query
+        self._check_lock = Lock()
+
+        self.checks = 0
+        self.changes = 0
+        self.failures = 0
+        self.streams = 0
+
+    async def get(self) -> Health:
+        """
+        Latest health, checked against the node if the cached one is stale.
+        """
+        if self._is_fresh(self._latest):
+            return self._latest.health
+        async with self._check_lock:
+            # Checked by whoever held the lock meanwhile
+            if self._is_fresh(self._latest):
+                return self._latest.health
+            return await self._check()
+
+    async def refresh(self) -> Health:
+        """
+        Checks the health against the node, regardless of the cached one.
+        """
+        async with self._check_lock:
+            return await self._check()
+
+    async def updates(self) -> AsyncIterator[Health]:
+        """
+        Yields the latest health, and then every change of it.
+        """
+        self.streams += 1
+        try:
+            health = await self.get()
+            yield health
+            while True:
+                if self._latest.health == health:
+                    await self._changed.wait()
+                    continue
+                health = self._latest.health
+                yield health
+        finally:
+            self.streams -= 1
+
+    def stats(self) -> Dict[str, int | float | bool | None]:
+        return {
+            "healthy": self._latest.health.healthy if self._latest is not None else None,
+            "age_seconds": round(monotonic() - self._latest.checked_at, 3) if self._latest is not None else None,
+            "checks": self.checks,
+            "changes": self.changes,
+            "failures": self.failures,
+            "streams": self.streams,
+        }
+
+    def _is_fresh(self, check: Optional[HealthCheck]) -> bool:
+        return check is not None and monotonic() - check.checked_at < self.ttl_seconds
+
+    async def _check(self) -> Health:
+        self.checks += 1
+        try:
+            health = (await self.node_api.get_health()).into_health()
+        except Exception as error:
+            self.failures += 1
+            logger.warning(f"Could not check the node's health: {error}")
+            health = Health(healthy=False)
+
+        previous = self._latest
+        self._latest = HealthCheck(health, monotonic())
+        if previous is None or previous.health != health:
+            self.changes += 1
+            self._changed.set()
+            self._changed = Event()
+        return health
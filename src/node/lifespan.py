@@ -5,12 +5,24 @@ from typing import TYPE_CHECKING, AsyncGenerator, AsyncIterator, List
 
 from rusty_results import Option
 
+from core import compression
+from core.cache import LruCache
+from db.addresses import AddressRepository
 from db.blocks import BlockRepository
+from db.channels import ChannelRepository
 from db.clients import SqliteClient
+from db.compression import CompressionRepository
+from db.inscriptions import InscriptionRepository
+from db.leaders import LeaderRepository
+from db.operations import OperationRepository
+from db.sdp import SdpRepository
+from db.series import SeriesRepository
+from db.stats import StatsRepository
 from db.transaction import TransactionRepository
 from models.block import Block
 from node.api.builder import build_node_api
 from node.api.serializers.block import BlockSerializer
+from node.health import HealthMonitor
 from node.manager.builder import build_node_manager
 
 if TYPE_CHECKING:
@@ -23,17 +35,60 @@ logger = logging.getLogger(__name__)
 async def node_lifespan(app: "NBE") -> AsyncGenerator[None]:
     app.state.node_manager = build_node_manager(app.settings)
     app.state.node_api = build_node_api(app.settings)
+    app.state.health_monitor = HealthMonitor(app.state.node_api, ttl_seconds=app.settings.health_ttl_seconds)
 
+    # Decides the type of compressed columns, so it is set before the database is first used
+    compression.set_enabled(app.settings.column_compression)
     db_client = SqliteClient()
     app.state.db_client = db_client
-    app.state.block_repository = BlockRepository(db_client)
-    app.state.transaction_repository = TransactionRepository(db_client)
+    cache = LruCache(
+        max_bytes=app.settings.cache_max_bytes, negative_ttl_seconds=app.settings.cache_negative_ttl_seconds
+    )
+    app.state.cache = cache
+    app.state.address_repository = AddressRepository(db_client)
+    app.state.channel_repository = ChannelRepository(db_client)
+    app.state.operation_repository = OperationRepository(db_client)
+    app.state.sdp_repository = SdpRepository(db_client)
+    app.state.leader_repository = LeaderRepository(db_client, epoch_length_slots=app.settings.epoch_length_slots)
+    app.state.stats_repository = StatsRepository(db_client)
+    app.state.series_repository = SeriesRepository(db_client)
+    app.state.inscription_repository = InscriptionRepository(db_client)
+    app.state.compression_repository = CompressionRepository(
+        db_client, retrain_rows=app.settings.compression_retrain_rows
+    )
+    app.state.block_repository = BlockRepository(
+        db_client,
+        cache=cache,
+        indexers=[
+            app.state.address_repository,
+            app.state.channel_repository,
+            app.state.operation_repository,
+            app.state.sdp_repository,
+            app.state.leader_repository,
+            app.state.stats_repository,
+            app.state.series_repository,
+            app.state.inscription_repository,
+        ],
+    )
+    app.state.transaction_repository = TransactionRepository(db_client, cache=cache)
 
     try:
         logger.info("Starting node...")
         await app.state.node_manager.start()
         logger.info("Node started.")
-
+        app.state.health_monitoring = create_task(monitor_health(app))
+
+        # Compressed columns cannot be read nor written until their dictionaries are registered
+        await app.state.compression_repository.load()
+        if app.settings.column_compression:
+            app.state.compression_training = create_task(train_compression_dictionaries(app))
+
+        # Seeded before ingestion starts, as it would create the counters, and blocks could be counted twice otherwise
+        if await app.state.stats_repository.is_empty():
+            await seed_stats(app)
+        # Checked before ingestion starts, as it would populate the series
+        if await app.state.series_repository.is_empty():
+            app.state.series_backfill = create_task(backfill_series(app))
         app.state.subscription_to_updates_handle = create_task(subscribe_to_updates(app))
         app.state.backfill = create_task(backfill(app))
 
@@ -148,3 +203,50 @@ async def backfill_blocks(app: "NBE", *, db_hit_interval_seconds: int, batch_siz
         await app.state.block_repository.create(*blocks)
         slot_to = slot_from - 1
     logger.info("Backfilling blocks completed.")
+
+
+async def seed_stats(app: "NBE") -> None:
+    """
+    Seeds the chain statistics out of the blocks stored before they existed, if any.
+    """
+    logger.info("Seeding chain statistics...")
+    try:
+        await app.state.stats_repository.backfill()
+    except Exception as error:
+        logger.exception(f"Error while seeding chain statistics: {error}")
+        return
+    logger.info("✅ Seeding chain statistics finished.")
+
+
+async def backfill_series(app: "NBE") -> None:
+    """
+    Rebuilds the series out of the blocks stored before they existed, if any.
+    """
+    logger.info("Backfilling series...")
+    try:
+        await app.state.series_repository.backfill()
+    except Exception as error:
+        logger.exception(f"Error while backfilling series: {error}")
+        return
+    logger.info("✅ Backfilling series finished.")
+
+
+async def train_compression_dictionaries(app: "NBE", *, interval_seconds: int = 60) -> None:
+    """
+    Trains the first dictionary of each compressed column once it has enough rows, and retrains it periodically.
+    """
+    while app.state.is_running:
+        try:
+            await app.state.compression_repository.train_due()
+        except Exception as error:
+            logger.exception(f"Error while training compression dictionaries: {error}")
+        await sleep(interval_seconds)
+
+
+async def monitor_health(app: "NBE") -> None:
+    """
+    Polls the node's health for every reader of it, see `HealthMonitor`.
+    """
+    while app.state.is_running:
+        await app.state.health_monitor.refresh()
+        await sleep(app.settings.health_poll_interval_seconds)
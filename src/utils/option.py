@@ -0,0 +1,9 @@
+from typing import Optional, TypeVar
+
+from rusty_results import Empty, Option, Some
+
+T = TypeVar("T")
+
+
+def into_option(value: Optional[T]) -> Option[T]:
+    return Empty() if value is None else Some(value)
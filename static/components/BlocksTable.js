@@ -1,14 +1,14 @@
 // static/pages/BlocksTable.js
 import { h } from 'preact';
 import { useEffect, useRef } from 'preact/hooks';
-import { PAGE, API } from '../lib/api.js';
+import { PAGE } from '../lib/api.js';
 import { TABLE_SIZE } from '../lib/constants.js';
-import { streamNdjson, ensureFixedRowCount, shortenHex } from '../lib/utils.js';
+import { subscribe } from '../lib/stream.js';
+import { ensureFixedRowCount, shortenHex } from '../lib/utils.js';
 
 export default function BlocksTable() {
     const bodyRef = useRef(null);
     const countRef = useRef(null);
-    const abortRef = useRef(null);
     const seenKeysRef = useRef(new Set());
 
     useEffect(() => {
@@ -18,9 +18,6 @@ export default function BlocksTable() {
         // 6 columns: ID | Slot | Hash | Parent | Block Root | Transactions
         ensureFixedRowCount(body, 6, TABLE_SIZE);
 
-        abortRef.current?.abort();
-        abortRef.current = new AbortController();
-
         const pruneAndPad = () => {
             // remove any placeholder rows that snuck in
             for (let i = body.rows.length - 1; i >= 0; i--) {
@@ -124,8 +121,8 @@ export default function BlocksTable() {
             };
         };
 
-        streamNdjson(
-            `${API.BLOCKS_STREAM}?prefetch-limit=${encodeURIComponent(TABLE_SIZE)}`,
+        return subscribe(
+            'block',
             (raw) => {
                 const b = normalize(raw);
                 const key = `${b.id}:${b.slot}`;
@@ -137,14 +134,11 @@ export default function BlocksTable() {
                 appendRow(b, key);
             },
             {
-                signal: abortRef.current.signal,
                 onError: (e) => {
                     console.error('Blocks stream error:', e);
                 },
             },
         );
-
-        return () => abortRef.current?.abort();
     }, []);
 
     return h(
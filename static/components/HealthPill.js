@@ -1,7 +1,6 @@
 import { h } from 'preact';
 import { useEffect, useRef, useState } from 'preact/hooks';
-import { API } from '../lib/api.js';
-import { streamNdjson, withBenignFilter } from '../lib/utils.js';
+import { subscribe } from '../lib/stream.js';
 
 const STATUS = {
     CONNECTING: 'connecting',
@@ -12,7 +11,6 @@ const STATUS = {
 export default function HealthPill() {
     const [status, setStatus] = useState(STATUS.CONNECTING);
     const pillRef = useRef(null);
-    const abortRef = useRef(null);
 
     // Flash animation whenever status changes
     useEffect(() => {
@@ -24,28 +22,20 @@ export default function HealthPill() {
     }, [status]);
 
     useEffect(() => {
-        abortRef.current?.abort();
-        abortRef.current = new AbortController();
-
-        streamNdjson(
-            API.HEALTH_ENDPOINT,
+        return subscribe(
+            'health',
             (item) => {
                 if (typeof item?.healthy === 'boolean') {
                     setStatus(item.healthy ? STATUS.ONLINE : STATUS.OFFLINE);
                 }
             },
             {
-                signal: abortRef.current.signal,
-                onError: withBenignFilter((err) => {
-                    if (!abortRef.current.signal.aborted) {
-                        console.error('Health stream error:', err);
-                        setStatus(STATUS.OFFLINE);
-                    }
-                }, abortRef.current.signal),
+                onError: (err) => {
+                    console.error('Health stream error:', err);
+                    setStatus(STATUS.OFFLINE);
+                },
             },
         );
-
-        return () => abortRef.current?.abort();
     }, []);
 
     const className = 'pill ' + (status === STATUS.ONLINE ? 'online' : status === STATUS.OFFLINE ? 'offline' : '');
@@ -1,13 +1,11 @@
 // static/pages/TransactionsTable.js
 import { h } from 'preact';
 import { useEffect, useRef } from 'preact/hooks';
-import { API } from '../lib/api.js';
 import { TABLE_SIZE } from '../lib/constants.js';
+import { subscribe } from '../lib/stream.js';
 import {
-    streamNdjson,
     ensureFixedRowCount,
     shortenHex, // (kept in case you want to use later)
-    withBenignFilter,
 } from '../lib/utils.js';
 
 const OPERATIONS_PREVIEW_LIMIT = 2;
@@ -120,7 +118,6 @@ function buildTransactionRow(tx) {
 export default function TransactionsTable() {
     const bodyRef = useRef(null);
     const countRef = useRef(null);
-    const abortRef = useRef(null);
     const totalCountRef = useRef(0);
 
     useEffect(() => {
@@ -130,13 +127,8 @@ export default function TransactionsTable() {
         // 4 columns: ID | Operations | Outputs | Gas
         ensureFixedRowCount(body, 4, TABLE_SIZE);
 
-        abortRef.current?.abort();
-        abortRef.current = new AbortController();
-
-        const url = `${API.TRANSACTIONS_STREAM}?prefetch-limit=${encodeURIComponent(TABLE_SIZE)}`;
-
-        streamNdjson(
-            url,
+        return subscribe(
+            'transaction',
             (raw) => {
                 try {
                     const tx = normalizeTransaction(raw);
@@ -150,19 +142,9 @@ export default function TransactionsTable() {
                 }
             },
             {
-                signal: abortRef.current.signal,
-                onError: withBenignFilter(
-                    (err) => console.error('Transactions stream error:', err),
-                    abortRef.current.signal,
-                ),
+                onError: (err) => console.error('Transactions stream error:', err),
             },
-        ).catch((err) => {
-            if (!abortRef.current.signal.aborted) {
-                console.error('Transactions stream connection error:', err);
-            }
-        });
-
-        return () => abortRef.current?.abort();
+        );
     }, []);
 
     return h(
@@ -4,18 +4,24 @@ const joinUrl = (...parts) => parts.join('/').replace(/\/{2,}/g, '/');
 const encodeId = (id) => encodeURIComponent(String(id));
 
 const HEALTH_ENDPOINT = joinUrl(API_PREFIX, 'health/stream');
+const STREAM = joinUrl(API_PREFIX, 'stream');
 
 const TRANSACTION_DETAIL_BY_ID = (id) => joinUrl(API_PREFIX, 'transactions', encodeId(id));
 const TRANSACTIONS_STREAM = joinUrl(API_PREFIX, 'transactions/stream');
 
 const BLOCK_DETAIL_BY_ID = (id) => joinUrl(API_PREFIX, 'blocks', encodeId(id));
+const BLOCK_HEADER_BY_ID = (id) => `${BLOCK_DETAIL_BY_ID(id)}?header-only=true`;
+const BLOCK_TRANSACTIONS = (id) => joinUrl(API_PREFIX, 'blocks', encodeId(id), 'transactions');
 const BLOCKS_STREAM = joinUrl(API_PREFIX, 'blocks/stream');
 
 export const API = {
     HEALTH_ENDPOINT,
+    STREAM,
     TRANSACTION_DETAIL_BY_ID,
     TRANSACTIONS_STREAM,
     BLOCK_DETAIL_BY_ID,
+    BLOCK_HEADER_BY_ID,
+    BLOCK_TRANSACTIONS,
     BLOCKS_STREAM,
 };
 
@@ -0,0 +1,70 @@
+import { API } from './api.js';
+import { TABLE_SIZE } from './constants.js';
+import { streamNdjson } from './utils.js';
+
+// Topic each frame event belongs to
+const TOPICS = {
+    block: 'blocks',
+    transaction: 'transactions',
+    health: 'health',
+};
+
+// Handlers by frame event, all served by a single multiplexed connection
+const subscribers = new Map();
+let abortController = null;
+let connectTimeout = null;
+
+const dispatch = (frame) => {
+    for (const { handleItem } of subscribers.get(frame?.event) ?? []) handleItem(frame.data);
+};
+
+const dispatchError = (error) => {
+    for (const handlers of subscribers.values()) for (const { onError } of handlers) onError?.(error);
+};
+
+// Deferred, so the components mounting together share the connection opened once they have all subscribed
+const scheduleReconnect = () => {
+    clearTimeout(connectTimeout);
+    connectTimeout = setTimeout(connect, 0);
+};
+
+function connect() {
+    abortController?.abort();
+    abortController = null;
+    if (subscribers.size === 0) return;
+
+    const topics = [...subscribers.keys()].map((event) => TOPICS[event]).join(',');
+    const url = `${API.STREAM}?topics=${encodeURIComponent(topics)}&prefetch-limit=${encodeURIComponent(TABLE_SIZE)}`;
+    const controller = new AbortController();
+    abortController = controller;
+
+    streamNdjson(url, dispatch, {
+        signal: controller.signal,
+        onError: (error) => {
+            if (!controller.signal.aborted) dispatchError(error);
+        },
+    }).catch((error) => {
+        if (!controller.signal.aborted) dispatchError(error);
+    });
+}
+
+/**
+ * Calls `handleItem` with the data of every `event` frame (`block`, `transaction` or `health`).
+ * Returns a function that unsubscribes.
+ */
+export function subscribe(event, handleItem, { onError } = {}) {
+    const subscriber = { handleItem, onError };
+    const isNewEvent = !subscribers.has(event);
+    if (isNewEvent) subscribers.set(event, new Set());
+    subscribers.get(event).add(subscriber);
+    if (isNewEvent) scheduleReconnect();
+
+    return () => {
+        const handlers = subscribers.get(event);
+        handlers?.delete(subscriber);
+        if (handlers?.size === 0) {
+            subscribers.delete(event);
+            scheduleReconnect();
+        }
+    };
+}
@@ -4,6 +4,15 @@ import { useEffect, useMemo, useState } from 'preact/hooks';
 import { API, PAGE } from '../lib/api.js';
 
 const OPERATIONS_PREVIEW_LIMIT = 2;
+const TRANSACTIONS_PAGE_SIZE = 50;
+// Only what the transactions table shows, so proofs and inputs are not even loaded
+const TRANSACTION_FIELDS = 'id,operations,outputs,execution_gas_price,storage_gas_price';
+
+const blockTransactionsUrl = (blockId, cursor) => {
+    const query = new URLSearchParams({ limit: String(TRANSACTIONS_PAGE_SIZE), fields: TRANSACTION_FIELDS });
+    if (cursor) query.set('cursor', cursor);
+    return `${API.BLOCK_TRANSACTIONS(blockId)}?${query}`;
+};
 
 // ---- Helpers ----
 const opLabel = (op) => {
@@ -78,6 +87,9 @@ export default function BlockDetailPage({ parameters }) {
     const isValidId = Number.isInteger(blockId) && blockId >= 0;
 
     const [block, setBlock] = useState(null);
+    const [transactions, setTransactions] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [isLoadingMore, setIsLoadingMore] = useState(false);
     const [errorMessage, setErrorMessage] = useState('');
     const [errorKind, setErrorKind] = useState(null); // 'invalid-id' | 'not-found' | 'network' | null
 
@@ -88,6 +100,8 @@ export default function BlockDetailPage({ parameters }) {
 
     useEffect(() => {
         setBlock(null);
+        setTransactions([]);
+        setNextCursor(null);
         setErrorMessage('');
         setErrorKind(null);
 
@@ -102,7 +116,8 @@ export default function BlockDetailPage({ parameters }) {
 
         (async () => {
             try {
-                const res = await fetch(API.BLOCK_DETAIL_BY_ID(blockId), {
+                // The header first, and its transactions page by page
+                const res = await fetch(API.BLOCK_HEADER_BY_ID(blockId), {
                     cache: 'no-cache',
                     signal: controller.signal,
                 });
@@ -116,6 +131,14 @@ export default function BlockDetailPage({ parameters }) {
                 if (!res.ok) throw new Error(`HTTP ${res.status}`);
                 const payload = await res.json();
                 if (alive) setBlock(payload);
+
+                const transactionsRes = await fetch(blockTransactionsUrl(blockId), { signal: controller.signal });
+                if (!transactionsRes.ok) throw new Error(`HTTP ${transactionsRes.status}`);
+                const page = await transactionsRes.json();
+                if (alive) {
+                    setTransactions(page.items);
+                    setNextCursor(page.next_cursor);
+                }
             } catch (e) {
                 if (!alive || e?.name === 'AbortError') return;
                 setErrorKind('network');
@@ -129,8 +152,25 @@ export default function BlockDetailPage({ parameters }) {
         };
     }, [blockId, isValidId]);
 
+    const loadMoreTransactions = async () => {
+        if (!nextCursor || isLoadingMore) return;
+        setIsLoadingMore(true);
+        try {
+            const res = await fetch(blockTransactionsUrl(blockId, nextCursor));
+            if (!res.ok) throw new Error(`HTTP ${res.status}`);
+            const page = await res.json();
+            setTransactions((previous) => [...previous, ...page.items]);
+            setNextCursor(page.next_cursor);
+        } catch (e) {
+            setErrorKind('network');
+            setErrorMessage(e?.message ?? 'Failed to load transactions');
+        } finally {
+            setIsLoadingMore(false);
+        }
+    };
+
     const header = block?.header ?? {}; // back-compat only
-    const transactions = Array.isArray(block?.transactions) ? block.transactions : [];
+    const transactionsCount = block?.transactions_count ?? transactions.length;
 
     // Prefer new top-level fields; fallback to legacy header.*
     const slot = block?.slot ?? header?.slot ?? null;
@@ -265,7 +305,7 @@ export default function BlockDetailPage({ parameters }) {
                         'div',
                         { class: 'card-header' },
                         h('strong', null, 'Transactions '),
-                        h('span', { class: 'pill' }, String(transactions.length)),
+                        h('span', { class: 'pill' }, String(transactionsCount)),
                     ),
                     h(
                         'div',
@@ -355,6 +395,23 @@ export default function BlockDetailPage({ parameters }) {
                             ),
                         ),
                     ),
+                    nextCursor &&
+                        h(
+                            'div',
+                            { style: 'padding:12px 14px; display:flex; justify-content:center;' },
+                            h(
+                                'button',
+                                {
+                                    class: 'pill linkish',
+                                    style: 'cursor:pointer;',
+                                    disabled: isLoadingMore,
+                                    onClick: loadMoreTransactions,
+                                },
+                                isLoadingMore
+                                    ? 'Loading…'
+                                    : `Load more (${transactions.length} of ${transactionsCount})`,
+                            ),
+                        ),
                 ),
             ),
     );